@@ -5,6 +5,7 @@ from gymnasium.envs.registration import register
 register(
     id="team_catcher-v0",
     entry_point="gym_ma_toy.envs:TeamCatcherBase",
+    vector_entry_point="gym_ma_toy.envs:TeamCatcherVectorEnv",
     kwargs={
         "grid_size": 64,
         "nb_agents_hv": 16,
@@ -18,6 +19,7 @@ register(
 register(
     id="team_catcher-v1",
     entry_point="gym_ma_toy.envs:TeamCatcherBase",
+    vector_entry_point="gym_ma_toy.envs:TeamCatcherVectorEnv",
     kwargs={
         "grid_size": 64,
         "nb_agents_hv": 16,
@@ -31,6 +33,7 @@ register(
 register(
     id="team_catcher-v2",
     entry_point="gym_ma_toy.envs:TeamCatcherBase",
+    vector_entry_point="gym_ma_toy.envs:TeamCatcherVectorEnv",
     kwargs={
         "grid_size": 64,
         "nb_agents_hv": 8,
@@ -44,6 +47,7 @@ register(
 register(
     id="team_catcher-v3",
     entry_point="gym_ma_toy.envs:TeamCatcherBase",
+    vector_entry_point="gym_ma_toy.envs:TeamCatcherVectorEnv",
     kwargs={
         "grid_size": 64,
         "nb_agents_hv": 8,
@@ -59,6 +63,7 @@ register(
 register(
     id="team_catcher-easy-lvl0-v0",
     entry_point="gym_ma_toy.envs:TeamCatcherBase",
+    vector_entry_point="gym_ma_toy.envs:TeamCatcherVectorEnv",
     kwargs={
         "grid_size": 16,
         "nb_agents_hv": 16,
@@ -71,6 +76,7 @@ register(
 register(
     id="team_catcher-easy-lvl1-v0",
     entry_point="gym_ma_toy.envs:TeamCatcherBase",
+    vector_entry_point="gym_ma_toy.envs:TeamCatcherVectorEnv",
     kwargs={
         "grid_size": 16,
         "nb_agents_hv": 8,
@@ -84,6 +90,7 @@ register(
 register(
     id="team_catcher-easy-lvl2-v0",
     entry_point="gym_ma_toy.envs:TeamCatcherBase",
+    vector_entry_point="gym_ma_toy.envs:TeamCatcherVectorEnv",
     kwargs={
         "grid_size": 16,
         "nb_agents_hv": 2,
@@ -97,6 +104,7 @@ register(
 register(
     id="team_catcher-medium-lvl0-v0",
     entry_point="gym_ma_toy.envs:TeamCatcherBase",
+    vector_entry_point="gym_ma_toy.envs:TeamCatcherVectorEnv",
     kwargs={
         "grid_size": 64,
         "nb_agents_hv": 32,
@@ -110,6 +118,7 @@ register(
 register(
     id="team_catcher-medium-lvl1-v0",
     entry_point="gym_ma_toy.envs:TeamCatcherBase",
+    vector_entry_point="gym_ma_toy.envs:TeamCatcherVectorEnv",
     kwargs={
         "grid_size": 64,
         "nb_agents_hv": 32,
@@ -123,6 +132,7 @@ register(
 register(
     id="team_catcher-medium-lvl2-v0",
     entry_point="gym_ma_toy.envs:TeamCatcherBase",
+    vector_entry_point="gym_ma_toy.envs:TeamCatcherVectorEnv",
     kwargs={
         "grid_size": 64,
         "nb_agents_hv": 4,
@@ -136,6 +146,7 @@ register(
 register(
     id="team_catcher-hard-lvl0-v0",
     entry_point="gym_ma_toy.envs:TeamCatcherBase",
+    vector_entry_point="gym_ma_toy.envs:TeamCatcherVectorEnv",
     kwargs={
         "grid_size": 32,
         "nb_agents_hv": 8,
@@ -150,6 +161,7 @@ register(
 register(
     id="team_catcher-hard-lvl1-v0",
     entry_point="gym_ma_toy.envs:TeamCatcherBase",
+    vector_entry_point="gym_ma_toy.envs:TeamCatcherVectorEnv",
     kwargs={
         "grid_size": 84,
         "nb_agents_hv": 32,
@@ -164,6 +176,7 @@ register(
 register(
     id="team_catcher-hard-lvl2-v0",
     entry_point="gym_ma_toy.envs:TeamCatcherBase",
+    vector_entry_point="gym_ma_toy.envs:TeamCatcherVectorEnv",
     kwargs={
         "grid_size": 256,
         "nb_agents_hv": 256,
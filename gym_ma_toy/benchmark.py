@@ -0,0 +1,224 @@
+"""
+Throughput benchmark of the registered team catcher environments.
+
+For each env id it measures the reset latency, the steps per second under
+random actions, the render time, the time to build the partial map under the
+fog of war and the peak memory allocated by NumPy and Python during resets and
+steps, then writes the results as JSON:
+
+    python -m gym_ma_toy.benchmark --output results.json
+    python -m gym_ma_toy.benchmark --ids team_catcher-v0 --engine array
+    python -m gym_ma_toy.benchmark --output new.json --baseline results.json
+
+With `--baseline`, the run is compared with a previous results file and the
+command fails when a measure got worse than the tolerance.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, Iterable, List, Optional
+
+import gymnasium as gym
+import numpy as np
+
+import gym_ma_toy  # noqa: F401
+
+# measures where a higher value is better, the others are durations or sizes
+HIGHER_IS_BETTER = {"steps_per_sec"}
+
+
+def registered_ids() -> List[str]:
+    """Ids of every team catcher environment of the gymnasium registry."""
+    return sorted(
+        env_id for env_id in gym.registry if env_id.startswith("team_catcher")
+    )
+
+
+def benchmark_env(
+    env_id: str,
+    nb_steps: int = 200,
+    nb_resets: int = 10,
+    nb_renders: int = 5,
+    nb_memory_steps: int = 20,
+    seed: int = 0,
+    **env_kwargs,
+) -> Dict[str, float]:
+    """Measure one environment.
+
+    Parameters
+    ----------
+    env_id : str
+        Registered id of the environment.
+    nb_steps : int
+        Number of timed steps, the episodes that end are reset untimed.
+    nb_resets : int
+        Number of timed resets.
+    nb_renders : int
+        Number of timed renders.
+    nb_memory_steps : int
+        Number of steps of the (slower) traced run measuring memory.
+    seed : int
+        Seed of the environment and of the actions.
+    env_kwargs :
+        Extra arguments of `gym.make`, e.g. `engine`.
+
+    Returns
+    -------
+    Dict[str, float]
+        reset_ms: mean reset latency.
+        steps_per_sec: steps per second, random actions drawn beforehand.
+        step_ms: mean step latency.
+        render_ms: mean render time.
+        fog_ms: mean time to build the observation with its partial map, only
+            for the envs under the fog of war.
+        peak_memory_mb: peak traced allocation over a reset and some steps.
+    """
+    env = gym.make(env_id, **env_kwargs).unwrapped
+    env.reset(seed=seed)
+    env.action_space.seed(seed)
+
+    reset_times = []
+    for _ in range(nb_resets):
+        start = time.perf_counter()
+        env.reset()
+        reset_times.append(time.perf_counter() - start)
+
+    env.reset(seed=seed)
+    actions = [env.action_space.sample() for _ in range(nb_steps)]
+    step_time = 0.0
+    for action in actions:
+        start = time.perf_counter()
+        _, _, done, _, _ = env.step(action)
+        step_time += time.perf_counter() - start
+        if done:
+            env.reset()
+
+    render_times = []
+    for _ in range(nb_renders):
+        start = time.perf_counter()
+        env.render()
+        render_times.append(time.perf_counter() - start)
+
+    fog_times = []
+    if env.partially_observable:
+        for _ in range(nb_renders):
+            start = time.perf_counter()
+            env.world.get_state
+            fog_times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    env.reset(seed=seed)
+    for action in actions[:nb_memory_steps]:
+        env.step(action)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    env.close()
+
+    measures = {
+        "reset_ms": 1e3 * float(np.mean(reset_times)),
+        "steps_per_sec": nb_steps / step_time,
+        "step_ms": 1e3 * step_time / nb_steps,
+        "render_ms": 1e3 * float(np.mean(render_times)),
+        "peak_memory_mb": peak / 2**20,
+    }
+    if fog_times:
+        measures["fog_ms"] = 1e3 * float(np.mean(fog_times))
+    return measures
+
+
+def run_benchmarks(env_ids: Optional[Iterable[str]] = None, **kwargs) -> Dict[str, Any]:
+    """Benchmark several environments (all the registered ones by default).
+
+    The keyword arguments are the ones of `benchmark_env`. The results are
+    returned with the context of the run (versions, platform, arguments).
+    """
+    env_ids = registered_ids() if env_ids is None else list(env_ids)
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "gymnasium": gym.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "arguments": kwargs,
+        },
+        "results": {env_id: benchmark_env(env_id, **kwargs) for env_id in env_ids},
+    }
+
+
+def compare_results(
+    baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.2
+) -> List[str]:
+    """List the measures of `current` worse than `baseline` by more than
+    `tolerance` (relative), for the env ids present in both runs."""
+    regressions = []
+    for env_id, measures in current["results"].items():
+        reference = baseline["results"].get(env_id)
+        if reference is None:
+            continue
+        for name, value in measures.items():
+            if name not in reference or reference[name] == 0:
+                continue
+            ratio = value / reference[name]
+            worse = (
+                ratio < 1 - tolerance
+                if name in HIGHER_IS_BETTER
+                else ratio > 1 + tolerance
+            )
+            if worse:
+                regressions.append(
+                    f"{env_id} {name}: {reference[name]:.4g} -> {value:.4g}"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--ids", nargs="+", help="env ids, all by default")
+    parser.add_argument("--engine", help="world engine passed to gym.make")
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--resets", type=int, default=10)
+    parser.add_argument("--renders", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file of the results")
+    parser.add_argument("--baseline", help="JSON results to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    kwargs = dict(
+        nb_steps=args.steps,
+        nb_resets=args.resets,
+        nb_renders=args.renders,
+        seed=args.seed,
+    )
+    if args.engine is not None:
+        kwargs["engine"] = args.engine
+    report = run_benchmarks(args.ids, **kwargs)
+
+    for env_id, measures in report["results"].items():
+        print(
+            f"{env_id:28s} reset {measures['reset_ms']:8.2f} ms  "
+            f"{measures['steps_per_sec']:9.1f} steps/s  "
+            f"render {measures['render_ms']:7.2f} ms  "
+            f"peak {measures['peak_memory_mb']:7.2f} MB"
+        )
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare_results(json.load(file), report, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,14 @@
 from .team_catcher_base import TeamCatcherBase
+from .vector_env import TeamCatcherVectorEnv
+from .async_vector_env import TeamCatcherAsyncVectorEnv
+from .recorder import EpisodeRecorder
+from .trajectory import TrajectoryReader, TrajectoryWriter
 
-__all__ = ["TeamCatcherBase"]
+__all__ = [
+    "TeamCatcherBase",
+    "TeamCatcherVectorEnv",
+    "TeamCatcherAsyncVectorEnv",
+    "EpisodeRecorder",
+    "TrajectoryReader",
+    "TrajectoryWriter",
+]
@@ -0,0 +1,289 @@
+import numpy as np
+
+from typing import Dict, Iterable, Tuple
+from collections import deque
+
+from .game_base import (
+    WorldBase,
+    Agent,
+    Target,
+    MobileTarget,
+    MapElement,
+    Actions,
+    ACTION_DELTAS,
+    EVENT_DTYPE,
+    MOVE_ALLOWED,
+    NEIGHBOURHOODS,
+    simultaneous_moves,
+    visible_cells,
+)
+
+
+class ArrayWorld(WorldBase):
+    """
+    Team catcher game with a structure-of-arrays entity store.
+
+    Every entity (agents, then targets, then mobile targets) is a row of
+    contiguous NumPy columns instead of a Python object:
+
+        positions: (nb_entities, 2) int32, cell of the entity
+        kinds: (nb_entities,) int16, MapElement value painted on the map
+        mobility: (nb_entities,) bool, the entity can move
+        alive: (nb_entities,) bool, False once a target is captured
+        on_map: (nb_entities,) bool, alive when the map was last filled
+
+    The row of an entity is its id minus one, so ids match the ones given by
+    `WorldBase`. The game rules, including the sequential order in which agents
+    then mobiles move, are the same as `WorldBase`. `agents`, `targets`,
+    `mobiles` and `agent_position` are kept as lazy, read-only views built from
+    the arrays on access.
+    """
+
+    def _init_entities(self):
+        nb_entities = self.nb_agents + self.nb_targets + self.nb_mobiles
+        self.positions = np.zeros((nb_entities, 2), dtype=np.int32)
+        self.kinds = np.full(nb_entities, MapElement.empty, dtype=np.int16)
+        self.mobility = np.zeros(nb_entities, dtype=bool)
+        self.alive = np.zeros(nb_entities, dtype=bool)
+        self.on_map = np.zeros(nb_entities, dtype=bool)
+
+        self.kinds[: self.nb_agents_hv] = MapElement.agent_hv
+        self.kinds[self.nb_agents_hv : self.nb_agents] = MapElement.agent_diag
+        self.kinds[self.nb_agents : self.nb_agents + self.nb_targets] = (
+            MapElement.target
+        )
+        self.kinds[self.nb_agents + self.nb_targets :] = MapElement.mobile
+        self.mobility[: self.nb_agents] = True
+        self.mobility[self.nb_agents + self.nb_targets :] = True
+
+        self._agent_idx = np.arange(0, self.nb_agents)
+        self._target_idx = np.arange(self.nb_agents, nb_entities)
+        self._mobile_idx = np.arange(self.nb_agents + self.nb_targets, nb_entities)
+        self._views = {}
+        # agent cells set in the position mask
+        self._mask_positions = np.zeros((self.nb_agents, 2), dtype=np.int32)
+
+    @property
+    def nb_targets_alive(self) -> int:
+        return int(np.count_nonzero(self.on_map[self.nb_agents :]))
+
+    @property
+    def agents(self) -> Dict[str, Agent]:
+        if "agents" not in self._views:
+            self._views["agents"] = {
+                f"agent_{idx + 1}": Agent(
+                    id_elem=idx + 1,
+                    position=tuple(pos),
+                    has_hv=kind == MapElement.agent_hv,
+                    has_diag=kind == MapElement.agent_diag,
+                )
+                for idx, pos, kind in zip(
+                    self._agent_idx.tolist(),
+                    self.positions[: self.nb_agents].tolist(),
+                    self.kinds[: self.nb_agents].tolist(),
+                )
+            }
+        return self._views["agents"]
+
+    @property
+    def targets(self) -> deque:
+        if "targets" not in self._views:
+            static_idx = self._target_idx[: self.nb_targets]
+            self._views["targets"] = deque(
+                Target(position=tuple(self.positions[idx]), id_elem=idx + 1)
+                for idx in static_idx[self.on_map[static_idx]].tolist()
+            )
+        return self._views["targets"]
+
+    @property
+    def mobiles(self) -> deque:
+        if "mobiles" not in self._views:
+            self._views["mobiles"] = deque(
+                MobileTarget(position=tuple(self.positions[idx]), id_elem=idx + 1)
+                for idx in self._mobile_idx[self.on_map[self._mobile_idx]].tolist()
+            )
+        return self._views["mobiles"]
+
+    @property
+    def agent_position(self) -> Dict[str, Tuple[int, int]]:
+        return {k: v.position for k, v in self.agents.items()}
+
+    def _vision_radii(self) -> np.ndarray:
+        return np.where(
+            self.kinds[: self.nb_agents] == MapElement.agent_diag,
+            self.fow_agents_diag,
+            self.fow_agents_hv,
+        )
+
+    def _agents_vision(self) -> Iterable[Tuple[Tuple[int, int], int]]:
+        return zip(
+            map(tuple, self.positions[: self.nb_agents].tolist()),
+            self._vision_radii().tolist(),
+        )
+
+    def get_entity_state(self) -> dict:
+        on_map = self.on_map[:, np.newaxis]
+        state = {
+            "positions": np.where(on_map, self.positions, 0).astype(np.int32),
+            "kinds": np.where(self.on_map, self.kinds, 0).astype(np.int8),
+        }
+        if self.partially_observable:
+            state["visible_cells"] = self._visible_cells()
+        return state
+
+    def _agent_positions(self) -> np.ndarray:
+        return self.positions[: self.nb_agents]
+
+    def _visible_cells(self) -> np.ndarray:
+        return visible_cells(self._agent_positions(), self._vision_radii(), self.size)
+
+    def reset(self):
+        # Same draw as WorldBase, so that both engines start from the same state
+        self.positions[:] = self._sample_positions()
+        self.alive[:] = True
+        self._views = {}
+
+        self._fill_map()
+        self.capturedTargets, self.capturedMobiles = self._do_captures()
+        self._update_position_state()
+        self.events = np.zeros(0, dtype=EVENT_DTYPE)
+
+    def _entity_kinds(self) -> np.ndarray:
+        return self.kinds
+
+    def _entity_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.positions.copy(), self.alive.copy(), self.on_map.copy()
+
+    def _restore_entities(
+        self, positions: np.ndarray, alive: np.ndarray, on_map: np.ndarray
+    ):
+        self.positions[:] = positions
+        self.alive[:] = alive
+        self.on_map[:] = on_map
+        self._views = {}
+
+    def _apply(self, joint_action: np.ndarray):
+        super()._apply(joint_action)
+        self._views = {}
+
+    def _agent_actions(self, actions: np.ndarray) -> np.ndarray:
+        return np.asarray(actions)
+
+    def _fill_map(self):
+        """
+        Fill map with agents and targets that are still alive
+        """
+        if self.incremental_map:
+            world_map = self.map
+            world_map.fill(MapElement.empty)
+        else:
+            world_map = np.zeros((self.size, self.size), dtype=self.map_dtype)
+        alive_pos = self.positions[self.alive]
+        world_map[alive_pos[:, 0], alive_pos[:, 1]] = self.kinds[self.alive]
+        self.map = world_map
+        self.on_map[:] = self.alive
+
+    def _clear_captured(self):
+        captured = self.on_map & ~self.alive
+        captured_pos = self.positions[captured]
+        self.map[captured_pos[:, 0], captured_pos[:, 1]] = MapElement.empty
+        self.on_map[captured] = False
+
+    def _update_position_state(self, incremental: bool = False):
+        if incremental:
+            previous_pos = self._mask_positions
+            self.position_mask[previous_pos[:, 0], previous_pos[:, 1]] = 0
+        elif self.incremental_map:
+            self.position_mask.fill(0)
+        else:
+            self.position_mask = np.zeros_like(self.map, dtype=self.mask_dtype)
+        agents_pos = self.positions[: self.nb_agents]
+        self.position_mask[agents_pos[:, 0], agents_pos[:, 1]] = 1
+        self._mask_positions[:] = agents_pos
+
+    def _gather_actions(self, joint_action_grid: np.ndarray) -> np.ndarray:
+        agents_pos = self.positions[: self.nb_agents]
+        return np.asarray(joint_action_grid)[agents_pos[:, 0], agents_pos[:, 1]]
+
+    def _move_agents(self, joint_action: np.ndarray):
+        self._move_entities(self._agent_idx, joint_action)
+
+    def _move_mobiles(self):
+        movers = self._mobile_idx[self.alive[self._mobile_idx]]
+        # one draw per live mobile, in id order, as WorldBase does
+        actions = self.rng.integers(len(Actions), size=len(movers))
+        self._move_entities(movers, actions)
+
+    def _move_entities(self, idx: np.ndarray, actions: np.ndarray):
+        """Move entities one after the other, in the order of `idx`.
+
+        A move is applied only if the action is allowed for the entity kind, the
+        destination is inside the map and the destination cell is empty when
+        the entity plays. Only the emptiness test depends on the previous moves,
+        everything else is computed for all entities at once. In the
+        simultaneous move mode there is no loop at all, see
+        `simultaneous_moves`.
+
+        Parameters
+        ----------
+        idx : np.ndarray
+            Rows of the entities to move.
+        actions : np.ndarray
+            Action of each entity.
+        """
+        if self.move_mode == "simultaneous":
+            # every move resolved at once, then applied in one scatter
+            moved, destinations = simultaneous_moves(
+                self.map, self.positions[idx], self.kinds[idx], actions
+            )
+            rows = idx[moved]
+            sources = self.positions[rows]
+            self.map[sources[:, 0], sources[:, 1]] = MapElement.empty
+            self.map[destinations[:, 0], destinations[:, 1]] = self.kinds[rows]
+            self.positions[rows] = destinations
+            return
+        actions = np.asarray(actions, dtype=np.intp)
+        kinds = self.kinds[idx]
+        source = self.positions[idx]
+        destination = source + ACTION_DELTAS[actions]
+        candidates = np.flatnonzero(
+            MOVE_ALLOWED[kinds - MapElement.agent_diag, actions]
+            & (destination >= 0).all(axis=1)
+            & (destination < self.size).all(axis=1)
+        )
+
+        world_map = self.map
+        moved = []
+        for i, (x, y), (nx, ny), kind in zip(
+            candidates.tolist(),
+            source[candidates].tolist(),
+            destination[candidates].tolist(),
+            kinds[candidates].tolist(),
+        ):
+            if world_map[nx, ny] == MapElement.empty:
+                world_map[x, y] = MapElement.empty
+                world_map[nx, ny] = kind
+                moved.append(i)
+        self.positions[idx[moved]] = destination[moved]
+
+    def _do_captures(self) -> Tuple[int, int]:
+        """Captures are checked at once for every target still on the map (like
+        WorldBase, targets captured during reset are counted again at the first
+        update). Only the neighbour cells of the targets are read, instead of
+        the whole map. The number of captures for each target type is returned."""
+        live = self._target_idx[self.on_map[self._target_idx]]
+        neighbours = (
+            self.positions[live][:, np.newaxis, :]
+            + NEIGHBOURHOODS[self.capture_neighbourhood]
+        )
+        inside = ((neighbours >= 0) & (neighbours < self.size)).all(axis=2)
+        neighbours = np.clip(neighbours, 0, self.size - 1)
+        cells = self.map[neighbours[..., 0], neighbours[..., 1]]
+        n_agent_neighbour = np.count_nonzero(
+            inside & (cells <= MapElement.agent), axis=1
+        )
+        captured = live[n_agent_neighbour >= self.capture_min_agents]
+        self.alive[captured] = False
+
+        nMobileCaptures = int(np.count_nonzero(self.mobility[captured]))
+        return len(captured) - nMobileCaptures, nMobileCaptures
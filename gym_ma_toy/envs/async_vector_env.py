@@ -0,0 +1,249 @@
+import multiprocessing as mp
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector import VectorEnv, AutoresetMode
+from gymnasium.vector.utils import batch_space
+
+from .game_base import spawn_rngs
+from .team_catcher_base import TeamCatcherBase, TypeObservation
+
+
+def _shared_array(ctx, shape: Tuple[int, ...], dtype: type):
+    # Raw (lock-free) shared buffer, each worker only writes its own row
+    nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return ctx.RawArray("b", max(nbytes, 1)), shape, np.dtype(dtype)
+
+
+def _as_array(shared) -> np.ndarray:
+    buffer, shape, dtype = shared
+    return np.frombuffer(buffer, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+
+
+def _worker(
+    index: int,
+    env_kwargs: Dict[str, Any],
+    rng: np.random.Generator,
+    pipe,
+    parent_pipe,
+    shared: Dict[str, Any],
+):
+    """Loop of a worker process: it owns one game and answers the control
+    messages of the pipe, the actions, observations, rewards and flags going
+    through the shared arrays."""
+    parent_pipe.close()
+    env = TeamCatcherBase(**env_kwargs)
+    env.np_random = rng
+    obs_buffers = {key: _as_array(value)[index] for key, value in shared["obs"].items()}
+    actions = _as_array(shared["actions"])
+    reward = _as_array(shared["reward"])
+    terminated = _as_array(shared["terminated"])
+    nb_step = _as_array(shared["nb_step"])
+    targets_alive = _as_array(shared["targets_alive"])
+
+    def write(obs: TypeObservation, info: Dict[str, Any]):
+        for key, buffer in obs_buffers.items():
+            np.copyto(buffer, obs[key], casting="unsafe")
+        nb_step[index] = info["step"]
+        targets_alive[index] = info["target alive"]
+
+    try:
+        while True:
+            command, data = pipe.recv()
+            if command == "reset":
+                if data is not None:
+                    env.np_random = data
+                obs, info = env.reset()
+                reward[index], terminated[index] = 0.0, False
+                write(obs, info)
+                pipe.send((True, None))
+            elif command == "step":
+                if terminated[index]:
+                    # the game ended at the previous step, restart it instead
+                    obs, info = env.reset()
+                    reward[index], terminated[index] = 0.0, False
+                else:
+                    obs, reward[index], terminated[index], _, info = env.step(
+                        actions[index]
+                    )
+                write(obs, info)
+                pipe.send((True, None))
+            elif command == "close":
+                pipe.send((True, None))
+                break
+            else:
+                raise RuntimeError(f"Unknown command {command!r}")
+    except (KeyboardInterrupt, Exception) as error:
+        pipe.send((False, error))
+    finally:
+        env.close()
+        pipe.close()
+
+
+class TeamCatcherAsyncVectorEnv(VectorEnv):
+    """
+    Vector environment running each team catcher game in its own process.
+
+    Unlike a generic `AsyncVectorEnv`, nothing big goes through the pipes: the
+    workers write their observations straight into shared-memory arrays whose
+    shapes and dtypes come from the observation space of the game, and read
+    their actions from a shared buffer, as do the rewards, termination flags
+    and infos. The pipes only carry control messages. Games are reset
+    automatically at the step that follows their end
+    (`AutoresetMode.NEXT_STEP`) and draw their randomness from generators
+    spawned from the seed, like `TeamCatcherVectorEnv`.
+
+    Parameters:
+        num_envs (int): Number of games, one worker process each.
+        seed (int): Root seed of the games. Defaults to `None`.
+        copy (bool): If True, `reset` and `step` return a copy of the
+            observations, otherwise views on the shared arrays that are
+            overwritten by the next step. Defaults to `True`.
+        context (str): Multiprocessing start method, the default one of the
+            platform if `None`. Defaults to `None`.
+        The other keyword parameters are the ones of `TeamCatcherBase`; the
+        observations must have a fixed shape (`obs_mode` `"dense"`,
+        `"local"` or `"packed"`).
+
+    Example:
+
+        >>> from gym_ma_toy.envs import TeamCatcherAsyncVectorEnv
+
+        >>> envs = TeamCatcherAsyncVectorEnv(
+        ...     num_envs=2, grid_size=16, nb_agents_hv=8, nb_agents_diag=0,
+        ...     nb_targets=8, nb_mobiles=0,
+        ... )
+        >>> obs, info = envs.reset(seed=0)
+        >>> obs["map"].shape
+        (2, 16, 16)
+        >>> obs, reward, terminated, truncated, info = envs.step(
+        ...     envs.action_space.sample()
+        ... )
+        >>> reward.shape
+        (2,)
+        >>> envs.close()
+
+    """
+
+    metadata = {"render_modes": [], "autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(
+        self,
+        num_envs: int = 8,
+        seed: Optional[int] = None,
+        copy: bool = True,
+        context: Optional[str] = None,
+        **env_kwargs,
+    ):
+        # the spaces and the checks of the arguments are the ones of the game
+        template = TeamCatcherBase(**env_kwargs)
+        if not all(
+            isinstance(space, spaces.Box)
+            for space in template.observation_space.values()
+        ):
+            raise ValueError(
+                "TeamCatcherAsyncVectorEnv needs fixed-shape observations, "
+                f"got obs_mode {template.obs_mode!r}"
+            )
+        self.num_envs = num_envs
+        self.copy = copy
+        self.single_action_space = template.action_space
+        self.single_observation_space = template.observation_space
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+
+        ctx = mp.get_context(context)
+        shared = {
+            "obs": {
+                key: _shared_array(ctx, (num_envs,) + space.shape, space.dtype)
+                for key, space in self.single_observation_space.items()
+            },
+            "actions": _shared_array(
+                ctx, (num_envs,) + self.single_action_space.shape, np.int32
+            ),
+            "reward": _shared_array(ctx, (num_envs,), np.float64),
+            "terminated": _shared_array(ctx, (num_envs,), bool),
+            "nb_step": _shared_array(ctx, (num_envs,), np.int64),
+            "targets_alive": _shared_array(ctx, (num_envs,), np.int64),
+        }
+        self._obs = {key: _as_array(value) for key, value in shared["obs"].items()}
+        self._actions = _as_array(shared["actions"])
+        self._reward = _as_array(shared["reward"])
+        self._terminated = _as_array(shared["terminated"])
+        self._nb_step = _as_array(shared["nb_step"])
+        self._targets_alive = _as_array(shared["targets_alive"])
+
+        self.parent_pipes, self.processes = [], []
+        for index, rng in enumerate(spawn_rngs(seed, num_envs)):
+            parent_pipe, child_pipe = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                name=f"TeamCatcherWorker-{index}",
+                args=(index, env_kwargs, rng, child_pipe, parent_pipe, shared),
+                daemon=True,
+            )
+            self.parent_pipes.append(parent_pipe)
+            self.processes.append(process)
+            process.start()
+            child_pipe.close()
+        self.closed = False
+
+    def reset(
+        self, *, seed: Optional[int] = None, options: Optional[Dict[str, Any]] = None
+    ) -> Tuple[TypeObservation, Dict[str, Any]]:
+        rngs: List[Optional[np.random.Generator]] = [None] * self.num_envs
+        if seed is not None:
+            rngs = spawn_rngs(seed, self.num_envs)
+            self.action_space.seed(seed)
+        for pipe, rng in zip(self.parent_pipes, rngs):
+            pipe.send(("reset", rng))
+        self._wait()
+        return self._observation(), self._info()
+
+    def step(
+        self, actions: np.ndarray
+    ) -> Tuple[TypeObservation, np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        np.copyto(self._actions, actions, casting="unsafe")
+        for pipe in self.parent_pipes:
+            pipe.send(("step", None))
+        self._wait()
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        return (
+            self._observation(),
+            self._reward.copy(),
+            self._terminated.copy(),
+            truncated,
+            self._info(),
+        )
+
+    def _wait(self):
+        errors = [error for success, error in (p.recv() for p in self.parent_pipes)]
+        for error in errors:
+            if error is not None:
+                self.close()
+                raise error
+
+    def _observation(self) -> TypeObservation:
+        if self.copy:
+            return {key: value.copy() for key, value in self._obs.items()}
+        return dict(self._obs)
+
+    def _info(self) -> Dict[str, Any]:
+        return {
+            "step": self._nb_step.copy(),
+            "target alive": self._targets_alive.copy(),
+        }
+
+    def close_extras(self, **kwargs):
+        for pipe, process in zip(self.parent_pipes, self.processes):
+            if process.is_alive():
+                try:
+                    pipe.send(("close", None))
+                    pipe.recv()
+                except (BrokenPipeError, EOFError):
+                    pass
+            pipe.close()
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
@@ -0,0 +1,297 @@
+import numpy as np
+
+from typing import Optional
+
+from .game_base import (
+    MapElement,
+    AuxElement,
+    Actions,
+    ACTION_DELTAS,
+    MOVE_ALLOWED,
+    NEIGHBOURHOODS,
+    capture_plane,
+    disk_offsets,
+    sample_positions,
+    spawn_rngs,
+)
+
+
+class BatchedWorld:
+    """
+    B independent team catcher games stepped together.
+
+    The maps of all the worlds are one (B, size, size) array and the entities of
+    world b are the rows of `positions[b]`, `alive[b]` and `on_map[b]` (agents,
+    then targets, then mobiles, like `ArrayWorld`). An update loops once over the
+    entity rows and moves that entity in every world at the same time, so the
+    Python cost of a step does not grow with B. The rules are the ones of
+    `WorldBase`, including the sequential order of the moves inside a world.
+
+    Worlds whose targets have all been captured are reset by the next update
+    instead of being stepped (autoreset).
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        size: int,
+        nb_agents_hv: int,
+        nb_agents_diag: int,
+        nb_targets: int,
+        nb_mobiles: int,
+        fow_agents_hv: int,
+        fow_agents_diag: int,
+        seed: Optional[int] = None,
+        capture_min_agents: int = 2,
+        capture_neighbourhood: int = 4,
+        map_dtype: type = np.float64,
+        mask_dtype: type = np.int32,
+    ):
+        """
+
+        Parameters
+        ----------
+        batch_size : int
+            Number of worlds.
+        size : int
+            Size of the grid (also called map).
+        nb_agents_hv : int
+            Number of agents with horizontal/vertical mobility.
+        nb_agents_diag : int
+            Number of agents with diagonal mobility.
+        nb_targets : int
+            Number of targets.
+        nb_mobiles : int
+            Number of mobile targets.
+        fow_agents_hv : int
+            Size of the radius of vision of hv agents.
+        fow_agents_diag : int
+            Size of the radius of vision of diag agents
+        seed : int
+            Root seed of `rngs`, one generator per world spawned from its
+            SeedSequence, so that the worlds draw independent streams.
+        capture_min_agents : int
+            Number of neighbour agents needed to capture a target.
+        capture_neighbourhood : int
+            Neighbourhood of a target used by the capture rule, 4 or 8.
+        map_dtype : type
+            dtype of the maps (and of the partial maps).
+        mask_dtype : type
+            dtype of the position masks.
+
+        """
+        if capture_neighbourhood not in NEIGHBOURHOODS:
+            raise ValueError(
+                f"capture_neighbourhood should be one of {list(NEIGHBOURHOODS)}, "
+                f"got {capture_neighbourhood}"
+            )
+        self.batch_size = batch_size
+        self.seed = seed
+        self.rngs = spawn_rngs(seed, batch_size)
+        self.size = size
+        self.nb_agents_hv = nb_agents_hv
+        self.nb_agents_diag = nb_agents_diag
+        self.nb_agents = nb_agents_hv + nb_agents_diag
+        self.nb_targets = nb_targets
+        self.nb_mobiles = nb_mobiles
+        self.nb_entities = self.nb_agents + nb_targets + nb_mobiles
+        self.fow_agents_hv = fow_agents_hv
+        self.fow_agents_diag = fow_agents_diag
+        self.partially_observable = (fow_agents_hv + fow_agents_diag) > 0
+        self.capture_min_agents = capture_min_agents
+        self.capture_neighbourhood = capture_neighbourhood
+
+        self.kinds = np.full(self.nb_entities, MapElement.empty, dtype=np.int16)
+        self.kinds[:nb_agents_hv] = MapElement.agent_hv
+        self.kinds[nb_agents_hv : self.nb_agents] = MapElement.agent_diag
+        self.kinds[self.nb_agents : self.nb_agents + nb_targets] = MapElement.target
+        self.kinds[self.nb_agents + nb_targets :] = MapElement.mobile
+        self._move_rows = MOVE_ALLOWED[self.kinds - MapElement.agent_diag]
+
+        shape = (batch_size, size, size)
+        self.map = np.zeros(shape, dtype=map_dtype)
+        self.position_mask = np.zeros(shape, dtype=mask_dtype)
+        self.partial_map = np.full(shape, AuxElement.fog, dtype=map_dtype)
+        self.positions = np.zeros((batch_size, self.nb_entities, 2), dtype=np.int32)
+        self.alive = np.zeros((batch_size, self.nb_entities), dtype=bool)
+        self.on_map = np.zeros((batch_size, self.nb_entities), dtype=bool)
+        self.capturedTargets = np.zeros(batch_size, dtype=np.int64)
+        self.capturedMobiles = np.zeros(batch_size, dtype=np.int64)
+        self.needs_reset = np.ones(batch_size, dtype=bool)
+        self._batch_idx = np.arange(batch_size)
+
+        self._fog_groups = [
+            (slice(0, nb_agents_hv), disk_offsets(fow_agents_hv)),
+            (slice(nb_agents_hv, self.nb_agents), disk_offsets(fow_agents_diag)),
+        ]
+
+    @property
+    def nb_targets_alive(self) -> np.ndarray:
+        """Number of targets alive in each world."""
+        return np.count_nonzero(self.on_map[:, self.nb_agents :], axis=1)
+
+    @property
+    def totalCaptured(self) -> np.ndarray:
+        """Captured targets of each world after last update."""
+        return self.capturedMobiles + self.capturedTargets
+
+    @property
+    def state(self) -> dict:
+        if self.partially_observable:
+            return {
+                "map": self.map,
+                "position_mask": self.position_mask,
+                "partial_map": self.partial_map,
+            }
+        return {"map": self.map, "position_mask": self.position_mask}
+
+    def reset(self, worlds: Optional[np.ndarray] = None):
+        """Restart some worlds (all of them by default).
+
+        Parameters
+        ----------
+        worlds : np.ndarray, optional
+            Boolean mask or indices of the worlds to reset.
+        """
+        worlds = self._batch_idx[slice(None) if worlds is None else np.asarray(worlds)]
+        for b in worlds.tolist():
+            self.positions[b] = sample_positions(
+                self.size, self.nb_entities, self.rngs[b]
+            )
+        self.alive[worlds] = True
+        self.needs_reset[worlds] = False
+
+        self._fill_map(worlds)
+        captured = self._do_captures(worlds)
+        self.capturedTargets[worlds], self.capturedMobiles[worlds] = captured
+        self._update_position_state(worlds)
+
+    def update(self, joint_action_grid: np.ndarray):
+        """Update every world, worlds that ended at the previous update are reset.
+
+        Parameters
+        ----------
+        joint_action_grid : np.ndarray
+            Array of shape (B, size, size), square grid of action of each world.
+        """
+        agents_pos = self.positions[:, : self.nb_agents]
+        self.update_agents(
+            np.asarray(joint_action_grid)[
+                self._batch_idx[:, np.newaxis], agents_pos[..., 0], agents_pos[..., 1]
+            ]
+        )
+
+    def update_agents(self, actions: np.ndarray):
+        """Update every world from one action per agent, worlds that ended at the
+        previous update are reset.
+
+        Parameters
+        ----------
+        actions : np.ndarray
+            Array of shape (B, nb_agents), action of each agent of each world,
+            ordered by agent id.
+        """
+        restart = self.needs_reset.copy()
+        worlds = self._batch_idx[~restart]
+        joint_action = np.asarray(actions)[worlds]
+
+        self.capturedTargets[worlds], self.capturedMobiles[worlds] = self._do_captures(
+            worlds
+        )
+        for k in range(self.nb_agents):
+            self._move_entity(worlds, k, joint_action[:, k])
+        # one draw per live mobile from the generator of its world, as WorldBase does
+        mobiles_alive = self.alive[worlds, self.nb_entities - self.nb_mobiles :]
+        mobile_actions = np.zeros(mobiles_alive.shape, dtype=np.intp)
+        for i, b in enumerate(worlds.tolist()):
+            live = mobiles_alive[i]
+            mobile_actions[i, live] = self.rngs[b].integers(
+                len(Actions), size=np.count_nonzero(live)
+            )
+        for i in range(self.nb_mobiles):
+            k = self.nb_entities - self.nb_mobiles + i
+            live = mobiles_alive[:, i]
+            self._move_entity(worlds[live], k, mobile_actions[live, i])
+
+        self._fill_map(worlds)
+        self._update_position_state(worlds)
+
+        self.capturedTargets[restart] = 0
+        self.capturedMobiles[restart] = 0
+        if restart.any():
+            self.reset(restart)
+            # no capture is rewarded on the reset transition
+            self.capturedTargets[restart] = 0
+            self.capturedMobiles[restart] = 0
+        self.needs_reset[worlds] = self.nb_targets_alive[worlds] == 0
+
+    def _move_entity(self, worlds: np.ndarray, k: int, actions: np.ndarray):
+        """Apply the move of the entity of row k in each of the given worlds."""
+        actions = np.asarray(actions, dtype=np.intp)
+        source = self.positions[worlds, k]
+        destination = source + ACTION_DELTAS[actions]
+        possible = (
+            self._move_rows[k, actions]
+            & (destination >= 0).all(axis=1)
+            & (destination < self.size).all(axis=1)
+        )
+        clipped = np.clip(destination, 0, self.size - 1)
+        possible &= self.map[worlds, clipped[:, 0], clipped[:, 1]] == MapElement.empty
+        worlds, source, destination = (
+            worlds[possible],
+            source[possible],
+            destination[possible],
+        )
+        self.map[worlds, source[:, 0], source[:, 1]] = MapElement.empty
+        self.map[worlds, destination[:, 0], destination[:, 1]] = self.kinds[k]
+        self.positions[worlds, k] = destination
+
+    def _do_captures(self, worlds: np.ndarray):
+        """The captured targets of all the given worlds are computed with one
+        neighbour count over their maps, then read at the target cells. Returns
+        the (targets, mobiles) captures of each of these worlds."""
+        plane = capture_plane(
+            self.map[worlds], self.capture_min_agents, self.capture_neighbourhood
+        )
+        targets = self.positions[worlds, self.nb_agents :]
+        captured = plane[
+            np.arange(len(worlds))[:, np.newaxis], targets[..., 0], targets[..., 1]
+        ]
+        captured &= self.on_map[worlds, self.nb_agents :]
+        self.alive[worlds, self.nb_agents :] &= ~captured
+
+        nTargetCaptures = np.count_nonzero(captured[:, : self.nb_targets], axis=1)
+        nMobileCaptures = np.count_nonzero(captured[:, self.nb_targets :], axis=1)
+        return nTargetCaptures, nMobileCaptures
+
+    def _fill_map(self, worlds: np.ndarray):
+        self.map[worlds] = MapElement.empty
+        alive = self.alive[worlds]
+        world_idx, entity_idx = np.nonzero(alive)
+        pos = self.positions[worlds[world_idx], entity_idx]
+        self.map[worlds[world_idx], pos[:, 0], pos[:, 1]] = self.kinds[entity_idx]
+        self.on_map[worlds] = alive
+
+    def _update_position_state(self, worlds: np.ndarray):
+        self.position_mask[worlds] = 0
+        agents_pos = self.positions[worlds, : self.nb_agents]
+        self.position_mask[
+            worlds[:, np.newaxis], agents_pos[..., 0], agents_pos[..., 1]
+        ] = 1
+        if self.partially_observable:
+            self._create_fow_state(worlds)
+
+    def _create_fow_state(self, worlds: np.ndarray):
+        visible = np.zeros((len(worlds), self.size, self.size), dtype=bool)
+        for agents, offsets in self._fog_groups:
+            cells = (
+                self.positions[worlds, agents][:, :, np.newaxis, :] + offsets
+            ).reshape(len(worlds), -1, 2)
+            inside = ((cells >= 0) & (cells < self.size)).all(axis=2)
+            world_idx = np.broadcast_to(
+                np.arange(len(worlds))[:, np.newaxis], inside.shape
+            )
+            visible[world_idx[inside], cells[inside][:, 0], cells[inside][:, 1]] = True
+        self.partial_map[worlds] = np.where(
+            visible, self.map[worlds], self.partial_map.dtype.type(AuxElement.fog)
+        )
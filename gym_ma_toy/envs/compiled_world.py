@@ -0,0 +1,67 @@
+import warnings
+
+import numpy as np
+
+from typing import Tuple
+
+from .array_world import ArrayWorld
+from .game_base import ACTION_DELTAS, MOVE_ALLOWED, NEIGHBOURHOODS
+from . import kernels
+
+
+class CompiledWorld(ArrayWorld):
+    """
+    `ArrayWorld` whose movement, capture and fill loops run in the kernels of
+    `kernels`, compiled by Numba.
+
+    The kernels apply the moves one entity after the other like the other
+    engines, so the games are the same. When Numba is not installed the world
+    falls back on the NumPy implementation of `ArrayWorld`, as do the
+    simultaneous moves, already resolved in a few array operations.
+    """
+
+    # the fallback is only reported by the first world, not every env of a vector
+    _warned_fallback = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not kernels.HAS_NUMBA and not CompiledWorld._warned_fallback:
+            CompiledWorld._warned_fallback = True
+            warnings.warn(
+                "Numba is not installed, the compiled engine falls back on NumPy "
+                "(pip install gym_ma_toy[numba])"
+            )
+
+    def _move_entities(self, idx: np.ndarray, actions: np.ndarray):
+        if not kernels.HAS_NUMBA or self.move_mode == "simultaneous":
+            return super()._move_entities(idx, actions)
+        kernels.move_entities(
+            self.map,
+            self.positions,
+            self.kinds,
+            np.asarray(idx, dtype=np.intp),
+            np.asarray(actions, dtype=np.intp),
+            ACTION_DELTAS,
+            MOVE_ALLOWED,
+        )
+
+    def _do_captures(self) -> Tuple[int, int]:
+        if not kernels.HAS_NUMBA:
+            return super()._do_captures()
+        return kernels.do_captures(
+            self.map,
+            self.positions,
+            self.on_map,
+            self.alive,
+            self.mobility,
+            self.nb_agents,
+            NEIGHBOURHOODS[self.capture_neighbourhood],
+            self.capture_min_agents,
+        )
+
+    def _fill_map(self):
+        if not kernels.HAS_NUMBA:
+            return super()._fill_map()
+        if not self.incremental_map:
+            self.map = np.empty((self.size, self.size), dtype=self.map_dtype)
+        kernels.fill_map(self.map, self.positions, self.kinds, self.alive, self.on_map)
@@ -1,9 +1,13 @@
 import abc
 import numpy as np
 
-from typing import Tuple, Dict
+from typing import Any, Callable, Tuple, Dict, Iterable, List, Optional
 from enum import IntEnum, Enum
 from collections import deque
+from functools import lru_cache
+from itertools import chain
+from time import perf_counter
+from numpy.lib.stride_tricks import sliding_window_view
 
 TypeAction = Dict[str, int]
 
@@ -20,6 +24,23 @@ class Actions(IntEnum):
     DOWN_LEFT = 8
 
 
+# (row, column) shift applied by each action, indexed by Actions
+ACTION_DELTAS = np.array(
+    [
+        [0, 0],  # NOOP
+        [-1, 0],  # UP
+        [1, 0],  # DOWN
+        [0, -1],  # LEFT
+        [0, 1],  # RIGHT
+        [-1, 1],  # UP_RIGHT
+        [-1, -1],  # UP_LEFT
+        [1, 1],  # DOWN_RIGHT
+        [1, -1],  # DOWN_LEFT
+    ],
+    dtype=np.int32,
+)
+
+
 class ElementsColors(Enum):
     agent_diag = [0, 128, 128]  # BLUE
     agent_hv = [0, 128, 255]  # BLUE
@@ -58,6 +79,451 @@ class MapElement(IntEnum):
         return self.value == MapElement.mobile
 
 
+# MOVE_ALLOWED[kind - MapElement.agent_diag, action] tells whether an element of
+# that kind can apply the action (hv elements: UP..RIGHT, diag: UP_RIGHT..DOWN_LEFT)
+MOVE_ALLOWED = np.zeros((len(MapElement), len(Actions)), dtype=bool)
+MOVE_ALLOWED[MapElement.agent_diag - MapElement.agent_diag, Actions.UP_RIGHT :] = True
+MOVE_ALLOWED[
+    MapElement.agent_hv - MapElement.agent_diag, Actions.UP : Actions.UP_RIGHT
+] = True
+MOVE_ALLOWED[MapElement.agent - MapElement.agent_diag, Actions.UP :] = True
+MOVE_ALLOWED[
+    MapElement.mobile - MapElement.agent_diag, Actions.UP : Actions.UP_RIGHT
+] = True
+
+
+# Entity kinds of the planes of the "packed" observations, and plane of each
+# kind indexed by kind - MapElement.agent_diag (-1: no plane)
+PACKED_PLANES = (
+    MapElement.agent_hv,
+    MapElement.agent_diag,
+    MapElement.target,
+    MapElement.mobile,
+)
+PLANE_OF_KIND = np.full(len(MapElement), -1, dtype=np.intp)
+PLANE_OF_KIND[np.array(PACKED_PLANES) - MapElement.agent_diag] = np.arange(
+    len(PACKED_PLANES)
+)
+
+
+# Record of an entity that moved or was captured during an update: its id,
+# its MapElement value, its cell before and after the update (the same cell
+# for a capture) and whether it was captured (removed from the map)
+EVENT_DTYPE = np.dtype(
+    [
+        ("id", np.int32),
+        ("kind", np.int8),
+        ("from", np.int32, (2,)),
+        ("to", np.int32, (2,)),
+        ("captured", np.bool_),
+    ]
+)
+
+
+# Order in which the moves of a phase (agents, then mobiles) are applied
+MOVE_MODES = ("sequential", "simultaneous")
+
+
+# Cells around a target that count for its capture, for each neighbourhood
+NEIGHBOURHOODS = {
+    4: np.array([[1, 0], [-1, 0], [0, 1], [0, -1]], dtype=np.int32),
+    8: np.array(
+        [[1, 0], [-1, 0], [0, 1], [0, -1], [1, 1], [1, -1], [-1, 1], [-1, -1]],
+        dtype=np.int32,
+    ),
+}
+
+
+# Cells whose element may be captured after a move to (0, 0): the cell itself
+# (a mobile) and its neighbours (an agent), for each neighbourhood
+CAPTURE_OFFSETS = {
+    neighbourhood: np.concatenate(([[0, 0]], offsets)).astype(np.int32)
+    for neighbourhood, offsets in NEIGHBOURHOODS.items()
+}
+
+
+def count_agent_neighbours(world_map: np.ndarray, neighbourhood: int = 4) -> np.ndarray:
+    """Count the agents around every cell of the map at once.
+
+    The agent occupancy plane is padded with one empty cell on each side, then
+    shifted along each direction of the neighbourhood and summed.
+
+    Parameters
+    ----------
+    world_map : np.ndarray
+        The map, or a batch of maps of shape (..., size, size).
+    neighbourhood : int
+        4 (horizontal/vertical neighbours) or 8 (diagonal neighbours too).
+
+    Returns
+    -------
+    np.ndarray
+        Number of agent neighbours of each cell, same shape as `world_map`.
+    """
+    size_x, size_y = world_map.shape[-2:]
+    agents = (world_map <= MapElement.agent).astype(np.uint8)
+    padding = [(0, 0)] * (world_map.ndim - 2) + [(1, 1), (1, 1)]
+    padded = np.pad(agents, padding)
+    counts = np.zeros(world_map.shape, dtype=np.uint8)
+    for dx, dy in NEIGHBOURHOODS[neighbourhood].tolist():
+        counts += padded[..., 1 + dx : 1 + dx + size_x, 1 + dy : 1 + dy + size_y]
+    return counts
+
+
+def capture_plane(
+    world_map: np.ndarray, min_agents: int = 2, neighbourhood: int = 4
+) -> np.ndarray:
+    """Boolean plane of the targets of the map that are captured.
+
+    A target is captured when at least `min_agents` agents are in its
+    neighbourhood.
+    """
+    captured = count_agent_neighbours(world_map, neighbourhood) >= min_agents
+    captured &= world_map > MapElement.empty
+    return captured
+
+
+@lru_cache(maxsize=None)
+def disk_stencil(radius: int) -> np.ndarray:
+    """Cells seen by an agent, relative to its position.
+
+    Parameters
+    ----------
+    radius : int
+        Radius of vision.
+
+    Returns
+    -------
+    np.ndarray
+        Read-only boolean array of shape (2 * radius + 1, 2 * radius + 1), True
+        where dx ** 2 + dy ** 2 <= radius ** 2. It is cached for each radius.
+    """
+    span = np.arange(-radius, radius + 1)
+    stencil = span[:, np.newaxis] ** 2 + span[np.newaxis, :] ** 2 <= radius**2
+    stencil.flags.writeable = False
+    return stencil
+
+
+def disk_offsets(radius: int) -> np.ndarray:
+    """Cell shifts (dx, dy) of the disk stencil of the given radius."""
+    return (np.argwhere(disk_stencil(radius)) - radius).astype(np.int32)
+
+
+def stamp_stencil(visible: np.ndarray, position: Tuple[int, int], radius: int):
+    """Mark as visible the disk of the given radius around a cell.
+
+    Only the window of the map covered by the disk is touched: the window and
+    the stencil are both clipped at the borders of the map.
+    """
+    stencil = disk_stencil(radius)
+    size_x, size_y = visible.shape
+    cx, cy = position
+    x0, x1 = max(cx - radius, 0), min(cx + radius + 1, size_x)
+    y0, y1 = max(cy - radius, 0), min(cy + radius + 1, size_y)
+    visible[x0:x1, y0:y1] |= stencil[
+        x0 - cx + radius : x1 - cx + radius, y0 - cy + radius : y1 - cy + radius
+    ]
+
+
+def visible_cells(positions: np.ndarray, radii: np.ndarray, size: int) -> np.ndarray:
+    """Cells seen by the agents, listed from their positions.
+
+    The disk offsets of each radius are added to the positions of the agents
+    with that radius, so the cost grows with the number of agents times r ** 2
+    and not with the area of the map.
+
+    Parameters
+    ----------
+    positions : np.ndarray
+        Positions of the agents, shape (nb_agents, 2).
+    radii : np.ndarray
+        Radius of vision of each agent, shape (nb_agents,).
+    size : int
+        Size of the map.
+
+    Returns
+    -------
+    np.ndarray
+        int32 array of shape (nb_visible, 2), without duplicates, in row-major
+        order of the map.
+    """
+    positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+    radii = np.asarray(radii)
+    cells = np.concatenate(
+        [np.empty((0, 2), dtype=np.int64)]
+        + [
+            (
+                positions[radii == radius][:, np.newaxis, :] + disk_offsets(radius)
+            ).reshape(-1, 2)
+            for radius in np.unique(radii).tolist()
+        ]
+    )
+    cells = cells[((cells >= 0) & (cells < size)).all(axis=1)]
+    flat = np.sort(cells[:, 0] * size + cells[:, 1])
+    # disks of neighbour agents overlap, keep each cell once
+    flat = flat[np.concatenate(([True], flat[1:] != flat[:-1]))]
+    return np.stack(np.divmod(flat, size), axis=1).astype(np.int32)
+
+
+def local_patches(
+    world_map: np.ndarray, positions: np.ndarray, patch_size: int
+) -> np.ndarray:
+    """Square windows of the map centred on the given cells.
+
+    The map is padded with fog, then the windows are gathered at once from a
+    strided view of every (patch_size, patch_size) window of the padded map.
+
+    Parameters
+    ----------
+    world_map : np.ndarray
+        The map (or the partial map), shape (size, size).
+    positions : np.ndarray
+        Centres of the windows, shape (nb_windows, 2).
+    patch_size : int
+        Odd side of the windows.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (nb_windows, patch_size, patch_size), with the dtype of
+        the map. Cells out of the map read as fog.
+    """
+    radius = patch_size // 2
+    padded = np.pad(world_map, radius, constant_values=AuxElement.fog)
+    windows = sliding_window_view(padded, (patch_size, patch_size))
+    positions = np.asarray(positions).reshape(-1, 2)
+    return windows[positions[:, 0], positions[:, 1]]
+
+
+def pack_planes(
+    positions: np.ndarray,
+    kinds: np.ndarray,
+    size: int,
+    visible: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Binary occupancy planes of the entities, bit-packed along the columns.
+
+    The bits of the entities are scattered in a zeroed buffer, so the cost
+    grows with the number of entities (and of visible cells) and the buffer
+    has 1 bit per cell.
+
+    Parameters
+    ----------
+    positions : np.ndarray
+        Cells of the entities, shape (nb_entities, 2).
+    kinds : np.ndarray
+        MapElement value of each entity, shape (nb_entities,), 0 for the
+        entities not on the map.
+    size : int
+        Size of the map.
+    visible : np.ndarray, optional
+        Cells out of the fog, shape (nb_visible, 2) without duplicates, as
+        listed by `visible_cells`. When given, the entities are only shown on
+        these cells and a fog plane is added.
+
+    Returns
+    -------
+    np.ndarray
+        uint8 array of shape (nb_planes, size, ceil(size / 8)), the planes of
+        PACKED_PLANES (then fog) laid out like `np.packbits(planes, axis=-1)`:
+        cell (x, y) is bit `0x80 >> (y % 8)` of byte `y // 8` of row x.
+    """
+    nb_planes = len(PACKED_PLANES) + (visible is not None)
+    packed = np.zeros((nb_planes, size, -(-size // 8)), dtype=np.uint8)
+    positions = np.asarray(positions, dtype=np.intp).reshape(-1, 2)
+    planes = PLANE_OF_KIND[np.asarray(kinds, dtype=np.intp) - MapElement.agent_diag]
+    shown = planes >= 0
+    if visible is not None:
+        visible = np.asarray(visible, dtype=np.intp).reshape(-1, 2)
+        # every cell is fogged, padding bits left at 0, then the visible
+        # cells are cleared
+        packed[-1] = np.packbits(np.ones(size, dtype=bool))
+        np.bitwise_and.at(
+            packed[-1],
+            (visible[:, 0], visible[:, 1] >> 3),
+            ~(np.uint8(0x80) >> (visible[:, 1] & 7).astype(np.uint8)),
+        )
+        shown &= np.isin(
+            positions[:, 0] * size + positions[:, 1],
+            visible[:, 0] * size + visible[:, 1],
+        )
+    x, y = positions[shown, 0], positions[shown, 1]
+    np.bitwise_or.at(
+        packed,
+        (planes[shown], x, y >> 3),
+        np.uint8(0x80) >> (y & 7).astype(np.uint8),
+    )
+    return packed
+
+
+def unpack_planes(packed: np.ndarray, size: int) -> np.ndarray:
+    """Boolean planes of `pack_planes` observations.
+
+    Parameters
+    ----------
+    packed : np.ndarray
+        uint8 array of shape (..., nb_planes, size, ceil(size / 8)), e.g. a
+        batch of observations of the `"packed"` mode.
+    size : int
+        Size of the map.
+
+    Returns
+    -------
+    np.ndarray
+        bool array of shape (..., nb_planes, size, size).
+    """
+    return np.unpackbits(packed, axis=-1, count=size).view(bool)
+
+
+def simultaneous_moves(
+    world_map: np.ndarray, sources: np.ndarray, kinds: np.ndarray, actions: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Resolve the moves of several entities played at the same time.
+
+    Every destination is read on the map as it was before the moves: a move
+    is kept if the action is allowed for the entity kind, the destination is
+    inside the map and empty, and no entity listed before it goes to the same
+    cell. Entities cannot move into a cell that another one leaves, so there
+    are no swaps nor chains, and the kept moves can be applied in any order.
+
+    Parameters
+    ----------
+    world_map : np.ndarray
+        The map, shape (size, size).
+    sources : np.ndarray
+        Cells of the entities, shape (nb_entities, 2), in priority order
+        (increasing id).
+    kinds : np.ndarray
+        MapElement value of each entity, shape (nb_entities,).
+    actions : np.ndarray
+        Action of each entity, shape (nb_entities,).
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        Indices of the entities that move, increasing, and their destinations,
+        shape (nb_moves, 2).
+    """
+    actions = np.asarray(actions, dtype=np.intp)
+    kinds = np.asarray(kinds, dtype=np.intp)
+    destination = np.asarray(sources) + ACTION_DELTAS[actions]
+    size_x, size_y = world_map.shape
+    candidates = np.flatnonzero(
+        MOVE_ALLOWED[kinds - MapElement.agent_diag, actions]
+        & (destination >= 0).all(axis=1)
+        & (destination[:, 0] < size_x)
+        & (destination[:, 1] < size_y)
+    )
+    cells = destination[candidates]
+    free = world_map[cells[:, 0], cells[:, 1]] == MapElement.empty
+    candidates, cells = candidates[free], cells[free]
+    # first (lowest id) entity heading to each cell
+    _, first = np.unique(cells[:, 0] * size_y + cells[:, 1], return_index=True)
+    moved = candidates[np.sort(first)]
+    return moved, destination[moved]
+
+
+def apply_delta(
+    world_map: np.ndarray, delta: Dict[str, np.ndarray], base: int = MapElement.empty
+) -> np.ndarray:
+    """Rebuild a map in place from an observation of the "delta" mode.
+
+    Parameters
+    ----------
+    world_map : np.ndarray
+        Map of the previous observation, shape (size, size), updated in place.
+    delta : Dict[str, np.ndarray]
+        Observation with the `keyframe` flag, the changed `cells` (n, 2) and
+        their new `values` (n,).
+    base : int
+        Value of the cells that a keyframe does not list: empty, or fog under
+        the fog of war.
+
+    Returns
+    -------
+    np.ndarray
+        `world_map`.
+    """
+    if delta["keyframe"]:
+        world_map.fill(base)
+    cells = delta["cells"]
+    world_map[cells[:, 0], cells[:, 1]] = delta["values"]
+    return world_map
+
+
+def sample_positions(
+    size: int, nb_entities: int, rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """Draw distinct starting cells for the entities of a world, away from the border.
+
+    The cells are drawn without replacement among the (size - 2) ** 2 inner
+    cells, by drawing cell indices and dropping the repeated ones, so the cost
+    grows with the number of entities and not with the area of the map. A
+    permutation of the cells is used when the entities fill more than half of
+    them.
+
+    Parameters
+    ----------
+    size : int
+        Size of the map.
+    nb_entities : int
+        Number of cells to draw (agents first, then targets, then mobiles).
+    rng : np.random.Generator, optional
+        Generator of the draws, a fresh unseeded one by default.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (nb_entities, 2).
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    inner_size = size - 2
+    nb_cells = inner_size * inner_size
+    if nb_entities > nb_cells:
+        raise ValueError(
+            f"Cannot place {nb_entities} entities on {nb_cells} inner cells"
+        )
+    if 2 * nb_entities > nb_cells:
+        cells = rng.permutation(nb_cells)[:nb_entities]
+    else:
+        cells = np.empty(0, dtype=np.int64)
+        while len(cells) < nb_entities:
+            missing = nb_entities - len(cells)
+            draws = rng.integers(nb_cells, size=2 * missing)
+            cells = np.concatenate((cells, draws))
+            # keep the first draw of each cell, in the order of the draws
+            _, first = np.unique(cells, return_index=True)
+            cells = cells[np.sort(first)]
+        cells = cells[:nb_entities]
+    # cell k is (1 + k % inner_size, 1 + k // inner_size), the order of the
+    # former list of every inner cell
+    return np.stack((1 + cells % inner_size, 1 + cells // inner_size), axis=1).astype(
+        np.int64
+    )
+
+
+def spawn_rngs(seed: Optional[int], nb_rngs: int) -> List[np.random.Generator]:
+    """Independent generators spawned from the SeedSequence of one seed.
+
+    Parameters
+    ----------
+    seed : int, optional
+        Root seed, None draws fresh entropy.
+    nb_rngs : int
+        Number of child generators, one per world.
+
+    Returns
+    -------
+    List[np.random.Generator]
+        Generators whose streams do not overlap.
+    """
+    return [
+        np.random.default_rng(child)
+        for child in np.random.SeedSequence(seed).spawn(nb_rngs)
+    ]
+
+
 class BaseElem(abc.ABC):
     def __init__(
         self,
@@ -89,6 +555,15 @@ class BaseElem(abc.ABC):
     def isOmniMobile(self):
         return self.isMobile and self.hasHV and self.hasDiag
 
+    @property
+    def mapElement(self) -> MapElement:
+        # Value painted on the map for this element
+        if self.isControllable:
+            if self.isOmniMobile:
+                return MapElement.agent
+            return MapElement.agent_hv if self.hasHV else MapElement.agent_diag
+        return MapElement.mobile if self.isMobile else MapElement.target
+
 
 class Agent(BaseElem):
     def __init__(
@@ -138,6 +613,13 @@ class MobileTarget(Target):
 class WorldBase:
     """
     Implementation of the team catcher game. The interface will collect observations from that game.
+
+    Besides the element objects, the world keeps `entity_id`, a (size, size)
+    int32 grid giving the id of the element on each cell (0 if empty), and the
+    rows (id - 1) of the targets on the map in a compact array from which they
+    are swap-removed in O(1) once captured. `targets` and `mobiles` are views
+    built from it, in id order. The captures of an update are only checked for
+    the targets next to the cells reached by a move since the previous check.
     """
 
     def __init__(
@@ -150,6 +632,14 @@ class WorldBase:
         fow_agents_hv: int,
         fow_agents_diag: int,
         seed: int,
+        capture_min_agents: int = 2,
+        capture_neighbourhood: int = 4,
+        incremental_map: bool = False,
+        map_dtype: type = np.float64,
+        mask_dtype: type = np.int32,
+        profile: bool = False,
+        record_events: bool = False,
+        move_mode: str = "sequential",
     ):
         """
 
@@ -171,11 +661,49 @@ class WorldBase:
             Size of the radius of vision of diag agents
 
         seed : int
-            Random seed.
+            Seed of `rng`, the generator of every random draw of the world.
+        capture_min_agents : int
+            Number of neighbour agents needed to capture a target.
+        capture_neighbourhood : int
+            Neighbourhood of a target used by the capture rule, 4 (horizontal/
+            vertical neighbours) or 8 (diagonal neighbours too).
+        incremental_map : bool
+            If True, the map, the position mask and the partial map are
+            allocated once and then updated in place: an update only touches
+            the vacated, occupied and captured cells, so its cost does not
+            depend on the map area. The arrays of the state are then the same
+            objects for the whole life of the world and are overwritten by the
+            next update or reset.
+        map_dtype : type
+            dtype of the map (and of the partial map), kept for the whole game.
+        mask_dtype : type
+            dtype of the position mask.
+        profile : bool
+            Time each phase of the updates, see `profile_stats`.
+        record_events : bool
+            Keep in `events` the entities moved or captured by the last update,
+            as an array of EVENT_DTYPE records in id order (empty after a
+            reset).
+        move_mode : str
+            "sequential": the agents, then the mobiles, move one after the
+            other in id order, each one seeing the moves of the previous ones.
+            "simultaneous": the moves of the agents, then the ones of the
+            mobiles, are resolved at once on the map before them, see
+            `simultaneous_moves`.
 
         """
+        if capture_neighbourhood not in NEIGHBOURHOODS:
+            raise ValueError(
+                f"capture_neighbourhood should be one of {list(NEIGHBOURHOODS)}, "
+                f"got {capture_neighbourhood}"
+            )
+        if move_mode not in MOVE_MODES:
+            raise ValueError(
+                f"move_mode should be one of {list(MOVE_MODES)}, got {move_mode!r}"
+            )
 
         self.seed = seed
+        self.rng = np.random.default_rng(seed)
         self.size = size
         self.nb_agents_hv = nb_agents_hv
         self.nb_agents_diag = nb_agents_diag
@@ -186,13 +714,58 @@ class WorldBase:
         self.fow_agents_hv = fow_agents_hv
         self.fow_agents_diag = fow_agents_diag
         self.partially_observable = (fow_agents_hv + fow_agents_diag) > 0
-        self.map = np.zeros((self.size, self.size))  # initialize map
-        self.agents = dict()
-        self.targets = deque()
-        self.mobiles = deque()
+        self.capture_min_agents = capture_min_agents
+        self.capture_neighbourhood = capture_neighbourhood
+        self.incremental_map = incremental_map
+        self.move_mode = move_mode
+        self.map_dtype = map_dtype
+        self.mask_dtype = mask_dtype
+        self._phase_stats = {} if profile else None
+        self.record_events = record_events
+        self.events = np.zeros(0, dtype=EVENT_DTYPE)
+        self._init_planes()
+        self._init_entities()
         self.capturedTargets = 0
         self.capturedMobiles = 0
 
+    def _init_planes(self):
+        # Map and position mask, overridden by engines with another map storage
+        self.map = np.zeros((self.size, self.size), dtype=self.map_dtype)
+        self.position_mask = np.zeros((self.size, self.size), dtype=self.mask_dtype)
+        if self.incremental_map and self.partially_observable:
+            # buffers of the fog of war, filled in place
+            self.partial_map = np.zeros((self.size, self.size), dtype=self.map_dtype)
+            self._visible = np.zeros((self.size, self.size), dtype=bool)
+
+    def _init_entities(self):
+        # Entity containers, overridden by engines with another storage layout
+        self.agents = dict()
+        # every target and mobile, captured or not, reused from one reset to the next
+        self._all_targets = []
+        # every element, by row (id - 1)
+        self._elements: List[BaseElem] = []
+        self._element_kinds = np.repeat(
+            [
+                MapElement.agent_hv,
+                MapElement.agent_diag,
+                MapElement.target,
+                MapElement.mobile,
+            ],
+            [self.nb_agents_hv, self.nb_agents_diag, self.nb_targets, self.nb_mobiles],
+        )
+        nb_entities = self.nb_agents + self.nb_targets + self.nb_mobiles
+        self.entity_id = np.zeros((self.size, self.size), dtype=np.int32)
+        # rows of the targets on the map in _live[:_nb_live], slot of each row
+        # in _live (-1 when off the map)
+        self._live = np.zeros(self.nb_targets + self.nb_mobiles, dtype=np.intp)
+        self._live_slot = np.full(nb_entities, -1, dtype=np.intp)
+        self._nb_live = 0
+        self._target_views: Tuple[deque, deque] = None
+        # cells reached by a move since the last capture check, unless every
+        # target has to be checked
+        self._reached: List[Tuple[int, int]] = []
+        self._check_all = True
+
     @property
     def nb_targets_alive(self) -> int:
         """
@@ -202,7 +775,56 @@ class WorldBase:
         int
             Targets alive.
         """
-        return len(self.targets) + len(self.mobiles)
+        return self._nb_live
+
+    @property
+    def targets(self) -> deque:
+        """Static targets on the map, in id order."""
+        return self._live_views()[0]
+
+    @property
+    def mobiles(self) -> deque:
+        """Mobile targets on the map, in id order."""
+        return self._live_views()[1]
+
+    def _live_views(self) -> Tuple[deque, deque]:
+        # built on access once the live targets changed
+        if self._target_views is None:
+            rows = np.sort(self._live[: self._nb_live])
+            split = np.searchsorted(rows, self.nb_agents + self.nb_targets)
+            elements = self._elements
+            self._target_views = (
+                deque(elements[row] for row in rows[:split].tolist()),
+                deque(elements[row] for row in rows[split:].tolist()),
+            )
+        return self._target_views
+
+    def _set_live(self, rows: np.ndarray):
+        # the targets of `rows` are the ones on the map
+        self._live_slot[self.nb_agents :] = -1
+        self._nb_live = len(rows)
+        self._live[: self._nb_live] = rows
+        self._live_slot[rows] = np.arange(self._nb_live)
+        self._target_views = None
+
+    def _remove_target(self, row: int):
+        # swap-remove of a target from the live ones, O(1)
+        slot = self._live_slot[row]
+        last = self._live[self._nb_live - 1]
+        self._live[slot] = last
+        self._live_slot[last] = slot
+        self._live_slot[row] = -1
+        self._nb_live -= 1
+        self._target_views = None
+
+    def _dead_rows(self) -> List[int]:
+        # captured targets still on the map
+        elements = self._elements
+        return [
+            row
+            for row in self._live[: self._nb_live].tolist()
+            if not elements[row].isAlive
+        ]
 
     @property
     def totalCaptured(self) -> int:
@@ -215,70 +837,53 @@ class WorldBase:
         """
         return self.capturedMobiles + self.capturedTargets
 
+    def _sample_positions(self) -> np.ndarray:
+        return sample_positions(
+            self.size, self.nb_agents + self.nb_targets + self.nb_mobiles, self.rng
+        )
+
     def reset(self):
         # Restart the game
         # At each episode the targets are resuscitated.
 
-        self.targets = deque()
-        self.mobiles = deque()  # Clear the targets and mobiles at each reset
-
-        all_positions = [
-            (i, j) for j in range(1, self.size - 1) for i in range(1, self.size - 1)
-        ]
-        random_idx = np.arange(0, (self.size - 2) * (self.size - 2))
-        np.random.shuffle(random_idx)
-
-        agents_pos = [all_positions[random_idx[i]] for i in range(self.nb_agents)]
+        positions = [tuple(pos) for pos in self._sample_positions().tolist()]
+        if not self.agents:
+            self._create_elements()
+        # The elements are created once and moved to their new cells
+        for element, pos in zip(self._elements, positions):
+            element.position = pos
+        for target in self._all_targets:
+            target.isAlive = True
+        # Clear the captured targets and mobiles at each reset
+        self._set_live(np.arange(self.nb_agents, len(self._elements)))
 
-        targets_pos = [
-            all_positions[random_idx[i]]
-            for i in range(
-                self.nb_agents, self.nb_agents + self.nb_targets + self.nb_mobiles
+        self._fill_map()
+        self._check_all = True
+        self.capturedTargets, self.capturedMobiles = self._do_captures()
+        # the targets captured here are counted again by the next update
+        self._check_all = True
+        self._update_position_state()
+        self.events = np.zeros(0, dtype=EVENT_DTYPE)
+
+    def _create_elements(self):
+        # Agents (hv first, then diag), then targets, then mobiles, ids from 1
+        for agentIdx in range(self.nb_agents):
+            has_hv = agentIdx < self.nb_agents_hv
+            self.agents[f"agent_{agentIdx + 1}"] = Agent(
+                id_elem=(agentIdx + 1),
+                position=None,
+                has_hv=has_hv,
+                has_diag=not has_hv,
             )
-        ]
-
-        n_hv = self.nb_agents_hv
-        n_diag = self.nb_agents_diag
-        for agentIdx, pos in enumerate(agents_pos):
-            if n_hv > 0:
-                self.agents.update(
-                    {
-                        f"agent_{agentIdx + 1}": Agent(
-                            id_elem=(agentIdx + 1),
-                            position=agents_pos[agentIdx],
-                            has_hv=True,
-                            has_diag=False,
-                        )
-                    }
-                )
-                n_hv -= 1
-            elif n_diag > 0:
-                self.agents.update(
-                    {
-                        f"agent_{agentIdx + 1}": Agent(
-                            id_elem=(agentIdx + 1),
-                            position=agents_pos[agentIdx],
-                            has_hv=False,
-                            has_diag=True,
-                        )
-                    }
-                )
-                n_diag -= 1
-        targetIdx = len(agents_pos) + 1
+        targetIdx = self.nb_agents + 1
         for i in range(self.nb_targets + self.nb_mobiles):
             if i < self.nb_targets:
-                self.targets.append(
-                    Target(position=targets_pos[i], id_elem=targetIdx + i)
-                )
+                self._all_targets.append(Target(position=None, id_elem=targetIdx + i))
             else:
-                self.mobiles.append(
-                    MobileTarget(position=targets_pos[i], id_elem=targetIdx + i)
+                self._all_targets.append(
+                    MobileTarget(position=None, id_elem=targetIdx + i)
                 )
-
-        self._fill_map()
-        self.capturedTargets, self.capturedMobiles = self._do_captures()
-        # self._do_captures()
-        self._update_position_state()
+        self._elements = list(self.agents.values()) + self._all_targets
 
     def _fill_map(self):
         """
@@ -287,56 +892,63 @@ class WorldBase:
 
         """
         # start with empty cells
-        self.map = np.ones((self.size, self.size)) * MapElement.empty
-
-        # add agents
-        for _, agent in self.agents.items():
-            agentPosition = agent.position
-            element = MapElement.agent
-            if not agent.isOmniMobile:
-                if not agent.hasHV:
-                    element = MapElement.agent_diag
-                else:
-                    element = MapElement.agent_hv
-            self.map[agentPosition[0], agentPosition[1]] = element
-        # add targets
-        for target in self.targets + self.mobiles:
-            targetPosition = target.position
-            if target.isAlive:
-                if target.isMobile:
-                    self.map[targetPosition[0], targetPosition[1]] = MapElement.mobile
-                else:
-                    self.map[targetPosition[0], targetPosition[1]] = MapElement.target
+        if self.incremental_map:
+            self.map.fill(MapElement.empty)
+        else:
+            self.map = np.full((self.size, self.size), MapElement.empty, self.map_dtype)
+        self.entity_id.fill(0)
+
+        # remove dead targets
+        for row in self._dead_rows():
+            self._remove_target(row)
+        # add agents and targets
+        rows = np.concatenate((np.arange(self.nb_agents), self._live[: self._nb_live]))
+        elements = self._elements
+        cells = np.array(
+            [elements[row].position for row in rows.tolist()], dtype=np.intp
+        ).reshape(-1, 2)
+        self.map[cells[:, 0], cells[:, 1]] = self._element_kinds[rows]
+        self.entity_id[cells[:, 0], cells[:, 1]] = rows + 1
+
+    def _clear_captured(self):
+        """
+        Incremental counterpart of `_fill_map`: only the cells of the captured
+        targets are emptied, the moves having already been written on the map.
+        """
+        for row in self._dead_rows():
+            x, y = self._elements[row].position
+            self.map[x, y] = MapElement.empty
+            self.entity_id[x, y] = 0
+            self._remove_target(row)
+
+    def _agents_vision(self) -> Iterable[Tuple[Tuple[int, int], int]]:
+        # (position, radius of vision) of each agent
+        for _, pos in self.agent_position.items():
+            if self.map[pos] == MapElement.agent_diag:
+                yield pos, self.fow_agents_diag
             else:
-                # remove dead targets
-                if target.isMobile:
-                    self.mobiles.remove(target)
-                else:
-                    self.targets.remove(target)
+                yield pos, self.fow_agents_hv
 
     def _create_fow_state(self, state):
+        # The visible cells are stamped with a cached disk stencil around each
+        # agent, so the cost grows with the number of agents times r ** 2
         fog_free_map = state["map"]
-        agents_pos = self.agent_position
-
-        x = np.arange(0, self.size)
-        y = np.arange(0, self.size)
-        fog = np.ones_like(fog_free_map) * AuxElement.fog
-
-        for _, pos in agents_pos.items():
-            if fog_free_map[pos] == MapElement.agent_hv:
-                r = self.fow_agents_hv
-
-            elif fog_free_map[pos] == MapElement.agent_diag:
-                r = self.fow_agents_diag
-
-            cx, cy = pos
-            mask = (
-                (x[np.newaxis, :] - cx) ** 2 + (y[:, np.newaxis] - cy) ** 2 <= r**2
-            ).T  # transposition is needded
-            fog[mask] = 1
-
-        foged_map = np.ones_like(fog_free_map) * AuxElement.fog
-        foged_map[fog == 1] = fog_free_map[fog == 1]
+        if self.incremental_map:
+            visible = self._visible
+            visible.fill(False)
+        else:
+            visible = np.zeros(fog_free_map.shape, dtype=bool)
+        for pos, radius in self._agents_vision():
+            stamp_stencil(visible, pos, radius)
+
+        if self.incremental_map:
+            foged_map = self.partial_map
+            foged_map.fill(AuxElement.fog)
+            np.copyto(foged_map, fog_free_map, where=visible)
+        else:
+            foged_map = np.where(
+                visible, fog_free_map, fog_free_map.dtype.type(AuxElement.fog)
+            )
         return {
             "map": self.map,
             "position_mask": self.position_mask,
@@ -346,17 +958,204 @@ class WorldBase:
     @property
     def get_state(self) -> dict:
         if self.partially_observable:
-            return self._create_fow_state(self.state)
+            return self.run_phase("fog", self._create_fow_state, self.state)
         return self.state
 
+    def get_entity_state(self) -> dict:
+        """
+        Sparse counterpart of `get_state`, built from the entities instead of
+        the map.
+
+        Returns
+        -------
+        dict
+            positions: (nb_entities, 2) int32, cell of each entity, in id order
+                (agents, then targets, then mobiles).
+            kinds: (nb_entities,) int8, MapElement value of each entity, 0
+                (empty) for the targets that are no longer on the map, whose
+                position is then 0 too.
+            visible_cells: (nb_visible, 2) int32, cells out of the fog, only
+                when the world is partially observable.
+        """
+        nb_entities = self.nb_agents + self.nb_targets + self.nb_mobiles
+        positions = np.zeros((nb_entities, 2), dtype=np.int32)
+        kinds = np.zeros(nb_entities, dtype=np.int8)
+        for elem in chain(self.agents.values(), self.targets, self.mobiles):
+            positions[elem.id - 1] = elem.position
+            kinds[elem.id - 1] = elem.mapElement
+        state = {"positions": positions, "kinds": kinds}
+        if self.partially_observable:
+            state["visible_cells"] = self._visible_cells()
+        return state
+
+    def get_packed_state(self) -> dict:
+        """
+        Binary occupancy planes of the map, bit-packed, built from the entities
+        without reading the map.
+
+        Returns
+        -------
+        dict
+            planes: (nb_planes, size, ceil(size / 8)) uint8, the agent_hv,
+                agent_diag, target and mobile planes of the map (of the
+                partial map under the fog of war, then with a fog plane),
+                packed along the columns as by `np.packbits`; see
+                `unpack_planes`.
+        """
+        state = self.get_entity_state()
+        planes = pack_planes(
+            state["positions"], state["kinds"], self.size, state.get("visible_cells")
+        )
+        return {"planes": planes}
+
+    def get_local_state(self, patch_size: int) -> dict:
+        """
+        Egocentric view of each agent.
+
+        Parameters
+        ----------
+        patch_size : int
+            Odd side of the window seen by each agent.
+
+        Returns
+        -------
+        dict
+            local_map: (nb_agents, patch_size, patch_size) window of the map
+                (of the partial map under the fog of war) centred on each
+                agent, in id order. Cells out of the map read as fog.
+        """
+        state = self.get_state
+        world_map = state["partial_map"] if self.partially_observable else state["map"]
+        return {
+            "local_map": local_patches(world_map, self._agent_positions(), patch_size)
+        }
+
+    def _agent_positions(self) -> np.ndarray:
+        return np.array([agent.position for agent in self.agents.values()])
+
+    def _visible_cells(self) -> np.ndarray:
+        positions, radii = zip(*self._agents_vision())
+        return visible_cells(np.array(positions), np.array(radii), self.size)
+
     @property
     def state(self) -> dict:
         return {"map": self.map, "position_mask": self.position_mask}
 
-    def _update_position_state(self):
+    def get_state_snapshot(self) -> dict:
+        """
+        Record of the whole game, to branch it with `restore_state_snapshot`.
+
+        Returns
+        -------
+        dict
+            map: copy of the map.
+            positions: (nb_entities, 2) int32, cell of each entity, in id order.
+            alive: (nb_entities,) bool, the entity is not captured.
+            on_map: (nb_entities,) bool, the entity was alive when the map was
+                last filled.
+            captured: (2,) int64, targets and mobiles captured at the last
+                update.
+            rng: state of the bit generator of `rng`.
+        """
+        positions, alive, on_map = self._entity_columns()
+        return {
+            "map": self.map.copy(),
+            "positions": positions,
+            "alive": alive,
+            "on_map": on_map,
+            "captured": np.array([self.capturedTargets, self.capturedMobiles]),
+            "rng": self.rng.bit_generator.state,
+        }
+
+    def restore_state_snapshot(self, snapshot: dict):
+        """
+        Put the game back in the state recorded by `get_state_snapshot`. The
+        snapshot is left untouched, it can be restored again.
+
+        Parameters
+        ----------
+        snapshot : dict
+            Record returned by `get_state_snapshot`.
+        """
+        self._restore_map(snapshot["map"])
+        self._restore_entities(
+            snapshot["positions"], snapshot["alive"], snapshot["on_map"]
+        )
+        self.capturedTargets, self.capturedMobiles = snapshot["captured"].tolist()
+        self.rng.bit_generator.state = snapshot["rng"]
+        self._update_position_state()
+        self.events = np.zeros(0, dtype=EVENT_DTYPE)
+
+    def _restore_map(self, world_map: np.ndarray):
+        if self.incremental_map:
+            np.copyto(self.map, world_map)
+        else:
+            self.map = world_map.copy()
+
+    def _entity_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # (positions, alive, on_map) of the entities, in id order
+        nb_entities = self.nb_agents + self.nb_targets + self.nb_mobiles
+        positions = np.zeros((nb_entities, 2), dtype=np.int32)
+        alive = np.ones(nb_entities, dtype=bool)
+        on_map = np.zeros(nb_entities, dtype=bool)
+        for agent in self.agents.values():
+            positions[agent.id - 1] = agent.position
+        on_map[: self.nb_agents] = True
+        for target in self._all_targets:
+            positions[target.id - 1] = target.position
+            alive[target.id - 1] = target.isAlive
+        for target in chain(self.targets, self.mobiles):
+            on_map[target.id - 1] = True
+        return positions, alive, on_map
+
+    def _entity_kinds(self) -> np.ndarray:
+        # MapElement value of each entity, in id order
+        return self._element_kinds
+
+    def _diff_events(
+        self, before: Tuple[np.ndarray, np.ndarray, np.ndarray]
+    ) -> np.ndarray:
+        # events of the update from the entity columns recorded before it
+        positions, _, on_map = before
+        new_positions, _, new_on_map = self._entity_columns()
+        captured = on_map & ~new_on_map
+        moved = (positions != new_positions).any(axis=1) & new_on_map
+        rows = np.flatnonzero(moved | captured)
+        events = np.zeros(len(rows), dtype=EVENT_DTYPE)
+        events["id"] = rows + 1
+        events["kind"] = self._entity_kinds()[rows]
+        events["from"] = positions[rows]
+        events["to"] = new_positions[rows]
+        events["captured"] = captured[rows]
+        return events
+
+    def _restore_entities(
+        self, positions: np.ndarray, alive: np.ndarray, on_map: np.ndarray
+    ):
+        for element, position in zip(self._elements, positions.tolist()):
+            element.position = tuple(position)
+        for target in self._all_targets:
+            target.isAlive = bool(alive[target.id - 1])
+        on_map = np.asarray(on_map, dtype=bool).copy()
+        on_map[: self.nb_agents] = True
+        self._set_live(np.flatnonzero(on_map[self.nb_agents :]) + self.nb_agents)
+        self.entity_id.fill(0)
+        cells = positions[on_map]
+        self.entity_id[cells[:, 0], cells[:, 1]] = np.flatnonzero(on_map) + 1
+        self._reached = []
+        self._check_all = True
+
+    def _update_position_state(self, incremental: bool = False):
         # Updates the current state of the game (which will be returned by the step and reset method of the gym interface)
+        if incremental:
+            # only the cells left by the agents are cleared
+            previous_list = np.array(list(self.agent_position.values()))
+            self.position_mask[previous_list[:, 0], previous_list[:, 1]] = 0
+        elif self.incremental_map:
+            self.position_mask.fill(0)
+        else:
+            self.position_mask = np.zeros_like(self.map, dtype=self.mask_dtype)
         self.agent_position = {k: v.position for k, v in self.agents.items()}
-        self.position_mask = np.zeros_like(self.map, dtype=np.int32)
         position_list = np.array([v.position for v in self.agents.values()])
         self.position_mask[position_list[:, 0], position_list[:, 1]] = 1
 
@@ -396,148 +1195,30 @@ class WorldBase:
                 or (mobile.hasDiag and action >= Actions.UP_RIGHT)
             )
         ):
-            if isAgent:
-                element = MapElement.agent
-            else:
-                element = MapElement.target
-
-            # list of possible actions
-            possibleActions = [False] * (len(Actions) - 1)  # up,down,
-            # left,right, up_right, up_left, down_right, down_left
-            action_space = [
-                Actions.UP,
-                Actions.DOWN,
-                Actions.LEFT,
-                Actions.RIGHT,
-                Actions.UP_RIGHT,
-                Actions.UP_LEFT,
-                Actions.DOWN_RIGHT,
-                Actions.DOWN_LEFT,
-            ]
-            movements = [
-                [-1, 0, 0],
-                [1, 0, self.size],
-                [0, -1, 0],
-                [0, 1, self.size],
-                # diagonal movements have 2 boundaries
-                [-1, 1, 0, self.size],
-                [-1, -1, 0, 0],
-                [1, 1, self.size, self.size],
-                [1, -1, self.size, 0],
-            ]
-            for actionIdx in range(len(action_space)):
-                shift0 = movements[actionIdx][0]
-                shift1 = movements[actionIdx][1]
-                boundary = movements[actionIdx][2]
-                if actionIdx < 2:  # test UP and DOWN
-                    if boundary == 0:
-                        possibleActions[actionIdx] = (
-                            mobile.position[0] + shift0 >= boundary
-                            and self.map[
-                                mobile.position[0] + shift0, mobile.position[1]
-                            ]
-                            == MapElement.empty
-                        )
-
-                    else:
-                        possibleActions[actionIdx] = (
-                            mobile.position[0] + shift0 < boundary
-                            and self.map[
-                                mobile.position[0] + shift0, mobile.position[1]
-                            ]
-                            == MapElement.empty
-                        )
-                elif actionIdx < 4:  # test LEFT and RIGHT
-                    if boundary == 0:
-                        possibleActions[actionIdx] = (
-                            mobile.position[1] + shift1 >= boundary
-                            and self.map[
-                                mobile.position[0], mobile.position[1] + shift1
-                            ]
-                            == MapElement.empty
-                        )
-                    else:
-                        possibleActions[actionIdx] = (
-                            mobile.position[1] + shift1 < boundary
-                            and self.map[
-                                mobile.position[0], mobile.position[1] + shift1
-                            ]
-                            == MapElement.empty
-                        )
-
-                elif actionIdx >= 4:  # test diagonal moove
-                    boundary0 = movements[actionIdx][2]
-                    boundary1 = movements[actionIdx][3]
-
-                    if (boundary0 == 0) and (boundary1 == self.size):  # UP_RIGHT
-                        possibleActions[actionIdx] = (
-                            (mobile.position[0] + shift0 >= boundary0)
-                            and (mobile.position[1] + shift1 < boundary1)
-                            and (
-                                self.map[
-                                    mobile.position[0] + shift0,
-                                    mobile.position[1] + shift1,
-                                ]
-                                == MapElement.empty
-                            )
-                        )
-                    elif (boundary0 == 0) and (boundary1 == 0):  # UP_LEFT
-                        possibleActions[actionIdx] = (
-                            (mobile.position[0] + shift0 >= boundary0)
-                            and (mobile.position[1] + shift1 >= boundary1)
-                            and (
-                                self.map[
-                                    mobile.position[0] + shift0,
-                                    mobile.position[1] + shift1,
-                                ]
-                                == MapElement.empty
-                            )
-                        )
-                    elif (boundary0 == self.size) and (
-                        boundary1 == self.size
-                    ):  # DOWN_RIGHT
-                        possibleActions[actionIdx] = (
-                            (mobile.position[0] + shift0 < boundary0)
-                            and (mobile.position[1] + shift1 < boundary1)
-                            and (
-                                self.map[
-                                    mobile.position[0] + shift0,
-                                    mobile.position[1] + shift1,
-                                ]
-                                == MapElement.empty
-                            )
-                        )
-
-                    else:  # DOWN_LEFT
-                        possibleActions[actionIdx] = (
-                            (mobile.position[0] + shift0 < boundary0)
-                            and (mobile.position[1] + shift1 >= boundary1)
-                            and (
-                                self.map[
-                                    mobile.position[0] + shift0,
-                                    mobile.position[1] + shift1,
-                                ]
-                                == MapElement.empty
-                            )
-                        )
-
-            # do the action if it is possible
-            actionIdx = int(action) - 1  # not considering NOOP
-            if possibleActions[actionIdx]:
-                shift0 = movements[actionIdx][0]
-                shift1 = movements[actionIdx][1]
-                self.map[mobile.position[0], mobile.position[1]] = MapElement.empty
-                self.map[mobile.position[0] + shift0, mobile.position[1] + shift1] = (
-                    element
-                )
-                mobile.position = (
-                    mobile.position[0] + shift0,
-                    mobile.position[1] + shift1,
-                )
+            # only the destination of the chosen action is checked
+            shift0, shift1 = ACTION_DELTAS[action].tolist()
+            x, y = mobile.position
+            nx, ny = x + shift0, y + shift1
+            if (
+                0 <= nx < self.size
+                and 0 <= ny < self.size
+                and self.map[nx, ny] == MapElement.empty
+            ):
+                self.map[x, y] = MapElement.empty
+                self.map[nx, ny] = mobile.mapElement
+                self.entity_id[x, y] = 0
+                self.entity_id[nx, ny] = mobile.id
+                mobile.position = (nx, ny)
+                self._reached.append((nx, ny))
 
     @classmethod
     def agent_capture(
-        cls, pixel: Tuple[int, int], size: int, world_map: np.ndarray
+        cls,
+        pixel: Tuple[int, int],
+        size: int,
+        world_map: np.ndarray,
+        min_agents: int = 2,
+        neighbourhood: int = 4,
     ) -> bool:
         """Check if a target is captured by the agents
 
@@ -549,6 +1230,10 @@ class WorldBase:
             Size of the map.
         world_map : np.ndarray
             The map.
+        min_agents : int
+            Number of neighbour agents needed to capture the target.
+        neighbourhood : int
+            4 or 8 neighbourhood.
 
         Returns
         -------
@@ -556,46 +1241,90 @@ class WorldBase:
             True if a target is captured, else False.
 
         """
-        potential_neighborhood = [
-            (pixel[0] + 1, pixel[1]),
-            (pixel[0] - 1, pixel[1]),
-            (pixel[0], pixel[1] + 1),
-            (pixel[0], pixel[1] - 1),
-        ]
         n_agent_neighbour = 0
 
-        for neighbour in potential_neighborhood:
+        for shift0, shift1 in NEIGHBOURHOODS[neighbourhood].tolist():
+            neighbour = (pixel[0] + shift0, pixel[1] + shift1)
             if 0 <= neighbour[0] < size and 0 <= neighbour[1] < size:
                 if world_map[neighbour[0], neighbour[1]] <= MapElement.agent:
                     n_agent_neighbour += 1
-        return n_agent_neighbour >= 2
+        return n_agent_neighbour >= min_agents
+
+    def _capture_candidates(self) -> np.ndarray:
+        """Rows of the targets whose capture has to be checked: all the targets
+        on the map after a reset or a restore, otherwise the ones on a cell
+        reached by a move since the previous check or next to it. The others
+        had too few agents around them and none came closer."""
+        if self._check_all:
+            self._check_all = False
+            self._reached = []
+            return np.sort(self._live[: self._nb_live])
+        if not self._reached:
+            return np.zeros(0, dtype=np.intp)
+        reached = np.array(self._reached, dtype=np.intp)
+        self._reached = []
+        cells = (
+            reached[:, np.newaxis, :] + CAPTURE_OFFSETS[self.capture_neighbourhood]
+        ).reshape(-1, 2)
+        cells = cells[((cells >= 0) & (cells < self.size)).all(axis=1)]
+        ids = self.entity_id[cells[:, 0], cells[:, 1]]
+        return np.unique(ids[ids > self.nb_agents]) - 1
 
     def _do_captures(self) -> Tuple[int, int]:
-        """For each target, we check if it is captured and update its status.
+        """Only the neighbours of the candidate targets (see
+        `_capture_candidates`) are read, at once, so the cost grows with the
+        number of moves rather than with the map area or the number of targets.
         The number of captures for each target type is returned."""
 
-        nTargetCaptures = 0
-        nMobileCaptures = 0
-
-        for target in self.targets + self.mobiles:
-            targetPosition = target.position
-            if self.agent_capture(
-                (targetPosition[0], targetPosition[1]), self.size, self.map
-            ):
-                target.isAlive = False
-                if target.isMobile:
-                    nMobileCaptures += 1
-                else:
-                    nTargetCaptures += 1
+        rows = self._capture_candidates()
+        elements = self._elements
+        positions = np.array(
+            [elements[row].position for row in rows.tolist()], dtype=np.intp
+        )
+        neighbours = (
+            positions.reshape(-1, 1, 2) + NEIGHBOURHOODS[self.capture_neighbourhood]
+        )
+        inside = ((neighbours >= 0) & (neighbours < self.size)).all(axis=2)
+        neighbours = np.clip(neighbours, 0, self.size - 1)
+        cells = self.map[neighbours[..., 0], neighbours[..., 1]]
+        n_agent_neighbour = np.count_nonzero(
+            inside & (cells <= MapElement.agent), axis=1
+        )
+        captured = rows[n_agent_neighbour >= self.capture_min_agents]
+        for row in captured.tolist():
+            elements[row].isAlive = False
 
-        return nTargetCaptures, nMobileCaptures
+        nMobileCaptures = int(
+            np.count_nonzero(self._element_kinds[captured] == MapElement.mobile)
+        )
+        return len(captured) - nMobileCaptures, nMobileCaptures
 
     def _move_mobiles(self):
-        for mobile in self.mobiles:
-            if mobile.isAlive:
-                # select a random action
-                action = Actions(np.random.randint(len(Actions)))
-                self._update_mobile(action, mobile, False)
+        movers = [mobile for mobile in self.mobiles if mobile.isAlive]
+        # select a random action for every live mobile in one draw
+        actions = self.rng.integers(len(Actions), size=len(movers))
+        if self.move_mode == "simultaneous":
+            self._move_simultaneously(movers, actions)
+            return
+        for mobile, action in zip(movers, actions.tolist()):
+            self._update_mobile(Actions(action), mobile, False)
+
+    def _move_simultaneously(self, elements: List[BaseElem], actions: np.ndarray):
+        # elements and actions in id order
+        if not elements:
+            return
+        sources = np.array([elem.position for elem in elements])
+        kinds = np.array([elem.mapElement for elem in elements])
+        moved, destinations = simultaneous_moves(self.map, sources, kinds, actions)
+        self.map[sources[moved, 0], sources[moved, 1]] = MapElement.empty
+        self.map[destinations[:, 0], destinations[:, 1]] = kinds[moved]
+        self.entity_id[sources[moved, 0], sources[moved, 1]] = 0
+        self.entity_id[destinations[:, 0], destinations[:, 1]] = [
+            elements[i].id for i in moved.tolist()
+        ]
+        for i, position in zip(moved.tolist(), destinations.tolist()):
+            elements[i].position = tuple(position)
+            self._reached.append(tuple(position))
 
     def update(self, joint_action_grid: Actions):
         """Update map, agents and targets state
@@ -605,6 +1334,100 @@ class WorldBase:
         joint_action : TypeAction
             Square grid of action
         """
+        self._apply(
+            self.run_phase("gather_actions", self._gather_actions, joint_action_grid)
+        )
+
+    def update_agents(self, actions: np.ndarray):
+        """Update map, agents and targets state from one action per agent
+
+        Parameters
+        ----------
+        actions : np.ndarray
+            Array of shape (nb_agents,), action of each agent ordered by id
+            ("agent_1", ..., "agent_n").
+        """
+        self._apply(self.run_phase("gather_actions", self._agent_actions, actions))
+
+    def _apply(self, joint_action: TypeAction):
+        run_phase = self.run_phase
+        if self.record_events:
+            before = self._entity_columns()
+        self.capturedTargets, self.capturedMobiles = run_phase(
+            "captures", self._do_captures
+        )
+        run_phase("move_agents", self._move_agents, joint_action)
+        run_phase("move_mobiles", self._move_mobiles)
+
+        if self.incremental_map:
+            run_phase("fill_map", self._clear_captured)
+        else:
+            run_phase("fill_map", self._fill_map)
+        run_phase(
+            "position_state",
+            self._update_position_state,
+            incremental=self.incremental_map,
+        )
+        if self.record_events:
+            self.events = run_phase("events", self._diff_events, before)
+
+    def run_phase(self, phase: str, function: Callable, *args, **kwargs) -> Any:
+        """
+        Call `function`, timing it under the name `phase` when profiling is on.
+        When it is off the only cost is this call.
+
+        Parameters
+        ----------
+        phase : str
+            Name of the phase in `profile_stats`.
+        function : Callable
+            Function of the phase, called with the other arguments.
+
+        Returns
+        -------
+        Any
+            What `function` returns.
+        """
+        if self._phase_stats is None:
+            return function(*args, **kwargs)
+        start = perf_counter()
+        result = function(*args, **kwargs)
+        stats = self._phase_stats.setdefault(phase, [0.0, 0])
+        stats[0] += perf_counter() - start
+        stats[1] += 1
+        return result
+
+    def profile_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Cumulative time of each phase since the profiling was enabled or reset.
+
+        Returns
+        -------
+        Dict[str, Dict[str, float]]
+            For each phase (gather_actions, captures, move_agents,
+            move_mobiles, fill_map, position_state, events, fog, reset):
+            total_s, the total time in seconds, calls, the number of calls, and
+            mean_ms, the mean time of a call in milliseconds. Empty if
+            profiling is off.
+        """
+        return {
+            phase: {
+                "total_s": total,
+                "calls": calls,
+                "mean_ms": 1e3 * total / calls,
+            }
+            for phase, (total, calls) in (self._phase_stats or {}).items()
+        }
+
+    def set_profiling(self, enabled: bool = True):
+        """Turn the phase timers on (starting from zero) or off."""
+        self._phase_stats = {} if enabled else None
+
+    def _agent_actions(self, actions: np.ndarray) -> TypeAction:
+        # agents are stored by increasing id
+        return dict(zip(self.agents, np.asarray(actions).tolist()))
+
+    def _gather_actions(self, joint_action_grid: np.ndarray) -> TypeAction:
         # we want to have Dict of actions for each agent : {"agent_1" : 0, "agent_2" : 3, ..., "agent_n": 1} from the joint action grid
         # iter on each agent, gets the agent position, read the action on the grid and create the dict of actions
         joint_action = {}
@@ -612,11 +1435,14 @@ class WorldBase:
             agent_position = agent.position
             action = joint_action_grid[agent_position[0], agent_position[1]]
             joint_action[agent_name] = action
+        return joint_action
 
-        self.capturedTargets, self.capturedMobiles = self._do_captures()
+    def _move_agents(self, joint_action: TypeAction):
+        if self.move_mode == "simultaneous":
+            self._move_simultaneously(
+                [self.agents[agent_id] for agent_id in joint_action],
+                np.array(list(joint_action.values()), dtype=np.intp),
+            )
+            return
         for agent_id, action in joint_action.items():
             self._update_agent(action=action, agent_id=agent_id)
-        self._move_mobiles()
-
-        self._fill_map()
-        self._update_position_state()
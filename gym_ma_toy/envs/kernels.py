@@ -0,0 +1,110 @@
+"""
+Loop kernels of the team catcher rules on the entity arrays of `ArrayWorld`.
+
+They are compiled with Numba when it is installed (`HAS_NUMBA`), otherwise
+they are plain Python functions with the same results. They only use scalar
+loops over NumPy arrays so that Numba compiles them in nopython mode.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+except ImportError:  # pragma: no cover - depends on the environment
+    HAS_NUMBA = False
+
+    def njit(**kwargs):
+        # no-op stand-in of @njit(...)
+        return lambda function: function
+
+
+# MapElement values, kept as plain ints for the compiled code
+AGENT = -1
+AGENT_DIAG = -3
+EMPTY = 0
+
+
+@njit(cache=True)
+def move_entities(
+    world_map: np.ndarray,
+    positions: np.ndarray,
+    kinds: np.ndarray,
+    idx: np.ndarray,
+    actions: np.ndarray,
+    deltas: np.ndarray,
+    allowed: np.ndarray,
+):
+    """Move the entities of rows `idx` one after the other.
+
+    A move is applied if the action is allowed for the entity kind, the
+    destination is inside the map and it is empty when the entity plays.
+    `world_map` and `positions` are updated in place.
+    """
+    size_x, size_y = world_map.shape
+    for i in range(idx.shape[0]):
+        k = idx[i]
+        action = actions[i]
+        if not allowed[kinds[k] - AGENT_DIAG, action]:
+            continue
+        x, y = positions[k, 0], positions[k, 1]
+        nx, ny = x + deltas[action, 0], y + deltas[action, 1]
+        if nx < 0 or nx >= size_x or ny < 0 or ny >= size_y:
+            continue
+        if world_map[nx, ny] != EMPTY:
+            continue
+        world_map[x, y] = EMPTY
+        world_map[nx, ny] = kinds[k]
+        positions[k, 0] = nx
+        positions[k, 1] = ny
+
+
+@njit(cache=True)
+def do_captures(
+    world_map: np.ndarray,
+    positions: np.ndarray,
+    on_map: np.ndarray,
+    alive: np.ndarray,
+    mobility: np.ndarray,
+    first_target: int,
+    offsets: np.ndarray,
+    min_agents: int,
+):
+    """Mark as dead the targets (rows from `first_target`) on the map with at
+    least `min_agents` agents at the given offsets, and return the number of
+    (targets, mobiles) captured."""
+    size_x, size_y = world_map.shape
+    nb_targets, nb_mobiles = 0, 0
+    for k in range(first_target, positions.shape[0]):
+        if not on_map[k]:
+            continue
+        count = 0
+        for j in range(offsets.shape[0]):
+            nx = positions[k, 0] + offsets[j, 0]
+            ny = positions[k, 1] + offsets[j, 1]
+            if 0 <= nx < size_x and 0 <= ny < size_y and world_map[nx, ny] <= AGENT:
+                count += 1
+        if count >= min_agents:
+            alive[k] = False
+            if mobility[k]:
+                nb_mobiles += 1
+            else:
+                nb_targets += 1
+    return nb_targets, nb_mobiles
+
+
+@njit(cache=True)
+def fill_map(
+    world_map: np.ndarray,
+    positions: np.ndarray,
+    kinds: np.ndarray,
+    alive: np.ndarray,
+    on_map: np.ndarray,
+):
+    """Paint the live entities on an emptied map and record them in `on_map`."""
+    world_map[:, :] = EMPTY
+    for k in range(positions.shape[0]):
+        on_map[k] = alive[k]
+        if alive[k]:
+            world_map[positions[k, 0], positions[k, 1]] = kinds[k]
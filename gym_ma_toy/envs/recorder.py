@@ -0,0 +1,184 @@
+import os
+import queue
+import threading
+import warnings
+from typing import Callable, Dict, List, Optional
+
+import gymnasium as gym
+import numpy as np
+from PIL import Image
+
+from .game_base import MapElement
+from .render_utils import palette
+
+RECORD_FORMATS = ("gif", "npz")
+
+
+def encode_gif(path: str, frames: np.ndarray, fig_size: int, fps: float):
+    """Write (nb_frames, height, width) int8 map frames as a palette GIF."""
+    codes = (frames - MapElement.agent_diag).astype(np.uint8)
+    codes = codes.repeat(fig_size, axis=1).repeat(fig_size, axis=2)
+    flat_palette = palette().ravel().tolist()
+    images = []
+    for code in codes:
+        image = Image.frombytes("P", code.shape[::-1], code.tobytes())
+        image.putpalette(flat_palette)
+        images.append(image)
+    images[0].save(
+        path,
+        save_all=True,
+        append_images=images[1:],
+        duration=int(1000 / fps),
+        loop=0,
+        optimize=False,
+    )
+
+
+class EpisodeRecorder(gym.Wrapper):
+    """
+    Record the episodes of a team catcher env without slowing it down.
+
+    At each reset and step the wrapper only keeps a copy of the map (and of
+    the partial map under the fog of war) as int8 map values, not RGB. The
+    frames are sent in chunks of at most `chunk_size` frames to a background
+    thread through a queue of at most `queue_size` chunks, and the thread
+    encodes them:
+
+        gif: palette GIF, the partial map above the map like `render`, one
+            file per chunk.
+        npz: compressed archive of the int8 `map` (and `partial_map`) frames,
+            one file per chunk.
+
+    The memory used is bounded by `chunk_size * (queue_size + 2)` frames. When
+    the queue is full the chunk is dropped rather than stalling the env; the
+    number of dropped chunks is in `dropped_chunks`.
+
+    Parameters:
+        env (gym.Env): Team catcher env (dense observations or not).
+        folder (str): Folder of the recordings, created if needed.
+        format (str): `"gif"` or `"npz"`. Defaults to `"gif"`.
+        name_prefix (str): Start of the file names, followed by the episode
+            and chunk numbers. Defaults to `"team_catcher"`.
+        episode_trigger (Callable[[int], bool]): Episodes to record, all by
+            default.
+        fig_size (int): Pixels per cell of the GIFs. Defaults to `4`.
+        fps (float): Frames per second of the GIFs. Defaults to `10`.
+        chunk_size (int): Frames per file. Defaults to `500`.
+        queue_size (int): Chunks waiting for the encoder. Defaults to `8`.
+    """
+
+    def __init__(
+        self,
+        env: gym.Env,
+        folder: str,
+        format: str = "gif",
+        name_prefix: str = "team_catcher",
+        episode_trigger: Optional[Callable[[int], bool]] = None,
+        fig_size: int = 4,
+        fps: float = 10,
+        chunk_size: int = 500,
+        queue_size: int = 8,
+    ):
+        super().__init__(env)
+        if format not in RECORD_FORMATS:
+            raise ValueError(
+                f"format should be one of {list(RECORD_FORMATS)}, got {format!r}"
+            )
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.format = format
+        self.name_prefix = name_prefix
+        self.episode_trigger = episode_trigger
+        self.fig_size = fig_size
+        self.fps = fps
+        self.chunk_size = chunk_size
+        self.partially_observable = env.unwrapped.partially_observable
+
+        self.episode_id = -1
+        self.recording = False
+        self.dropped_chunks = 0
+        self._chunk_id = 0
+        self._frames: List[np.ndarray] = []
+        self._partial_frames: List[np.ndarray] = []
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(
+            target=self._encode_loop, name="EpisodeRecorder", daemon=True
+        )
+        self._thread.start()
+
+    def reset(self, **kwargs):
+        self._flush()
+        obs, info = self.env.reset(**kwargs)
+        self.episode_id += 1
+        self._chunk_id = 0
+        self.recording = self.episode_trigger is None or self.episode_trigger(
+            self.episode_id
+        )
+        self._capture(obs)
+        return obs, info
+
+    def step(self, action):
+        obs, reward, terminated, truncated, info = self.env.step(action)
+        self._capture(obs)
+        if terminated or truncated:
+            self._flush()
+        return obs, reward, terminated, truncated, info
+
+    def close(self):
+        self._flush()
+        self._queue.put(None)
+        self._thread.join()
+        super().close()
+
+    def _capture(self, obs):
+        if not self.recording:
+            return
+        state = obs
+        if self.env.unwrapped.obs_mode != "dense":
+            state = self.env.unwrapped.world.get_state
+        self._frames.append(state["map"].astype(np.int8))
+        if self.partially_observable:
+            self._partial_frames.append(state["partial_map"].astype(np.int8))
+        if len(self._frames) >= self.chunk_size:
+            self._flush()
+
+    def _flush(self):
+        # hand the pending frames over to the encoder thread
+        if not self._frames:
+            return
+        frames = {"map": np.stack(self._frames)}
+        if self.partially_observable:
+            frames["partial_map"] = np.stack(self._partial_frames)
+        self._frames, self._partial_frames = [], []
+        name = f"{self.name_prefix}-episode-{self.episode_id}-{self._chunk_id}"
+        self._chunk_id += 1
+        path = os.path.join(self.folder, f"{name}.{self.format}")
+        try:
+            self._queue.put_nowait((path, frames))
+        except queue.Full:
+            self.dropped_chunks += 1
+            warnings.warn(f"Recorder queue full, {path} is not written")
+
+    def _encode_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            path, frames = item
+            try:
+                self._encode(path, frames)
+            except Exception as error:
+                # a failed file must not stop the recording of the next ones
+                warnings.warn(f"Recorder could not write {path}: {error!r}")
+
+    def _encode(self, path: str, frames: Dict[str, np.ndarray]):
+        if self.format == "npz":
+            np.savez_compressed(path, **frames)
+        else:
+            world_frames = frames["map"]
+            if self.partially_observable:
+                # partial map above the map, as rendered
+                world_frames = np.concatenate(
+                    (frames["partial_map"], world_frames), axis=1
+                )
+            encode_gif(path, world_frames, self.fig_size, self.fps)
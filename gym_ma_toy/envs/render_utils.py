@@ -38,3 +38,51 @@ def render_observable(grid_size, obs, fig_size):
     image = image.resize((grid_size * fig_size, grid_size * fig_size), Image.NEAREST)
     image = np.array(image, dtype=np.uint8)
     return image
+
+
+def palette() -> np.ndarray:
+    """Colour lookup table of the map values: row `value - MapElement.agent_diag`
+    is the RGB colour of `value`, from `MapElement.agent_diag` to
+    `AuxElement.fog`."""
+    lut = np.zeros((AuxElement.fog - MapElement.agent_diag + 1, 3), dtype=np.uint8)
+    for element, color in zip(MapElement, ElementsColors):
+        lut[element - MapElement.agent_diag] = color.value
+    lut[AuxElement.fog - MapElement.agent_diag] = AuxElementColors.fog.value
+    return lut
+
+
+class PaletteRenderer:
+    """
+    Renderer of rgb_array frames without PIL.
+
+    The map is turned into colours with one lookup in the palette, its columns
+    are repeated `fig_size` times, then each row of pixels is broadcast
+    `fig_size` times into an output buffer allocated once. The frames are the
+    ones of `render_observable` and `render_partially_observable` (the partial
+    map above the map); the returned array is the buffer, overwritten by the
+    next frame.
+    """
+
+    def __init__(self, grid_size: int, fig_size: int, partially_observable: bool):
+        self.grid_size = grid_size
+        self.fig_size = fig_size
+        self.partially_observable = partially_observable
+        self.lut = palette()
+        nb_panels = 2 if partially_observable else 1
+        side = grid_size * fig_size
+        self.buffer = np.zeros((nb_panels * side, side, 3), dtype=np.uint8)
+        # rows of cells of each panel: (grid_size, fig_size, bytes of a pixel row)
+        self._panels = [
+            panel.reshape(grid_size, fig_size, side * 3)
+            for panel in np.split(self.buffer, nb_panels)
+        ]
+
+    def __call__(self, obs) -> np.ndarray:
+        maps = [obs["map"]]
+        if self.partially_observable:
+            maps = [obs["partial_map"], obs["map"]]
+        for panel, world_map in zip(self._panels, maps):
+            colours = self.lut[world_map.astype(np.intp) - MapElement.agent_diag]
+            pixel_rows = np.repeat(colours, self.fig_size, axis=1)
+            panel[...] = pixel_rows.reshape(self.grid_size, 1, -1)
+        return self.buffer
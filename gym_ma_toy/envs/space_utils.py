@@ -1,31 +1,170 @@
+from typing import Tuple
+
 from gymnasium import spaces
 import numpy as np
 
+from .game_base import Actions, PACKED_PLANES
+
+ACTION_MODES = ("grid", "agents")
+OBS_MODES = ("dense", "entities", "local", "delta", "packed")
+
+DEFAULT_DTYPES = (np.float64, np.int32)
+# every map value fits in [-3, 3] and masks are 0 or 1
+COMPACT_DTYPES = (np.int8, np.uint8)
+
+
+def observation_dtypes(compact: bool) -> Tuple[type, type]:
+    """dtypes (map, mask) of the observations, compact or not."""
+    return COMPACT_DTYPES if compact else DEFAULT_DTYPES
+
+
+def check_game_arguments(
+    grid_size: int, nb_agents: int, nb_targets: int, nb_mobiles: int, action_mode: str
+):
+    """Raise a ValueError when the action mode is unknown or when the entities
+    do not fit in the grid. Shared by the single and vector envs."""
+    if action_mode not in ACTION_MODES:
+        raise ValueError(
+            f"action_mode should be one of {list(ACTION_MODES)}, "
+            f"got {action_mode!r}"
+        )
+    if (grid_size - 1) ** 2 < nb_agents + nb_targets + nb_mobiles:
+        population = nb_agents + nb_targets + nb_mobiles
+        maximum_population = (grid_size - 1) ** 2
+        raise ValueError(
+            f" nb_agents + nb_targets + nb_mobiles ({population}) should "
+            f"be less than (grid_size - 1) ** 2 ({maximum_population})"
+        )
+
 
 def create_observation_space(
-    grid_size: int, nb_agents: int, partially_observable: bool
+    grid_size: int,
+    nb_agents: int,
+    partially_observable: bool,
+    map_dtype: type = np.float64,
+    mask_dtype: type = np.int32,
 ):
     if partially_observable:
         return spaces.Dict(
             {
                 "map": spaces.Box(
-                    low=-3, high=3, shape=(grid_size, grid_size), dtype=np.float64
+                    low=-3, high=3, shape=(grid_size, grid_size), dtype=map_dtype
                 ),
                 "partial_map": spaces.Box(
-                    low=-3, high=3, shape=(grid_size, grid_size), dtype=np.float64
+                    low=-3, high=3, shape=(grid_size, grid_size), dtype=map_dtype
                 ),
                 "position_mask": spaces.Box(
-                    low=0, high=1, shape=(grid_size, grid_size), dtype=np.int32
+                    low=0, high=1, shape=(grid_size, grid_size), dtype=mask_dtype
                 ),
             }
         )
     return spaces.Dict(
         {
             "map": spaces.Box(
-                low=-3, high=3, shape=(grid_size, grid_size), dtype=np.float64
+                low=-3, high=3, shape=(grid_size, grid_size), dtype=map_dtype
             ),
             "position_mask": spaces.Box(
-                low=0, high=1, shape=(grid_size, grid_size), dtype=np.int32
+                low=0, high=1, shape=(grid_size, grid_size), dtype=mask_dtype
             ),
         }
     )
+
+
+def create_entity_observation_space(
+    grid_size: int, nb_entities: int, partially_observable: bool
+):
+    """Observation space of the "entities" observation mode.
+
+    Each entity (agents, then targets, then mobiles) has a position and a kind
+    (its MapElement value, 0 once captured). Under the fog of war the cells
+    seen by the agents are listed too, their number varies from step to step.
+    """
+    entity_spaces = {
+        "positions": spaces.Box(
+            low=0, high=grid_size - 1, shape=(nb_entities, 2), dtype=np.int32
+        ),
+        "kinds": spaces.Box(low=-3, high=2, shape=(nb_entities,), dtype=np.int8),
+    }
+    if partially_observable:
+        entity_spaces["visible_cells"] = spaces.Sequence(
+            spaces.Box(low=0, high=grid_size - 1, shape=(2,), dtype=np.int32),
+            stack=True,
+        )
+    return spaces.Dict(entity_spaces)
+
+
+def create_local_observation_space(
+    nb_agents: int, patch_size: int, map_dtype: type = np.float64
+):
+    """Observation space of the "local" observation mode, one
+    (patch_size, patch_size) window of the map per agent."""
+    return spaces.Dict(
+        {
+            "local_map": spaces.Box(
+                low=-3,
+                high=3,
+                shape=(nb_agents, patch_size, patch_size),
+                dtype=map_dtype,
+            )
+        }
+    )
+
+
+def create_delta_observation_space(grid_size: int):
+    """Observation space of the "delta" observation mode.
+
+    The cells of the map that changed since the previous observation and their
+    new values. A keyframe lists every cell that is not empty (not fog under
+    the fog of war) instead, the others being reset to that value.
+    """
+    return spaces.Dict(
+        {
+            "keyframe": spaces.Discrete(2),
+            "cells": spaces.Sequence(
+                spaces.Box(low=0, high=grid_size - 1, shape=(2,), dtype=np.int32),
+                stack=True,
+            ),
+            "values": spaces.Sequence(
+                spaces.Box(low=-3, high=3, shape=(), dtype=np.int8), stack=True
+            ),
+        }
+    )
+
+
+def create_packed_observation_space(grid_size: int, partially_observable: bool):
+    """Observation space of the "packed" observation mode.
+
+    The binary planes of the agent_hv, agent_diag, target and mobile cells
+    (then of the fog under the fog of war), bit-packed along the columns.
+    """
+    nb_planes = len(PACKED_PLANES) + partially_observable
+    return spaces.Dict(
+        {
+            "planes": spaces.Box(
+                low=0,
+                high=255,
+                shape=(nb_planes, grid_size, -(-grid_size // 8)),
+                dtype=np.uint8,
+            )
+        }
+    )
+
+
+def create_action_space(
+    grid_size: int, nb_agents: int, has_diag: bool, action_mode: str = "grid"
+):
+    """Action space of the game.
+
+    In "grid" mode the action of each agent is read on a (grid_size, grid_size)
+    grid at the position of the agent. In "agents" mode the action is an array
+    of shape (nb_agents,) ordered by agent id, and sampling it only draws
+    nb_agents integers.
+    """
+    high_action = len(Actions) - 5  # 0: NOOP, 1: UP, 2: DOWN, 3: LEFT, 4: RIGHT
+    if has_diag:
+        high_action = len(Actions) - 1
+    if action_mode == "agents":
+        return spaces.MultiDiscrete(np.full(nb_agents, high_action + 1), dtype=np.int32)
+    return spaces.Box(
+        low=0, high=high_action, shape=(grid_size, grid_size), dtype=np.int32
+    )
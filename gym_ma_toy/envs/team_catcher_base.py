@@ -1,14 +1,40 @@
 from typing import Tuple, Dict, Union, Any, Optional
 import numpy as np
 import gymnasium as gym
-from gymnasium import spaces
+from gymnasium.utils import seeding
 
-from .render_utils import render_observable, render_partially_observable
-from .space_utils import create_observation_space
+from .render_utils import PaletteRenderer
+from .space_utils import (
+    OBS_MODES,
+    check_game_arguments,
+    create_action_space,
+    create_delta_observation_space,
+    create_entity_observation_space,
+    create_local_observation_space,
+    create_observation_space,
+    create_packed_observation_space,
+    observation_dtypes,
+)
 from .game_base import WorldBase, Actions
+from .array_world import ArrayWorld
+from .compiled_world import CompiledWorld
+from .tiled_world import TiledWorld
+from .trajectory import TrajectoryWriter
 
 TypeObservation = Dict[str, Union[np.ndarray, Dict[str, int]]]
 NB_ACTIONS = len(Actions)
+WORLD_ENGINES = {
+    "object": WorldBase,
+    "array": ArrayWorld,
+    "compiled": CompiledWorld,
+    "tiled": TiledWorld,
+}
+
+
+def read_only_view(array: np.ndarray) -> np.ndarray:
+    view = array.view()
+    view.flags.writeable = False
+    return view
 
 
 class TeamCatcherBase(gym.Env):
@@ -37,7 +63,82 @@ class TeamCatcherBase(gym.Env):
         grid_size (int): The classifier to bag. Defaults to `64`.
         nb_agents (int): The number of agents. Defaults to `256`.
         nb_targets (int): The number of target to catch. Defaults to `128`.
-        seed (int): Random number generator seed for reproducibility. Defaults to `None`.
+        seed (int): Random number generator seed for reproducibility. Every random
+            draw of the game comes from the `np_random` generator of the env,
+            which is shared with its world and reseeded by `reset(seed=...)`.
+            Defaults to `None`.
+        capture_min_agents (int): Number of agents around a target needed to
+            capture it. Defaults to `2`.
+        capture_neighbourhood (int): Cells around a target where agents count
+            for its capture, `4` (horizontal/vertical) or `8` (diagonal too).
+            Defaults to `4`.
+        compact_obs (bool): Emit int8 maps and uint8 position masks instead of
+            float64 maps and int32 masks. The engine keeps its map in that dtype
+            so that no conversion happens per step. Defaults to `False`.
+        action_mode (str): `"grid"`, the action is a (grid_size, grid_size) grid
+            read at the position of each agent, or `"agents"`, the action is a
+            `MultiDiscrete` array of shape (nb_agents,) ordered by agent id.
+            Defaults to `"grid"`.
+        obs_mode (str): `"dense"`, the observation is made of (grid_size,
+            grid_size) planes, or `"entities"`, the observation is built from
+            the entities without reading the map: `positions` (nb_entities, 2)
+            and `kinds` (nb_entities,) of the agents, targets and mobiles in
+            id order (kind 0 once captured), plus the `visible_cells`
+            (nb_visible, 2) under the fog of war. Meant for big grids and for
+            policies consuming entity lists. `"local"` returns the
+            `local_map` (nb_agents, local_size, local_size) window of the map
+            centred on each agent, cut from the partial map under the fog of
+            war, cells out of the map reading as fog. `"delta"` returns only
+            the `cells` (n, 2) of the map (of the partial map under the fog of
+            war) that changed since the previous observation and their new
+            `values` (n,), with a `keyframe` flag set at reset and every
+            `keyframe_interval` steps, when every cell that is not empty (not
+            fog) is listed instead; see `apply_delta` to rebuild the map.
+            `"packed"` returns the binary `planes` (nb_planes, grid_size,
+            ceil(grid_size / 8)) uint8 of the agent_hv, agent_diag, target
+            and mobile cells of the map (of the partial map under the fog of
+            war, then with a fog plane), bit-packed along the columns and
+            built from the entities; see `unpack_planes`. Defaults to
+            `"dense"`.
+        local_size (int): Odd side of the windows of the `"local"` observation
+            mode. Defaults to `5`.
+        keyframe_interval (int): Steps between two keyframes of the `"delta"`
+            observation mode. Defaults to `100`.
+        record_events (bool): Add to the info of each step the `events` of the
+            update, the entities that moved or were captured (EVENT_DTYPE
+            records: id, kind, from and to cells, captured flag). Defaults to
+            `False`.
+        move_mode (str): `"sequential"`, the agents then the mobiles move one
+            after the other in id order, or `"simultaneous"`, the moves of the
+            agents then of the mobiles are resolved at once on the map before
+            them: a move into an occupied cell fails, even if its occupant
+            leaves, and the lowest id wins when several entities head to the
+            same cell. Much faster with many agents. Defaults to
+            `"sequential"`.
+        engine (str): Storage of the game entities, `"object"` (one Python object
+            per entity), `"array"` (contiguous NumPy columns, faster on big
+            worlds) or `"compiled"` (the array storage stepped by loop kernels
+            compiled with Numba when it is installed, the `"array"` engine
+            otherwise) or `"tiled"` (the array storage with a map made of
+            tiles allocated only where there are entities, for very large
+            sparse maps, see `TiledWorld`; the dense observations are then
+            built on demand). Defaults to `"object"`.
+        incremental_map (bool): Update the map and the position mask in place,
+            touching only the cells that changed, so that the step cost grows
+            with the number of entities rather than with the grid area. The
+            observation arrays are then overwritten by the next step. Defaults
+            to `False`.
+        reuse_obs_buffers (bool): Zero-allocation step mode. The observation
+            arrays are allocated once, filled in place by the engine (this
+            implies `incremental_map`) and returned as read-only views, the
+            same objects at every step, as is the frame returned by `render`.
+            Defaults to `False`.
+        profile (bool): Time each phase of the steps and resets (captures,
+            moves, map fill, position mask, fog...), see `profile_stats`.
+            Defaults to `False`.
+        copy_obs (bool): Return a copy of the observation, for callers that
+            keep references to it across steps while `reuse_obs_buffers` or
+            `incremental_map` is set. Defaults to `False`.
 
     Example:
 
@@ -51,9 +152,9 @@ class TeamCatcherBase(gym.Env):
         >>> done = False
         >>> truncated = False
         >>> obs, info = env.reset()
-        >>> while not done or not truncated:
+        >>> while not (done or truncated):  # doctest: +SKIP
         ...    env.render()
-        ...    obs, reward, truncated, done, info = env.step(env.action_space.sample())
+        ...    obs, reward, done, truncated, info = env.step(env.action_space.sample())
         >>> env.close()
 
     """
@@ -70,31 +171,78 @@ class TeamCatcherBase(gym.Env):
         fow_agents_hv: int = 0,
         fow_agents_diag: int = 0,
         seed: Optional[int] = None,
+        capture_min_agents: int = 2,
+        capture_neighbourhood: int = 4,
+        compact_obs: bool = False,
+        action_mode: str = "grid",
+        obs_mode: str = "dense",
+        local_size: int = 5,
+        keyframe_interval: int = 100,
+        record_events: bool = False,
+        move_mode: str = "sequential",
+        engine: str = "object",
+        incremental_map: bool = False,
+        reuse_obs_buffers: bool = False,
+        copy_obs: bool = False,
+        profile: bool = False,
     ):
-        nb_agents = nb_agents_hv + nb_agents_diag
-        if (grid_size - 1) ** 2 < nb_agents + nb_targets:
-            population = nb_agents + nb_targets + nb_mobiles
-            maximum_population = (grid_size - 1) ** 2
+        if engine not in WORLD_ENGINES:
+            raise ValueError(
+                f"engine should be one of {list(WORLD_ENGINES)}, got {engine!r}"
+            )
+        if obs_mode not in OBS_MODES:
+            raise ValueError(
+                f"obs_mode should be one of {list(OBS_MODES)}, got {obs_mode!r}"
+            )
+        if obs_mode == "local" and (local_size < 1 or local_size % 2 == 0):
+            raise ValueError(f"local_size should be odd and positive, got {local_size}")
+        if engine == "tiled" and reuse_obs_buffers:
+            raise ValueError("reuse_obs_buffers needs a dense map, not engine 'tiled'")
+        if obs_mode == "delta" and keyframe_interval < 1:
             raise ValueError(
-                f" nb_agents + nb_targets + nb_mobiles ({population}) should "
-                f"be less than (grid_size - 1) ** 2 ({maximum_population})"
+                f"keyframe_interval should be positive, got {keyframe_interval}"
             )
+        nb_agents = nb_agents_hv + nb_agents_diag
+        check_game_arguments(grid_size, nb_agents, nb_targets, nb_mobiles, action_mode)
         self.grid_size = grid_size
         self.partially_observable = (fow_agents_hv + fow_agents_diag) > 0
+        map_dtype, mask_dtype = observation_dtypes(compact_obs)
 
-        high_action = NB_ACTIONS - 5  # 0: NOOP, 1: UP, 2: DOWN, 3: LEFT, 4: RIGHT
-        if nb_agents_diag > 0:
-            high_action = NB_ACTIONS - 1
-        self.action_space = spaces.Box(
-            low=0, high=high_action, shape=(grid_size, grid_size), dtype=np.int32
-        )
-        self.observation_space = create_observation_space(
+        self.action_mode = action_mode
+        self.action_space = create_action_space(
             grid_size=grid_size,
             nb_agents=nb_agents,
-            partially_observable=self.partially_observable,
+            has_diag=nb_agents_diag > 0,
+            action_mode=action_mode,
         )
+        self.obs_mode = obs_mode
+        self.local_size = local_size
+        if obs_mode == "entities":
+            self.observation_space = create_entity_observation_space(
+                grid_size=grid_size,
+                nb_entities=nb_agents + nb_targets + nb_mobiles,
+                partially_observable=self.partially_observable,
+            )
+        elif obs_mode == "local":
+            self.observation_space = create_local_observation_space(
+                nb_agents=nb_agents, patch_size=local_size, map_dtype=map_dtype
+            )
+        elif obs_mode == "delta":
+            self.observation_space = create_delta_observation_space(grid_size)
+        elif obs_mode == "packed":
+            self.observation_space = create_packed_observation_space(
+                grid_size=grid_size, partially_observable=self.partially_observable
+            )
+        else:
+            self.observation_space = create_observation_space(
+                grid_size=grid_size,
+                nb_agents=nb_agents,
+                partially_observable=self.partially_observable,
+                map_dtype=map_dtype,
+                mask_dtype=mask_dtype,
+            )
 
-        self.world = WorldBase(
+        self.world = WORLD_ENGINES[engine](
             size=grid_size,
             nb_agents_hv=nb_agents_hv,
             nb_agents_diag=nb_agents_diag,
@@ -103,23 +251,53 @@ class TeamCatcherBase(gym.Env):
             fow_agents_hv=fow_agents_hv,
             fow_agents_diag=fow_agents_diag,
             seed=seed,
+            capture_min_agents=capture_min_agents,
+            capture_neighbourhood=capture_neighbourhood,
+            map_dtype=map_dtype,
+            mask_dtype=mask_dtype,
+            incremental_map=incremental_map or reuse_obs_buffers,
+            profile=profile,
+            # the delta observations are read from the events without fog
+            record_events=record_events or obs_mode == "delta",
+            move_mode=move_mode,
         )
+        self.record_events = record_events
+        self.keyframe_interval = keyframe_interval
+        # observations since the last keyframe, and the partial map they show
+        self._since_keyframe = keyframe_interval
+        self._delta_map: np.ndarray = None
+        self.reuse_obs_buffers = reuse_obs_buffers
+        self.copy_obs = copy_obs
+        self._obs_views: TypeObservation = None
+        if reuse_obs_buffers and obs_mode == "dense":
+            buffers = dict(self.world.state)
+            if self.partially_observable:
+                buffers["partial_map"] = self.world.partial_map
+            self._obs_views = {
+                key: read_only_view(buffers[key]) for key in self.observation_space
+            }
 
         self.nb_targets_alive = self.world.nb_targets_alive
 
         self.obs: TypeObservation = None  # For render
         self.viewer = None  #  For render
+        self._renderer: PaletteRenderer = None  # For render
         self.grid_size = grid_size  # For render
 
         self.nb_step: int = None
+        self.trajectory_writer: TrajectoryWriter = None
         self.seed(seed)
 
     def step(
         self, action: Actions
     ) -> Tuple[TypeObservation, float, bool, Dict[str, Any]]:
-        self.world.update(action)  # apply action to the engine
+        # apply action to the engine
+        if self.action_mode == "agents":
+            self.world.update_agents(action)
+        else:
+            self.world.update(action)
 
-        self.obs = self.world.get_state
+        self.obs = self._observation()
 
         reward = self.compute_reward(
             capturedTargets=self.world.capturedTargets,
@@ -130,30 +308,137 @@ class TeamCatcherBase(gym.Env):
         done = self.episode_end(current_nb_targets_alive=self.nb_targets_alive)
         self.nb_step += 1
         info = {"step": self.nb_step, "target alive": self.nb_targets_alive}
+        if self.record_events:
+            info["events"] = self.world.events
 
+        if self.trajectory_writer is not None:
+            self.trajectory_writer.add_step(self._dense_obs(), action, reward, done)
         return self.obs, reward, done, False, info
 
     def reset(self, seed=None, options=None) -> TypeObservation:
-        self.world.reset()
-        self.obs = self.world.get_state
+        super().reset(seed=seed)
+        self.world.rng = self.np_random
+        self.world.run_phase("reset", self.world.reset)
+        self._since_keyframe = self.keyframe_interval
+        self.obs = self._observation()
         self.nb_step = 0
         self.nb_targets_alive = self.world.nb_targets_alive
+        if self.trajectory_writer is not None:
+            self.trajectory_writer.add_reset(self._dense_obs())
         return self.obs, {"step": self.nb_step, "target alive": self.nb_targets_alive}
 
-    def render(self, close=False, fig_size=8):
+    def set_trajectory_writer(self, writer: Optional[TrajectoryWriter]):
+        """Record every following reset and step with `writer`, see
+        `TrajectoryWriter`, or stop recording if `writer` is None."""
+        self.trajectory_writer = writer
+
+    def profile_stats(self) -> Dict[str, Dict[str, float]]:
+        """Cumulative time and number of calls of each phase of the game, see
+        `WorldBase.profile_stats`. Empty unless the env was built with
+        `profile=True` or `world.set_profiling()` was called."""
+        return self.world.profile_stats()
+
+    def get_state_snapshot(self) -> dict:
+        """Record of the game, of the step counter and of the last observation,
+        see `WorldBase.get_state_snapshot`. Much cheaper than a deepcopy of the
+        env to branch it in a planner."""
+        snapshot = self.world.get_state_snapshot()
+        snapshot["nb_step"] = self.nb_step
+        snapshot["obs"] = {key: value.copy() for key, value in self.obs.items()}
+        return snapshot
+
+    def restore_state_snapshot(self, snapshot: dict) -> TypeObservation:
+        """Put the env back in the state of `snapshot` and return the
+        observation of that state."""
+        self.world.restore_state_snapshot(snapshot)
+        self.nb_step = snapshot["nb_step"]
+        self.nb_targets_alive = self.world.nb_targets_alive
+        if self.obs_mode == "delta":
+            # the recorded changes do not apply to the map of the caller
+            self._since_keyframe = self.keyframe_interval
+            self.obs = self._observation()
+        elif self.reuse_obs_buffers:
+            # the buffers behind the views are refilled from the world
+            self.obs = self._observation()
+        else:
+            # the recorded observation is reused rather than recomputed
+            self.obs = {key: value.copy() for key, value in snapshot["obs"].items()}
+        return self.obs
+
+    def _observation(self) -> TypeObservation:
+        if self.obs_mode == "entities":
+            # fresh entity-sized arrays, the fog planes are never built
+            return self.world.get_entity_state()
+        if self.obs_mode == "local":
+            return self.world.get_local_state(self.local_size)
+        if self.obs_mode == "delta":
+            return self._delta_observation()
+        if self.obs_mode == "packed":
+            # 1 bit per cell and plane, the map is not read
+            return self.world.get_packed_state()
+        state = self.world.get_state
+        if self.reuse_obs_buffers:
+            # the engine has filled the buffers behind the views in place
+            state = self._obs_views
+        if self.copy_obs:
+            return {key: value.copy() for key, value in state.items()}
+        return state
+
+    def _delta_observation(self) -> TypeObservation:
+        keyframe = self._since_keyframe >= self.keyframe_interval
+        self._since_keyframe = 1 if keyframe else self._since_keyframe + 1
         if self.partially_observable:
-            image = render_partially_observable(
-                grid_size=self.grid_size,
-                obs=self.obs,
-                fig_size=fig_size,
-            )
+            observed = self.world.get_state["partial_map"]
         else:
-            image = render_observable(
+            observed = self.world.map
+        if keyframe:
+            # the cells that are not empty (not fog) are listed from the
+            # entities, the map is never scanned
+            state = self.world.get_entity_state()
+            if self.partially_observable:
+                cells = state["visible_cells"].astype(np.int64)
+            else:
+                cells = state["positions"][state["kinds"] != 0].astype(np.int64)
+            flat = np.unique(cells[:, 0] * self.grid_size + cells[:, 1])
+        elif self.partially_observable:
+            # the fog moves with the agents, the planes are compared
+            flat = np.flatnonzero(observed != self._delta_map)
+        else:
+            # only the cells left and reached by the entities can change
+            events = self.world.events
+            cells = np.concatenate((events["from"], events["to"]))
+            flat = np.unique(cells[:, 0] * self.grid_size + cells[:, 1])
+        if self.partially_observable:
+            if self._delta_map is None:
+                self._delta_map = observed.copy()
+            else:
+                np.copyto(self._delta_map, observed)
+        cells = np.stack(np.divmod(flat, self.grid_size), axis=1).astype(np.int32)
+        return {
+            "keyframe": np.int64(keyframe),
+            "cells": cells,
+            "values": observed[cells[:, 0], cells[:, 1]].astype(np.int8),
+        }
+
+    def _dense_obs(self) -> TypeObservation:
+        # the map planes, also in the modes whose observation has none (the
+        # packed planes lack the position mask and the hidden map)
+        return self.obs if self.obs_mode == "dense" else self.world.get_state
+
+    def render(self, close=False, fig_size=8):
+        obs = self._dense_obs()
+        renderer = self._renderer
+        if renderer is None or renderer.fig_size != fig_size:
+            renderer = self._renderer = PaletteRenderer(
                 grid_size=self.grid_size,
-                obs=self.obs,
                 fig_size=fig_size,
+                partially_observable=self.partially_observable,
             )
-        return image
+        image = renderer(obs)
+        if self.reuse_obs_buffers:
+            # zero-allocation mode, the frame is overwritten by the next render
+            return image
+        return image.copy()
 
     def close(self):
         if self.viewer:
@@ -161,7 +446,8 @@ class TeamCatcherBase(gym.Env):
             self.viewer = None
 
     def seed(self, seed: int = None):
-        np.random.seed(seed)
+        self._np_random, self._np_random_seed = seeding.np_random(seed)
+        self.world.rng = self._np_random
         return
 
     @classmethod
@@ -0,0 +1,305 @@
+import numpy as np
+
+from typing import List, Tuple
+
+from .array_world import ArrayWorld
+from .game_base import AuxElement, MapElement
+
+
+class TiledMap:
+    """
+    Two-dimensional array stored as square tiles, where only the tiles holding
+    a cell different from `fill_value` are allocated.
+
+    The tiles live in one pool array of shape (nb_slots, tile_size, tile_size)
+    and a small table gives the slot of each tile of the map (-1 when it is
+    not allocated), so reads and writes of many cells are single gathers and
+    scatters whose cost does not depend on the map area. A tile whose cells
+    all go back to `fill_value` returns to the pool, at once for the writes of
+    arrays, at the next `release_empty` for the writes of single cells (an
+    entity moving inside its tile empties it for a moment).
+
+    The indexing is the one the worlds use: `tiled[x, y]` with two integers,
+    or with two integer arrays of the same shape (the cells of one write being
+    distinct). `np.asarray(tiled)` and `to_dense` build the dense array.
+
+    Parameters:
+        shape (Tuple[int, int]): Shape of the map.
+        dtype (type): dtype of the cells.
+        tile_size (int): Side of the tiles, a power of two. Defaults to `32`.
+        fill_value (int): Value of the cells never written. Defaults to `0`.
+    """
+
+    ndim = 2
+
+    def __init__(
+        self,
+        shape: Tuple[int, int],
+        dtype: type,
+        tile_size: int = 32,
+        fill_value: int = 0,
+    ):
+        if tile_size < 1 or tile_size & (tile_size - 1):
+            raise ValueError(f"tile_size should be a power of two, got {tile_size}")
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.fill_value = self.dtype.type(fill_value)
+        self.tile_size = tile_size
+        self._shift = tile_size.bit_length() - 1
+        self._mask = tile_size - 1
+        self._table = np.full(
+            (-(-self.shape[0] // tile_size), -(-self.shape[1] // tile_size)),
+            -1,
+            dtype=np.intp,
+        )
+        # pool of tiles, number of cells other than fill_value in each tile,
+        # flat table index of each tile and slots not in use
+        self._tiles = np.full((0, tile_size, tile_size), self.fill_value, self.dtype)
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._keys = np.zeros(0, dtype=np.intp)
+        self._free: List[int] = []
+        self._maybe_empty: List[int] = []
+
+    @property
+    def size(self) -> int:
+        return self.shape[0] * self.shape[1]
+
+    @property
+    def nb_tiles(self) -> int:
+        """Number of allocated tiles."""
+        return len(self._tiles) - len(self._free)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory of the tile pool and of the tables."""
+        return (
+            self._tiles.nbytes
+            + self._table.nbytes
+            + self._counts.nbytes
+            + self._keys.nbytes
+        )
+
+    def __getitem__(self, index):
+        x, y = index
+        if isinstance(x, int) and isinstance(y, int):
+            slot = self._table[x >> self._shift, y >> self._shift]
+            if slot < 0:
+                return self.fill_value
+            return self._tiles[slot, x & self._mask, y & self._mask]
+        x, y = np.broadcast_arrays(np.asarray(x, np.intp), np.asarray(y, np.intp))
+        slots = self._table[x >> self._shift, y >> self._shift]
+        if not len(self._tiles):
+            return np.full(x.shape, self.fill_value, self.dtype)
+        values = self._tiles[np.maximum(slots, 0), x & self._mask, y & self._mask]
+        return np.where(slots >= 0, values, self.fill_value)
+
+    def __setitem__(self, index, values):
+        x, y = index
+        if isinstance(x, int) and isinstance(y, int):
+            self._set_cell(x, y, values)
+            return
+        x, y = np.broadcast_arrays(np.asarray(x, np.intp), np.asarray(y, np.intp))
+        values = np.broadcast_to(np.asarray(values, self.dtype), x.shape).ravel()
+        x, y = x.ravel(), y.ravel()
+        tx, ty = x >> self._shift, y >> self._shift
+        slots = self._table[tx, ty]
+        missing = slots < 0
+        if missing.any():
+            # tiles are only allocated to write values other than fill_value
+            needed = missing & (values != self.fill_value)
+            keys = np.unique(tx[needed] * self._table.shape[1] + ty[needed])
+            if len(keys):
+                self._table.flat[keys] = self._allocate(keys)
+            slots = self._table[tx, ty]
+            kept = slots >= 0
+            x, y, values, slots = x[kept], y[kept], values[kept], slots[kept]
+        lx, ly = x & self._mask, y & self._mask
+        old = self._tiles[slots, lx, ly]
+        self._tiles[slots, lx, ly] = values
+        change = (values != self.fill_value).astype(np.int64) - (old != self.fill_value)
+        np.add.at(self._counts, slots, change)
+        emptied = np.unique(slots[change < 0])
+        self._release(emptied[self._counts[emptied] == 0])
+
+    def _set_cell(self, x: int, y: int, value):
+        tx, ty = x >> self._shift, y >> self._shift
+        slot = int(self._table[tx, ty])
+        is_fill = value == self.fill_value
+        if slot < 0:
+            if is_fill:
+                return
+            key = tx * self._table.shape[1] + ty
+            slot = int(self._allocate(np.array([key]))[0])
+            self._table[tx, ty] = slot
+        tile = self._tiles[slot]
+        lx, ly = x & self._mask, y & self._mask
+        was_fill = tile[lx, ly] == self.fill_value
+        tile[lx, ly] = value
+        self._counts[slot] += int(was_fill) - int(is_fill)
+        if self._counts[slot] == 0:
+            self._maybe_empty.append(slot)
+
+    def release_empty(self):
+        """Return to the pool the tiles emptied by writes of single cells."""
+        if self._maybe_empty:
+            slots = np.unique(np.array(self._maybe_empty, dtype=np.intp))
+            self._maybe_empty = []
+            slots = slots[self._counts[slots] == 0]
+            # a slot may already be back in the pool after an array write
+            slots = slots[self._table.flat[self._keys[slots]] == slots]
+            self._release(slots)
+
+    def _allocate(self, keys: np.ndarray) -> np.ndarray:
+        # slots of new tiles for the flat table indices `keys`
+        nb_new = len(keys) - len(self._free)
+        if nb_new > 0:
+            # the pool grows by doubling, the copies are amortized
+            capacity = len(self._tiles)
+            grow = max(nb_new, capacity)
+            self._tiles = np.concatenate(
+                (
+                    self._tiles,
+                    np.full(
+                        (grow, self.tile_size, self.tile_size),
+                        self.fill_value,
+                        self.dtype,
+                    ),
+                )
+            )
+            self._counts = np.concatenate((self._counts, np.zeros(grow, np.int64)))
+            self._keys = np.concatenate((self._keys, np.zeros(grow, np.intp)))
+            self._free.extend(range(capacity + grow - 1, capacity - 1, -1))
+        slots = np.array([self._free.pop() for _ in range(len(keys))], dtype=np.intp)
+        self._keys[slots] = keys
+        return slots
+
+    def _release(self, slots: np.ndarray):
+        # the tiles of `slots` only hold fill_value again
+        self._table.flat[self._keys[slots]] = -1
+        self._free.extend(slots.tolist())
+
+    def fill(self, value):
+        """Set every cell to `fill_value`, the only value accepted."""
+        if value != self.fill_value:
+            raise ValueError(
+                f"A TiledMap can only be filled with its fill value {self.fill_value}"
+            )
+        self._table.fill(-1)
+        self._tiles.fill(self.fill_value)
+        self._counts.fill(0)
+        self._free = list(range(len(self._tiles) - 1, -1, -1))
+        self._maybe_empty = []
+
+    def copy(self) -> "TiledMap":
+        tiled = TiledMap(self.shape, self.dtype, self.tile_size, self.fill_value)
+        tiled._table = self._table.copy()
+        tiled._tiles = self._tiles.copy()
+        tiled._counts = self._counts.copy()
+        tiled._keys = self._keys.copy()
+        tiled._free = list(self._free)
+        tiled._maybe_empty = list(self._maybe_empty)
+        return tiled
+
+    def to_dense(self) -> np.ndarray:
+        """Dense array of the map, its cost grows with the area."""
+        nb_x, nb_y = self._table.shape
+        size = self.tile_size
+        dense = np.full((nb_x, size, nb_y, size), self.fill_value, self.dtype)
+        tx, ty = np.nonzero(self._table >= 0)
+        dense[tx, :, ty, :] = self._tiles[self._table[tx, ty]]
+        dense = dense.reshape(nb_x * size, nb_y * size)
+        return dense[: self.shape[0], : self.shape[1]]
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self.to_dense()
+        return dense if dtype is None else dense.astype(dtype)
+
+
+class TiledWorld(ArrayWorld):
+    """
+    `ArrayWorld` whose map and position mask are `TiledMap`, for very large
+    and sparse maps: the memory grows with the number of tiles holding an
+    entity and a step touches only the cells of the entities, whatever the
+    area. The map is always updated in place (`incremental_map`).
+
+    `state` and `get_state` build dense arrays on demand, with a cost that
+    grows with the area. On big maps, use the `"entities"` or `"local"`
+    observation modes of the env, which read the tiles directly, with the
+    `"agents"` action mode (the `"grid"` action is a dense array).
+
+    Parameters
+    ----------
+    tile_size : int
+        Side of the tiles, a power of two. Defaults to `32`.
+    The other parameters are the ones of `WorldBase`.
+    """
+
+    def __init__(self, *args, tile_size: int = 32, **kwargs):
+        self.tile_size = tile_size
+        kwargs["incremental_map"] = True
+        super().__init__(*args, **kwargs)
+
+    def _init_planes(self):
+        shape = (self.size, self.size)
+        self.map = TiledMap(shape, self.map_dtype, self.tile_size, MapElement.empty)
+        self.position_mask = TiledMap(shape, self.mask_dtype, self.tile_size, 0)
+
+    def get_state_snapshot(self) -> dict:
+        # the record is made of flat arrays, whatever the engine
+        snapshot = super().get_state_snapshot()
+        snapshot["map"] = self.map.to_dense()
+        return snapshot
+
+    def _restore_map(self, world_map: np.ndarray):
+        # the tiles are built from the cells that are not empty, so a record
+        # of any engine can be restored
+        world_map = np.asarray(world_map)
+        x, y = np.nonzero(world_map != MapElement.empty)
+        self.map.fill(MapElement.empty)
+        self.map[x, y] = world_map[x, y]
+
+    def _apply(self, joint_action: np.ndarray):
+        super()._apply(joint_action)
+        self.map.release_empty()
+
+    @property
+    def state(self) -> dict:
+        return {
+            "map": self.map.to_dense(),
+            "position_mask": self.position_mask.to_dense(),
+        }
+
+    @property
+    def get_state(self) -> dict:
+        state = self.state
+        if self.partially_observable:
+            state["partial_map"] = self.run_phase(
+                "fog", self._partial_map, state["map"]
+            )
+        return state
+
+    def _partial_map(self, dense_map: np.ndarray) -> np.ndarray:
+        partial_map = np.full_like(dense_map, AuxElement.fog)
+        cells = self._visible_cells()
+        partial_map[cells[:, 0], cells[:, 1]] = dense_map[cells[:, 0], cells[:, 1]]
+        return partial_map
+
+    def get_local_state(self, patch_size: int) -> dict:
+        # the windows are gathered from the tiles, the visible cells being
+        # looked up in the sorted list of `visible_cells`
+        offsets = np.arange(patch_size) - patch_size // 2
+        centres = self._agent_positions().astype(np.intp)
+        x, y = np.broadcast_arrays(
+            centres[:, 0, np.newaxis, np.newaxis] + offsets[:, np.newaxis],
+            centres[:, 1, np.newaxis, np.newaxis] + offsets,
+        )
+        seen = (x >= 0) & (x < self.size) & (y >= 0) & (y < self.size)
+        values = self.map[np.clip(x, 0, self.size - 1), np.clip(y, 0, self.size - 1)]
+        if self.partially_observable:
+            visible = self._visible_cells().astype(np.intp)
+            visible = visible[:, 0] * self.size + visible[:, 1]
+            flat = x * self.size + y
+            found = np.minimum(np.searchsorted(visible, flat), len(visible) - 1)
+            seen &= visible[found] == flat
+        fog = self.map.dtype.type(AuxElement.fog)
+        return {"local_map": np.where(seen, values, fog)}
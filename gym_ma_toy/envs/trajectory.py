@@ -0,0 +1,221 @@
+"""
+Offline datasets of team catcher games stored as memory-mapped arrays.
+
+A trajectory folder holds one preallocated `.npy` file per recorded array
+(`map`, `position_mask`, `partial_map` under the fog of war, `action`,
+`reward`, `done`) with `capacity` rows, plus a small `header.json` giving the
+grid size, the dtypes and shapes of the arrays, the number of rows written and
+the first row of each episode. Row `t` holds the observation of a step with
+the action, reward and done that led to it; the first row of an episode holds
+the observation of the reset, a zero action and reward and `done` False.
+
+Nothing is pickled: the writer copies each step into the mapped files and the
+reader returns views on them.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+HEADER_FILE = "header.json"
+OBS_KEYS = ("map", "position_mask", "partial_map")
+
+
+class TrajectoryWriter:
+    """
+    Append the games of a team catcher env to memory-mapped files.
+
+    The writer is hooked in the `reset` and `step` of the env with
+    `env.set_trajectory_writer(writer)` and records the dense observation
+    (rebuilt from the world when the env has another `obs_mode`). The header
+    is written by `flush` and `close`.
+
+    Parameters:
+        folder (str): Folder of the trajectory files, created if needed.
+        env (TeamCatcherBase): Env giving the grid size, dtypes and shapes.
+        capacity (int): Number of rows (resets and steps) preallocated.
+            Defaults to `100_000`.
+
+    Example:
+
+        >>> import tempfile
+        >>> from gym_ma_toy.envs import (
+        ...     TeamCatcherBase, TrajectoryReader, TrajectoryWriter
+        ... )
+
+        >>> env = TeamCatcherBase(
+        ...     grid_size=8, nb_agents_hv=4, nb_agents_diag=0, nb_targets=4,
+        ...     nb_mobiles=0,
+        ... )
+        >>> folder = tempfile.mkdtemp()
+        >>> env.set_trajectory_writer(TrajectoryWriter(folder, env, capacity=100))
+        >>> obs, info = env.reset(seed=0)
+        >>> for _ in range(5):
+        ...     obs, reward, done, truncated, info = env.step(env.action_space.sample())
+        >>> env.trajectory_writer.close()
+        >>> reader = TrajectoryReader(folder)
+        >>> len(reader), reader.nb_episodes
+        (6, 1)
+        >>> reader.episode(0)["map"].shape
+        (6, 8, 8)
+
+    """
+
+    def __init__(self, folder: str, env, capacity: int = 100_000):
+        env = env.unwrapped
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.capacity = capacity
+        self.grid_size = env.grid_size
+        self.length = 0
+        self.episode_starts: List[int] = []
+
+        grid = (env.grid_size, env.grid_size)
+        map_dtype, mask_dtype = env.world.map.dtype, env.world.position_mask.dtype
+        layout = {
+            "map": (grid, map_dtype),
+            "position_mask": (grid, mask_dtype),
+            "action": (env.action_space.shape, env.action_space.dtype),
+            "reward": ((), np.float64),
+            "done": ((), np.bool_),
+        }
+        if env.partially_observable:
+            layout["partial_map"] = (grid, map_dtype)
+        self.arrays: Dict[str, np.memmap] = {
+            key: open_memmap(
+                os.path.join(folder, f"{key}.npy"),
+                mode="w+",
+                dtype=dtype,
+                shape=(capacity,) + tuple(shape),
+            )
+            for key, (shape, dtype) in layout.items()
+        }
+        self._write_header()
+
+    def add_reset(self, obs: Dict[str, np.ndarray]):
+        """Start an episode with the observation of a reset."""
+        self.episode_starts.append(self.length)
+        self._add(obs, action=0, reward=0.0, done=False)
+
+    def add_step(
+        self, obs: Dict[str, np.ndarray], action: np.ndarray, reward: float, done: bool
+    ):
+        """Append a step of the current episode."""
+        if not self.episode_starts:
+            raise RuntimeError("add_reset should be called before add_step")
+        self._add(obs, action, reward, done)
+
+    def flush(self):
+        """Write the header and the mapped arrays to the disk."""
+        for array in self.arrays.values():
+            array.flush()
+        self._write_header()
+
+    def close(self):
+        self.flush()
+        for key in list(self.arrays):
+            del self.arrays[key]
+
+    def _add(self, obs, action, reward, done):
+        row = self.length
+        if row >= self.capacity:
+            raise RuntimeError(
+                f"The trajectory files are full ({self.capacity} rows), "
+                "use a bigger capacity"
+            )
+        arrays = self.arrays
+        for key in OBS_KEYS:
+            if key in arrays:
+                arrays[key][row] = obs[key]
+        np.copyto(arrays["action"][row], action, casting="unsafe")
+        arrays["reward"][row] = reward
+        arrays["done"][row] = done
+        self.length += 1
+
+    def _write_header(self):
+        header = {
+            "grid_size": self.grid_size,
+            "capacity": self.capacity,
+            "length": self.length,
+            "episode_starts": self.episode_starts,
+            "arrays": {
+                key: {"dtype": array.dtype.str, "shape": list(array.shape[1:])}
+                for key, array in self.arrays.items()
+            },
+        }
+        path = os.path.join(self.folder, HEADER_FILE)
+        with open(path + ".tmp", "w") as file:
+            json.dump(header, file)
+        # the header of a crashed run stays readable
+        os.replace(path + ".tmp", path)
+
+
+class TrajectoryReader:
+    """
+    Read the trajectories written by `TrajectoryWriter`.
+
+    The arrays are opened read-only with `mmap_mode`, episodes are returned as
+    views on the files (nothing is loaded until it is read) and `sample`
+    gathers random transitions for minibatches.
+
+    Parameters:
+        folder (str): Folder of the trajectory files.
+    """
+
+    def __init__(self, folder: str):
+        with open(os.path.join(folder, HEADER_FILE)) as file:
+            self.header: Dict[str, Any] = json.load(file)
+        self.grid_size: int = self.header["grid_size"]
+        self.length: int = self.header["length"]
+        self.episode_starts = np.array(self.header["episode_starts"], dtype=np.int64)
+        self.episode_ends = np.append(self.episode_starts[1:], self.length)
+        self.arrays: Dict[str, np.ndarray] = {
+            key: np.load(os.path.join(folder, f"{key}.npy"), mmap_mode="r")[
+                : self.length
+            ]
+            for key in self.header["arrays"]
+        }
+        # rows whose next row is a step of the same episode
+        starts = np.zeros(self.length + 1, dtype=bool)
+        starts[self.episode_starts] = True
+        starts[self.length] = True
+        self._transitions = np.flatnonzero(~starts[1:])
+
+    def __len__(self) -> int:
+        return self.length
+
+    @property
+    def nb_episodes(self) -> int:
+        return len(self.episode_starts)
+
+    def episode(self, index: int) -> Dict[str, np.ndarray]:
+        """Rows of an episode, its reset first, as zero-copy views."""
+        start, end = self.episode_starts[index], self.episode_ends[index]
+        return {key: array[start:end] for key, array in self.arrays.items()}
+
+    def sample(
+        self, batch_size: int, rng: Optional[np.random.Generator] = None
+    ) -> Dict[str, np.ndarray]:
+        """Random transitions of all the episodes.
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            The observation arrays (`map`, `position_mask`, ...) before the
+            transition, the same with a `next_` prefix after it, and the
+            `action`, `reward` and `done` of the transition, each with a first
+            dimension of `batch_size`.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        rows = np.sort(rng.choice(self._transitions, size=batch_size))
+        batch = {}
+        for key in OBS_KEYS:
+            if key in self.arrays:
+                batch[key] = self.arrays[key][rows]
+                batch[f"next_{key}"] = self.arrays[key][rows + 1]
+        for key in ("action", "reward", "done"):
+            batch[key] = self.arrays[key][rows + 1]
+        return batch
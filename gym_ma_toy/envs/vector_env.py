@@ -0,0 +1,162 @@
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from gymnasium.vector import VectorEnv, AutoresetMode
+from gymnasium.vector.utils import batch_space
+
+from .batched_world import BatchedWorld
+from .game_base import spawn_rngs
+from .space_utils import (
+    check_game_arguments,
+    create_action_space,
+    create_observation_space,
+    observation_dtypes,
+)
+from .team_catcher_base import TeamCatcherBase, TypeObservation
+
+
+class TeamCatcherVectorEnv(VectorEnv):
+    """
+    Native vector environment running `num_envs` team catcher games in one
+    `BatchedWorld`.
+
+    It is equivalent to a `SyncVectorEnv` of `TeamCatcherBase` but steps every
+    game in one call. Observations are the dict of `TeamCatcherBase` with a
+    leading batch dimension. Games are reset automatically at the step that
+    follows their end (`AutoresetMode.NEXT_STEP`).
+
+    Parameters:
+        num_envs (int): Number of games.
+        action_mode (str): `"grid"` or `"agents"`, see `TeamCatcherBase`.
+            Defaults to `"grid"`.
+        compact_obs (bool): Emit int8 maps and uint8 position masks.
+            Defaults to `False`.
+        seed (int): Root seed of the games, each one draws from its own
+            generator spawned from the SeedSequence of the seed, also used by
+            `reset(seed=...)`. Defaults to `None`.
+        copy (bool): If True, `reset` and `step` return a copy of the
+            observations, otherwise views on the world arrays that are
+            overwritten by the next step. Defaults to `True`.
+        The other parameters are the ones of `TeamCatcherBase`.
+
+    Example:
+
+        >>> import gymnasium as gym
+        >>> import gym_ma_toy
+
+        >>> envs = gym.make_vec('team_catcher-v0', num_envs=4)
+        >>> obs, info = envs.reset(seed=0)
+        >>> obs["map"].shape
+        (4, 64, 64)
+        >>> obs, reward, terminated, truncated, info = envs.step(
+        ...     envs.action_space.sample()
+        ... )
+        >>> reward.shape
+        (4,)
+        >>> envs.close()
+
+    """
+
+    metadata = {"render_modes": [], "autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(
+        self,
+        num_envs: int = 8,
+        grid_size: int = 64,
+        nb_agents_hv: int = 128,
+        nb_agents_diag: int = 128,
+        nb_targets: int = 128,
+        nb_mobiles: int = 32,
+        fow_agents_hv: int = 0,
+        fow_agents_diag: int = 0,
+        seed: Optional[int] = None,
+        capture_min_agents: int = 2,
+        capture_neighbourhood: int = 4,
+        compact_obs: bool = False,
+        action_mode: str = "grid",
+        copy: bool = True,
+    ):
+        nb_agents = nb_agents_hv + nb_agents_diag
+        check_game_arguments(grid_size, nb_agents, nb_targets, nb_mobiles, action_mode)
+        self.num_envs = num_envs
+        self.grid_size = grid_size
+        self.copy = copy
+        self.partially_observable = (fow_agents_hv + fow_agents_diag) > 0
+        map_dtype, mask_dtype = observation_dtypes(compact_obs)
+
+        self.action_mode = action_mode
+        self.single_action_space = create_action_space(
+            grid_size=grid_size,
+            nb_agents=nb_agents,
+            has_diag=nb_agents_diag > 0,
+            action_mode=action_mode,
+        )
+        self.single_observation_space = create_observation_space(
+            grid_size=grid_size,
+            nb_agents=nb_agents,
+            partially_observable=self.partially_observable,
+            map_dtype=map_dtype,
+            mask_dtype=mask_dtype,
+        )
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+
+        self.world = BatchedWorld(
+            batch_size=num_envs,
+            size=grid_size,
+            nb_agents_hv=nb_agents_hv,
+            nb_agents_diag=nb_agents_diag,
+            nb_targets=nb_targets,
+            nb_mobiles=nb_mobiles,
+            fow_agents_hv=fow_agents_hv,
+            fow_agents_diag=fow_agents_diag,
+            seed=seed,
+            capture_min_agents=capture_min_agents,
+            capture_neighbourhood=capture_neighbourhood,
+            map_dtype=map_dtype,
+            mask_dtype=mask_dtype,
+        )
+        self.nb_step = np.zeros(num_envs, dtype=np.int64)
+
+    def reset(
+        self, *, seed: Optional[int] = None, options: Optional[Dict[str, Any]] = None
+    ) -> Tuple[TypeObservation, Dict[str, Any]]:
+        if seed is not None:
+            self.world.rngs = spawn_rngs(seed, self.num_envs)
+            self.action_space.seed(seed)
+        self.world.reset()
+        self.nb_step[:] = 0
+        return self._observation(), self._info()
+
+    def step(
+        self, actions: np.ndarray
+    ) -> Tuple[TypeObservation, np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        restart = self.world.needs_reset.copy()
+        if self.action_mode == "agents":
+            self.world.update_agents(actions)
+        else:
+            self.world.update(actions)
+
+        reward = TeamCatcherBase.compute_reward(
+            capturedTargets=self.world.capturedTargets,
+            capturedMobiles=self.world.capturedMobiles,
+        )
+        reward[restart] = 0.0
+        terminated = self.world.needs_reset.copy()
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        self.nb_step += 1
+        self.nb_step[restart] = 0
+
+        return self._observation(), reward, terminated, truncated, self._info()
+
+    def _observation(self) -> TypeObservation:
+        obs = self.world.state
+        if self.copy:
+            return {key: value.copy() for key, value in obs.items()}
+        return obs
+
+    def _info(self) -> Dict[str, Any]:
+        return {
+            "step": self.nb_step.copy(),
+            "target alive": self.world.nb_targets_alive,
+        }
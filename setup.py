@@ -4,7 +4,8 @@ setup(
     name="gym_ma_toy",
     version="0.0.1",
     packages=["gym_ma_toy"],
-    install_requires=["gymnasium>=1.0.0", "numpy", "matplotlib", "PILLOW", "aenum"],
+    install_requires=["gymnasium>=1.1.0", "numpy", "matplotlib", "PILLOW", "aenum"],
+    extras_require={"numba": ["numba"]},
     # And any other
     # dependencies required
 )
@@ -0,0 +1,71 @@
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pytest
+
+
+class Transition(NamedTuple):
+    obs: Dict[str, np.ndarray]
+    action: Any
+    reward: float
+    done: bool
+    info: Dict[str, Any]
+
+
+def play(
+    env, nb_steps: int = 50, seed: Optional[int] = 0, stop_on_done: bool = False
+) -> List[Transition]:
+    """Reset `env` with `seed` (without reseeding it if None) and step it with
+    `nb_steps` random actions drawn from RandomState(1).
+
+    Every observation is checked against the observation space and copied, the
+    observation of the reset first, with no action, a zero reward and done
+    False.
+    """
+    obs, info = env.reset(seed=seed)
+    actions = np.random.RandomState(1)
+    transitions = [Transition(copy_obs(env, obs), None, 0.0, False, info)]
+    for _ in range(nb_steps):
+        action = actions.randint(0, 9, size=env.action_space.shape)
+        obs, reward, done, _, info = env.step(action)
+        transitions.append(Transition(copy_obs(env, obs), action, reward, done, info))
+        if stop_on_done and np.any(done):
+            break
+    return transitions
+
+
+def copy_obs(env, obs: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    assert env.observation_space.contains(obs)
+    return {key: np.array(value) for key, value in obs.items()}
+
+
+@pytest.fixture
+def config() -> Dict[str, int]:
+    """Crowded game most tests play, fully observable."""
+    return dict(
+        grid_size=20,
+        nb_agents_hv=30,
+        nb_agents_diag=30,
+        nb_targets=40,
+        nb_mobiles=40,
+    )
+
+
+@pytest.fixture
+def fog_config(config) -> Dict[str, int]:
+    """The game of `config` under the fog of war."""
+    return dict(config, fow_agents_hv=2, fow_agents_diag=4)
+
+
+@pytest.fixture
+def rollout():
+    """`play` the envs of a test, which are closed when the test ends."""
+    envs = []
+
+    def rollout(env, **kwargs) -> List[Transition]:
+        envs.append(env)
+        return play(env, **kwargs)
+
+    yield rollout
+    for env in envs:
+        env.close()
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from gymnasium import spaces
+
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+from gym_ma_toy.envs.vector_env import TeamCatcherVectorEnv
+
+
+def grid_of(env, actions):
+    """Grid action equivalent to the per-agent actions."""
+    grid = np.zeros((env.grid_size, env.grid_size), dtype=np.int32)
+    for action, agent in zip(actions, env.world.agents.values()):
+        grid[agent.position] = action
+    return grid
+
+
+class TestActionModes:
+    def test_action_space(self, config):
+        env = TeamCatcherBase(**config, action_mode="agents")
+        assert isinstance(env.action_space, spaces.MultiDiscrete)
+        assert env.action_space.shape == (60,)
+        assert (env.action_space.nvec == 9).all()
+        env = TeamCatcherBase(**dict(config, nb_agents_diag=0), action_mode="agents")
+        assert (env.action_space.nvec == 5).all()
+        with pytest.raises(ValueError):
+            TeamCatcherBase(**config, action_mode="sparse")
+
+    @pytest.mark.parametrize("engine", ["object", "array"])
+    def test_same_game_as_grid_actions(self, config, engine):
+        agents_env = TeamCatcherBase(**config, engine=engine, action_mode="agents")
+        grid_env = TeamCatcherBase(**config, engine=engine)
+        agents_env.reset(seed=0)
+        grid_env.reset(seed=0)
+        agents_env.action_space.seed(0)
+        for _ in range(50):
+            actions = agents_env.action_space.sample()
+            grid = grid_of(grid_env, actions)
+            agents_obs, agents_reward, _, _, _ = agents_env.step(actions)
+            grid_obs, grid_reward, _, _, _ = grid_env.step(grid)
+            assert (agents_obs["map"] == grid_obs["map"]).all()
+            assert agents_reward == grid_reward
+
+    def test_vector_env(self, config):
+        envs = TeamCatcherVectorEnv(num_envs=3, **config, action_mode="agents")
+        assert envs.action_space.shape == (3, 60)
+        envs.reset(seed=0)
+        for _ in range(10):
+            obs, _, _, _, _ = envs.step(envs.action_space.sample())
+            assert (obs["position_mask"].sum(axis=(1, 2)) == 60).all()
@@ -0,0 +1,47 @@
+from gym_ma_toy.envs.array_world import ArrayWorld
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+
+CONFIGS = [
+    dict(grid_size=16, nb_agents_hv=16, nb_agents_diag=0, nb_targets=32, nb_mobiles=0),
+    dict(grid_size=64, nb_agents_hv=8, nb_agents_diag=8, nb_targets=16, nb_mobiles=16),
+]
+
+
+class TestArrayWorld:
+    def test_same_game_as_object_engine(self, fog_config, rollout):
+        for config in CONFIGS + [fog_config]:
+            object_env = TeamCatcherBase(**config, engine="object")
+            array_env = TeamCatcherBase(**config, engine="array")
+            objects = rollout(object_env, nb_steps=100, stop_on_done=True)
+            arrays = rollout(array_env, nb_steps=100, stop_on_done=True)
+            assert len(objects) == len(arrays)
+            for step, array_step in zip(objects, arrays):
+                assert step.reward == array_step.reward
+                assert (step.obs["map"] == array_step.obs["map"]).all()
+            assert object_env.nb_targets_alive == array_env.nb_targets_alive
+
+    def test_views(self):
+        world = ArrayWorld(
+            size=20,
+            nb_agents_hv=3,
+            nb_agents_diag=2,
+            nb_targets=4,
+            nb_mobiles=4,
+            fow_agents_hv=0,
+            fow_agents_diag=0,
+            seed=7,
+        )
+        world.reset()
+        assert list(world.agents) == [f"agent_{i}" for i in range(1, 6)]
+        assert [agent.hasDiag for agent in world.agents.values()] == [False] * 3 + [
+            True
+        ] * 2
+        for agent in world.agents.values():
+            assert world.map[agent.position] == (-3 if agent.hasDiag else -2)
+        for target in world.targets:
+            assert world.map[target.position] == 2
+            assert not target.isMobile
+        for mobile in world.mobiles:
+            assert world.map[mobile.position] == 1
+        assert len(world.targets) + len(world.mobiles) == world.nb_targets_alive
+        assert world.position_mask.sum() == 5
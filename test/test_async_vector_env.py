@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from gym_ma_toy.envs import TeamCatcherAsyncVectorEnv, TeamCatcherVectorEnv
+
+
+class TestAsyncVectorEnv:
+    def test_same_games_as_vector_env(self, fog_config):
+        async_envs = TeamCatcherAsyncVectorEnv(num_envs=3, **fog_config, engine="array")
+        envs = TeamCatcherVectorEnv(num_envs=3, **fog_config)
+        try:
+            assert async_envs.observation_space == envs.observation_space
+            obs, _ = async_envs.reset(seed=0)
+            expected, _ = envs.reset(seed=0)
+            actions = np.random.RandomState(1)
+            for _ in range(30):
+                for key in expected:
+                    assert (obs[key] == expected[key]).all()
+                action = actions.randint(0, 9, size=envs.action_space.shape)
+                obs, reward, terminated, _, info = async_envs.step(action)
+                expected, e_reward, e_terminated, _, e_info = envs.step(action)
+                assert (reward == e_reward).all()
+                assert (terminated == e_terminated).all()
+                assert (info["step"] == e_info["step"]).all()
+                assert (info["target alive"] == e_info["target alive"]).all()
+        finally:
+            async_envs.close()
+
+    def test_autoreset_and_views(self):
+        envs = TeamCatcherAsyncVectorEnv(
+            num_envs=4,
+            grid_size=6,
+            nb_agents_hv=8,
+            nb_agents_diag=4,
+            nb_targets=2,
+            nb_mobiles=1,
+            compact_obs=True,
+            action_mode="agents",
+            copy=False,
+        )
+        try:
+            obs, _ = envs.reset(seed=3)
+            assert obs["map"].dtype == np.int8
+            ended = np.zeros(4, dtype=bool)
+            for _ in range(100):
+                previous_ended = ended
+                step_obs, reward, ended, _, info = envs.step(envs.action_space.sample())
+                # views on the shared arrays
+                assert step_obs["map"].base is obs["map"].base
+                assert (reward[previous_ended] == 0).all()
+                assert (info["step"][previous_ended] == 0).all()
+                assert (obs["position_mask"].sum(axis=(1, 2)) == 12).all()
+        finally:
+            envs.close()
+
+    def test_variable_shape_obs(self, fog_config):
+        with pytest.raises(ValueError):
+            TeamCatcherAsyncVectorEnv(num_envs=2, **fog_config, obs_mode="entities")
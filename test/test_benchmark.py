@@ -0,0 +1,41 @@
+import json
+
+from gym_ma_toy.benchmark import (
+    benchmark_env,
+    compare_results,
+    main,
+    registered_ids,
+)
+
+MEASURES = {"reset_ms", "steps_per_sec", "step_ms", "render_ms", "peak_memory_mb"}
+
+
+class TestBenchmark:
+    def test_registered_ids(self):
+        ids = registered_ids()
+        assert len(ids) == 13
+        assert "team_catcher-v0" in ids and "team_catcher-hard-lvl2-v0" in ids
+
+    def test_benchmark_env(self):
+        measures = benchmark_env(
+            "team_catcher-v3", nb_steps=10, nb_resets=2, nb_renders=1, engine="array"
+        )
+        # team_catcher-v3 is under the fog of war
+        assert set(measures) == MEASURES | {"fog_ms"}
+        assert all(value > 0 for value in measures.values())
+
+    def test_compare_results(self):
+        baseline = {"results": {"a": {"steps_per_sec": 100.0, "step_ms": 10.0}}}
+        current = {"results": {"a": {"steps_per_sec": 70.0, "step_ms": 11.0}}}
+        assert compare_results(baseline, current, tolerance=0.2) == [
+            "a steps_per_sec: 100 -> 70"
+        ]
+        assert compare_results(baseline, current, tolerance=0.5) == []
+
+    def test_main_writes_json(self, tmp_path):
+        output = tmp_path / "results.json"
+        arguments = ["--ids", "team_catcher-v0", "--steps", "5", "--resets", "1"]
+        assert main(arguments + ["--renders", "1", "--output", str(output)]) == 0
+        report = json.loads(output.read_text())
+        assert set(report["results"]["team_catcher-v0"]) == MEASURES
+        assert "numpy" in report["meta"]
@@ -0,0 +1,67 @@
+import numpy as np
+
+from gym_ma_toy.envs.game_base import WorldBase, capture_plane, spawn_rngs
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+from gym_ma_toy.envs.vector_env import TeamCatcherVectorEnv
+
+
+def random_map(size, rng):
+    return rng.choice([-3, -2, 0, 0, 0, 0, 1, 2], size=(size, size)).astype(float)
+
+
+class TestCaptures:
+    def test_capture_plane(self):
+        rng = np.random.RandomState(0)
+        for size in [1, 2, 5, 17]:
+            world_map = random_map(size, rng)
+            for neighbourhood in [4, 8]:
+                for min_agents in [1, 2, 3]:
+                    plane = capture_plane(world_map, min_agents, neighbourhood)
+                    for x in range(size):
+                        for y in range(size):
+                            expected = world_map[x, y] > 0 and WorldBase.agent_capture(
+                                (x, y), size, world_map, min_agents, neighbourhood
+                            )
+                            assert plane[x, y] == expected
+
+    def test_batched_capture_plane(self):
+        rng = np.random.RandomState(1)
+        maps = np.stack([random_map(9, rng) for _ in range(4)])
+        planes = capture_plane(maps, 3, 8)
+        for world_map, plane in zip(maps, planes):
+            assert (capture_plane(world_map, 3, 8) == plane).all()
+
+    def test_engines_agree_on_custom_rule(self):
+        config = dict(
+            grid_size=12,
+            nb_agents_hv=20,
+            nb_agents_diag=20,
+            nb_targets=20,
+            nb_mobiles=20,
+            capture_min_agents=3,
+            capture_neighbourhood=8,
+        )
+        results = []
+        for env in [
+            TeamCatcherBase(**config, engine="object"),
+            TeamCatcherBase(**config, engine="array"),
+            TeamCatcherVectorEnv(num_envs=1, **config),
+        ]:
+            if isinstance(env, TeamCatcherVectorEnv):
+                env.reset(seed=0)
+            else:
+                env.np_random = spawn_rngs(0, 1)[0]
+                env.reset()
+            actions = np.random.RandomState(1)
+            rewards = []
+            for _ in range(50):
+                action = actions.randint(0, 9, size=(12, 12))
+                if isinstance(env, TeamCatcherVectorEnv):
+                    _, reward, _, _, _ = env.step(action[np.newaxis])
+                    reward = reward[0]
+                else:
+                    _, reward, _, _, _ = env.step(action)
+                rewards.append(reward)
+            results.append(rewards)
+        assert results[0] == results[1] == results[2]
+        assert max(results[0]) > 0
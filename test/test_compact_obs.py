@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+from gym_ma_toy.envs.vector_env import TeamCatcherVectorEnv
+
+
+class TestCompactObs:
+    @pytest.mark.parametrize("engine", ["object", "array"])
+    @pytest.mark.parametrize("incremental_map", [False, True])
+    def test_compact_dtypes(self, fog_config, rollout, engine, incremental_map):
+        kwargs = dict(engine=engine, incremental_map=incremental_map)
+        compact_env = TeamCatcherBase(**fog_config, **kwargs, compact_obs=True)
+        assert compact_env.world.map.dtype == np.int8
+        default_env = TeamCatcherBase(**fog_config, **kwargs)
+        compact = [step.obs for step in rollout(compact_env)]
+        default = [step.obs for step in rollout(default_env)]
+        for compact_obs, default_obs in zip(compact, default):
+            assert compact_obs["map"].dtype == np.int8
+            assert compact_obs["partial_map"].dtype == np.int8
+            assert compact_obs["position_mask"].dtype == np.uint8
+            for key in default_obs:
+                assert (compact_obs[key] == default_obs[key]).all()
+
+    def test_compact_vector_env(self, fog_config, rollout):
+        compact_envs = TeamCatcherVectorEnv(num_envs=2, **fog_config, compact_obs=True)
+        default_envs = TeamCatcherVectorEnv(num_envs=2, **fog_config)
+        compact = [step.obs for step in rollout(compact_envs)]
+        default = [step.obs for step in rollout(default_envs)]
+        for compact_obs, default_obs in zip(compact, default):
+            assert compact_obs["map"].dtype == np.int8
+            assert compact_obs["position_mask"].dtype == np.uint8
+            for key in default_obs:
+                assert (compact_obs[key] == default_obs[key]).all()
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from gym_ma_toy.envs.game_base import AuxElement, MapElement, apply_delta
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+
+
+class TestDeltaObs:
+    @pytest.mark.parametrize("engine", ["object", "array", "compiled"])
+    @pytest.mark.parametrize("fog", [0, 2])
+    def test_rebuilds_the_map(self, config, rollout, engine, fog):
+        config = dict(config, fow_agents_hv=fog, fow_agents_diag=fog)
+        env = TeamCatcherBase(
+            **config, engine=engine, obs_mode="delta", keyframe_interval=15
+        )
+        deltas = [step.obs for step in rollout(env, nb_steps=40)]
+        dense_env = TeamCatcherBase(**config, engine=engine)
+        dense = [step.obs for step in rollout(dense_env, nb_steps=40)]
+        key = "partial_map" if fog else "map"
+        base = AuxElement.fog if fog else MapElement.empty
+        world_map = np.zeros((20, 20), dtype=np.int8)
+        for step, (delta, dense_obs) in enumerate(zip(deltas, dense)):
+            assert delta["keyframe"] == (step % 15 == 0)
+            apply_delta(world_map, delta, base)
+            assert (world_map == dense_obs[key]).all()
+
+    def test_deltas_are_small(self, config, rollout):
+        env = TeamCatcherBase(**config, obs_mode="delta")
+        deltas = [step.obs for step in rollout(env, nb_steps=5)]
+        assert len(deltas[0]["cells"]) == 140
+        for delta in deltas[1:]:
+            # two cells at most per moved entity, one per capture
+            assert len(delta["cells"]) <= 2 * 140
+
+    def test_restore_sends_a_keyframe(self, config):
+        env = TeamCatcherBase(**config, obs_mode="delta")
+        env.reset(seed=0)
+        snapshot = env.get_state_snapshot()
+        env.step(env.action_space.sample())
+        obs = env.restore_state_snapshot(snapshot)
+        assert obs["keyframe"]
+        world_map = apply_delta(np.zeros((20, 20), dtype=np.int8), obs)
+        assert (world_map == env.world.map).all()
+
+
+class TestEvents:
+    @pytest.mark.parametrize("engine", ["object", "array"])
+    def test_events_replay_the_update(self, config, engine):
+        env = TeamCatcherBase(**config, engine=engine, record_events=True)
+        obs, _ = env.reset(seed=0)
+        previous = obs["map"].copy()
+        actions = np.random.RandomState(1)
+        for _ in range(30):
+            obs, reward, _, _, info = env.step(
+                actions.randint(0, 9, size=env.action_space.shape)
+            )
+            events = info["events"]
+            assert (np.diff(events["id"]) > 0).all()
+            previous[events["from"][:, 0], events["from"][:, 1]] = MapElement.empty
+            moved = events[~events["captured"]]
+            previous[moved["to"][:, 0], moved["to"][:, 1]] = moved["kind"]
+            assert (previous == obs["map"]).all()
+            captured = events[events["captured"]]
+            assert (captured["from"] == captured["to"]).all()
+            assert reward == pytest.approx(
+                -0.02 + np.sum(np.where(captured["kind"] == MapElement.mobile, 2, 1))
+            )
+
+    def test_same_events_on_both_engines(self, config, rollout):
+        objects = rollout(TeamCatcherBase(**config, record_events=True), nb_steps=40)
+        arrays = rollout(
+            TeamCatcherBase(**config, record_events=True, engine="array"), nb_steps=40
+        )
+        for object_step, array_step in zip(objects[1:], arrays[1:]):
+            assert (object_step.info["events"] == array_step.info["events"]).all()
+
+    def test_off_by_default(self, config):
+        env = TeamCatcherBase(**config)
+        env.reset(seed=0)
+        _, _, _, _, info = env.step(env.action_space.sample())
+        assert "events" not in info
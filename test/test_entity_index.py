@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+
+
+@pytest.fixture
+def crowded_config(config):
+    # most targets have agents around them
+    return dict(config, grid_size=16)
+
+
+def check_index(world):
+    assert ((world.entity_id != 0) == (world.map != 0)).all()
+    elements = list(world.agents.values()) + list(world.targets) + list(world.mobiles)
+    assert len(elements) == np.count_nonzero(world.entity_id)
+    for element in elements:
+        assert world.entity_id[element.position] == element.id
+    assert world.nb_targets_alive == len(world.targets) + len(world.mobiles)
+    assert [t.id for t in world.targets] == sorted(t.id for t in world.targets)
+    assert [m.id for m in world.mobiles] == sorted(m.id for m in world.mobiles)
+
+
+class TestEntityIndex:
+    @pytest.mark.parametrize("incremental_map", [False, True])
+    @pytest.mark.parametrize("move_mode", ["sequential", "simultaneous"])
+    def test_index_follows_the_map(self, crowded_config, incremental_map, move_mode):
+        env = TeamCatcherBase(
+            **crowded_config, incremental_map=incremental_map, move_mode=move_mode
+        )
+        env.reset(seed=0)
+        check_index(env.world)
+        for _ in range(40):
+            env.step(env.action_space.sample())
+            check_index(env.world)
+
+    @pytest.mark.parametrize("neighbourhood", [4, 8])
+    @pytest.mark.parametrize("min_agents", [1, 2, 3])
+    def test_same_captures_as_a_full_scan(
+        self, crowded_config, neighbourhood, min_agents
+    ):
+        config = dict(
+            crowded_config,
+            capture_neighbourhood=neighbourhood,
+            capture_min_agents=min_agents,
+        )
+        # the array engine checks every target at each update
+        envs = [TeamCatcherBase(**config), TeamCatcherBase(**config, engine="array")]
+        for env in envs:
+            env.reset(seed=3)
+        actions = np.random.RandomState(0)
+        for _ in range(60):
+            action = actions.randint(0, 9, size=envs[0].action_space.shape)
+            (_, object_reward, *_), (_, array_reward, *_) = (
+                env.step(action) for env in envs
+            )
+            assert object_reward == array_reward
+            assert envs[0].nb_targets_alive == envs[1].nb_targets_alive
+
+    def test_restore_rebuilds_the_index(self, crowded_config):
+        env = TeamCatcherBase(**crowded_config)
+        env.reset(seed=0)
+        snapshot = env.get_state_snapshot()
+        for _ in range(10):
+            env.step(env.action_space.sample())
+        env.restore_state_snapshot(snapshot)
+        check_index(env.world)
+        _, reward, _, _, _ = env.step(np.zeros(env.action_space.shape, np.int32))
+        env.restore_state_snapshot(snapshot)
+        _, replayed, _, _, _ = env.step(np.zeros(env.action_space.shape, np.int32))
+        assert reward == replayed
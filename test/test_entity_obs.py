@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from gym_ma_toy.envs.game_base import AuxElement
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+
+
+class TestEntityObs:
+    @pytest.mark.parametrize("engine", ["object", "array"])
+    def test_matches_dense_obs(self, fog_config, rollout, engine):
+        entity_env = TeamCatcherBase(**fog_config, engine=engine, obs_mode="entities")
+        dense_env = TeamCatcherBase(**fog_config, engine=engine)
+        entities = [step.obs for step in rollout(entity_env)]
+        dense = [step.obs for step in rollout(dense_env)]
+        for entity_obs, dense_obs in zip(entities, dense):
+            positions, kinds = entity_obs["positions"], entity_obs["kinds"]
+            on_map = kinds != 0
+            world_map = dense_obs["map"]
+            assert np.count_nonzero(world_map) == np.count_nonzero(on_map)
+            assert (
+                world_map[positions[on_map, 0], positions[on_map, 1]] == kinds[on_map]
+            ).all()
+            assert (positions[~on_map] == 0).all()
+            agents = positions[:60]
+            assert dense_obs["position_mask"][agents[:, 0], agents[:, 1]].all()
+            visible = np.argwhere(dense_obs["partial_map"] != AuxElement.fog)
+            assert (entity_obs["visible_cells"] == visible).all()
+
+    def test_engines_agree(self, fog_config, rollout):
+        object_env = TeamCatcherBase(**fog_config, engine="object", obs_mode="entities")
+        array_env = TeamCatcherBase(**fog_config, engine="array", obs_mode="entities")
+        for object_step, array_step in zip(rollout(object_env), rollout(array_env)):
+            for key in object_step.obs:
+                assert (object_step.obs[key] == array_step.obs[key]).all()
+
+    def test_fully_observable(self, config):
+        env = TeamCatcherBase(**config, obs_mode="entities")
+        obs, _ = env.reset()
+        assert set(obs) == {"positions", "kinds"}
+        with pytest.raises(ValueError):
+            TeamCatcherBase(**config, obs_mode="sparse")
@@ -0,0 +1,43 @@
+import numpy as np
+import gymnasium as gym
+import pytest
+
+import gym_ma_toy  # noqa: F401
+from gym_ma_toy.envs.game_base import AuxElement, MapElement
+
+PARTIALLY_OBSERVABLE_IDS = [
+    "team_catcher-v3",
+    "team_catcher-hard-lvl0-v0",
+    "team_catcher-hard-lvl1-v0",
+    "team_catcher-hard-lvl2-v0",
+]
+
+
+def full_grid_fog(world):
+    """Previous implementation: one full size x size distance mask per agent."""
+    fog_free_map = world.map
+    x = np.arange(0, world.size)
+    y = np.arange(0, world.size)
+    fog = np.ones_like(fog_free_map) * AuxElement.fog
+    for _, pos in world.agent_position.items():
+        if fog_free_map[pos] == MapElement.agent_hv:
+            r = world.fow_agents_hv
+        elif fog_free_map[pos] == MapElement.agent_diag:
+            r = world.fow_agents_diag
+        cx, cy = pos
+        mask = ((x[np.newaxis, :] - cx) ** 2 + (y[:, np.newaxis] - cy) ** 2 <= r**2).T
+        fog[mask] = 1
+    foged_map = np.ones_like(fog_free_map) * AuxElement.fog
+    foged_map[fog == 1] = fog_free_map[fog == 1]
+    return foged_map
+
+
+class TestFogOfWar:
+    @pytest.mark.parametrize("env_id", PARTIALLY_OBSERVABLE_IDS)
+    @pytest.mark.parametrize("engine", ["object", "array"])
+    def test_same_partial_map(self, env_id, engine):
+        env = gym.make(env_id, engine=engine).unwrapped
+        obs, _ = env.reset(seed=0)
+        for _ in range(5):
+            assert (obs["partial_map"] == full_grid_fog(env.world)).all()
+            obs, _, _, _, _ = env.step(env.action_space.sample())
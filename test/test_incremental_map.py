@@ -0,0 +1,32 @@
+import pytest
+
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+
+
+class TestIncrementalMap:
+    @pytest.mark.parametrize("engine", ["object", "array"])
+    def test_same_game_as_full_fill(self, fog_config, rollout, engine):
+        full_env = TeamCatcherBase(**fog_config, engine=engine)
+        incremental_env = TeamCatcherBase(
+            **fog_config, engine=engine, incremental_map=True
+        )
+        full = rollout(full_env, nb_steps=150, stop_on_done=True)
+        incremental = rollout(incremental_env, nb_steps=150, stop_on_done=True)
+        assert len(full) == len(incremental)
+        for step, i_step in zip(full, incremental):
+            for key in step.obs:
+                assert (step.obs[key] == i_step.obs[key]).all()
+            assert step.reward == i_step.reward
+            assert step.done == i_step.done
+
+    @pytest.mark.parametrize("engine", ["object", "array"])
+    def test_map_allocated_once(self, fog_config, engine):
+        env = TeamCatcherBase(**fog_config, engine=engine, incremental_map=True)
+        obs, _ = env.reset()
+        world_map, position_mask = obs["map"], obs["position_mask"]
+        for _ in range(10):
+            obs, _, _, _, _ = env.step(env.action_space.sample())
+            assert obs["map"] is world_map
+            assert obs["position_mask"] is position_mask
+        assert (world_map > 0).sum() == env.nb_targets_alive
+        assert position_mask.sum() == 60
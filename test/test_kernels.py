@@ -0,0 +1,45 @@
+import warnings
+
+import pytest
+
+from gym_ma_toy.envs import kernels
+from gym_ma_toy.envs.compiled_world import CompiledWorld
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+
+
+class TestKernels:
+    @pytest.mark.parametrize("neighbourhood", [4, 8])
+    @pytest.mark.parametrize("incremental_map", [False, True])
+    def test_same_game_as_array_engine(
+        self, config, rollout, monkeypatch, neighbourhood, incremental_map
+    ):
+        # the kernels run as plain Python when Numba is missing
+        monkeypatch.setattr(kernels, "HAS_NUMBA", True)
+        kwargs = dict(
+            capture_neighbourhood=neighbourhood, incremental_map=incremental_map
+        )
+        compiled_env = TeamCatcherBase(**config, **kwargs, engine="compiled")
+        array_env = TeamCatcherBase(**config, **kwargs, engine="array")
+        compiled = rollout(compiled_env, nb_steps=100, stop_on_done=True)
+        array = rollout(array_env, nb_steps=100, stop_on_done=True)
+        assert len(compiled) == len(array)
+        for compiled_step, array_step in zip(compiled, array):
+            assert (compiled_step.obs["map"] == array_step.obs["map"]).all()
+            assert compiled_step.reward == array_step.reward
+
+    def test_fallback_without_numba(self, config, rollout, monkeypatch):
+        monkeypatch.setattr(kernels, "HAS_NUMBA", False)
+        compiled = rollout(TeamCatcherBase(**config, engine="compiled"), nb_steps=20)
+        array = rollout(TeamCatcherBase(**config, engine="array"), nb_steps=20)
+        for compiled_step, array_step in zip(compiled, array):
+            assert (compiled_step.obs["map"] == array_step.obs["map"]).all()
+            assert compiled_step.reward == array_step.reward
+
+    def test_fallback_warns_once(self, config, monkeypatch):
+        monkeypatch.setattr(kernels, "HAS_NUMBA", False)
+        monkeypatch.setattr(CompiledWorld, "_warned_fallback", False)
+        with pytest.warns(UserWarning, match="Numba"):
+            TeamCatcherBase(**config, engine="compiled")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            TeamCatcherBase(**config, engine="compiled")
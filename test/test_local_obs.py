@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from gym_ma_toy.envs.game_base import AuxElement
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+
+
+def reference_patches(world_map, positions, patch_size):
+    """Per-agent loop the local observation mode replaces."""
+    radius = patch_size // 2
+    size = world_map.shape[0]
+    patches = np.full(
+        (len(positions), patch_size, patch_size), AuxElement.fog, world_map.dtype
+    )
+    for patch, (x, y) in zip(patches, positions):
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                if 0 <= x + dx < size and 0 <= y + dy < size:
+                    patch[dx + radius, dy + radius] = world_map[x + dx, y + dy]
+    return patches
+
+
+class TestLocalObs:
+    @pytest.mark.parametrize("engine", ["object", "array"])
+    @pytest.mark.parametrize("fow", [(0, 0), (2, 4)])
+    @pytest.mark.parametrize("local_size", [1, 5])
+    def test_matches_reference(self, config, engine, fow, local_size):
+        config = dict(config, fow_agents_hv=fow[0], fow_agents_diag=fow[1])
+        env = TeamCatcherBase(
+            **config, engine=engine, obs_mode="local", local_size=local_size
+        )
+        env.reset(seed=0)
+        for _ in range(20):
+            obs, _, _, _, _ = env.step(env.action_space.sample())
+            assert env.observation_space.contains(obs)
+            state = env.world.get_state
+            world_map = state["partial_map"] if any(fow) else state["map"]
+            positions = list(env.world.agent_position.values())
+            expected = reference_patches(world_map, positions, local_size)
+            assert (obs["local_map"] == expected).all()
+            centre = obs["local_map"][:, local_size // 2, local_size // 2]
+            assert (centre < 0).all()
+
+    def test_invalid_local_size(self, config):
+        with pytest.raises(ValueError):
+            TeamCatcherBase(**config, obs_mode="local", local_size=4)
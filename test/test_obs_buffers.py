@@ -0,0 +1,64 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+
+
+@pytest.fixture
+def wide_config(fog_config):
+    # the map outweighs the entity-sized temporaries of a step
+    return dict(fog_config, grid_size=64)
+
+
+class TestObsBuffers:
+    @pytest.mark.parametrize("engine", ["object", "array"])
+    def test_same_observations(self, wide_config, rollout, engine):
+        reused_env = TeamCatcherBase(
+            **wide_config, engine=engine, reuse_obs_buffers=True
+        )
+        default_env = TeamCatcherBase(**wide_config, engine=engine)
+        reused = [step.obs for step in rollout(reused_env, nb_steps=30)]
+        default = [step.obs for step in rollout(default_env, nb_steps=30)]
+        for reused_obs, default_obs in zip(reused, default):
+            assert reused_obs.keys() == default_obs.keys()
+            for key in default_obs:
+                assert (reused_obs[key] == default_obs[key]).all()
+
+    @pytest.mark.parametrize("engine", ["object", "array"])
+    def test_read_only_views(self, wide_config, engine):
+        env = TeamCatcherBase(**wide_config, engine=engine, reuse_obs_buffers=True)
+        first, _ = env.reset()
+        for _ in range(5):
+            obs, _, _, _, _ = env.step(env.action_space.sample())
+            for key in obs:
+                assert obs[key] is first[key]
+                assert not obs[key].flags.writeable
+        with pytest.raises(ValueError):
+            obs["map"][0, 0] = 1
+        env.reset()
+        assert env.reset()[0]["map"] is first["map"]
+
+    def test_copy_obs(self, wide_config):
+        env = TeamCatcherBase(**wide_config, reuse_obs_buffers=True, copy_obs=True)
+        first, _ = env.reset()
+        kept = first["map"].copy()
+        obs, _, _, _, _ = env.step(env.action_space.sample())
+        assert obs["map"] is not first["map"]
+        assert obs["map"].flags.writeable
+        assert (first["map"] == kept).all()
+
+    @pytest.mark.parametrize("engine", ["object", "array"])
+    def test_no_grid_allocation(self, wide_config, engine):
+        env = TeamCatcherBase(**wide_config, engine=engine, reuse_obs_buffers=True)
+        env.reset()
+        action = np.zeros(env.action_space.shape, dtype=np.int32)
+        env.step(action)
+        tracemalloc.start()
+        for _ in range(10):
+            env.step(action)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # only entity-sized temporaries, less than a single map over ten steps
+        assert peak < env.world.map.nbytes
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from gym_ma_toy.envs.game_base import (
+    PACKED_PLANES,
+    AuxElement,
+    pack_planes,
+    unpack_planes,
+)
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+
+
+def observations(env, rollout, nb_steps=30):
+    return [step.obs for step in rollout(env, nb_steps=nb_steps)]
+
+
+def dense_planes(dense_obs, fog):
+    world_map = dense_obs["partial_map"] if fog else dense_obs["map"]
+    planes = [world_map == kind for kind in PACKED_PLANES]
+    if fog:
+        planes.append(world_map == AuxElement.fog)
+    return np.stack(planes)
+
+
+class TestPackedObs:
+    @pytest.mark.parametrize("engine", ["object", "array", "tiled"])
+    @pytest.mark.parametrize("fog", [True, False])
+    def test_matches_dense_obs(self, config, fog_config, rollout, engine, fog):
+        config = fog_config if fog else config
+        packed_env = TeamCatcherBase(**config, engine=engine, obs_mode="packed")
+        packed = observations(packed_env, rollout)
+        dense = observations(TeamCatcherBase(**config, engine=engine), rollout)
+        for packed_obs, dense_obs in zip(packed, dense):
+            planes = unpack_planes(packed_obs["planes"], 20)
+            assert (planes == dense_planes(dense_obs, fog)).all()
+
+    @pytest.mark.parametrize("fog", [True, False])
+    def test_engines_agree(self, config, fog_config, rollout, fog):
+        config = fog_config if fog else config
+        object_env = TeamCatcherBase(**config, engine="object", obs_mode="packed")
+        objects = observations(object_env, rollout)
+        for engine in ("array", "tiled"):
+            other_env = TeamCatcherBase(**config, engine=engine, obs_mode="packed")
+            others = observations(other_env, rollout)
+            for object_obs, other_obs in zip(objects, others):
+                assert (object_obs["planes"] == other_obs["planes"]).all()
+
+    @pytest.mark.parametrize("fog", [True, False])
+    def test_space(self, config, fog_config, fog):
+        config = fog_config if fog else config
+        env = TeamCatcherBase(**config, obs_mode="packed")
+        obs, _ = env.reset(seed=0)
+        assert env.observation_space.contains(obs)
+        assert obs["planes"].shape == (5 if fog else 4, 20, 3)
+        assert obs["planes"].dtype == np.uint8
+
+    def test_round_trip(self):
+        rng = np.random.default_rng(0)
+        size = 13
+        cells = rng.permutation(size * size)[:40]
+        positions = np.stack(np.divmod(cells, size), axis=1)
+        kinds = rng.choice([-3, -2, 0, 1, 2], size=40)
+        visible = np.argwhere(rng.random((size, size)) < 0.5)
+        packed = pack_planes(positions, kinds, size, visible)
+
+        world_map = np.zeros((size, size), dtype=np.int8)
+        world_map[positions[:, 0], positions[:, 1]] = kinds
+        seen = np.zeros((size, size), dtype=bool)
+        seen[visible[:, 0], visible[:, 1]] = True
+        partial_map = np.where(seen, world_map, AuxElement.fog)
+        expected = dense_planes({"partial_map": partial_map}, fog=True)
+        assert (packed == np.packbits(expected, axis=-1)).all()
+        assert (unpack_planes(packed, size) == expected).all()
+
+    def test_unpack_batch(self, fog_config, rollout):
+        env = TeamCatcherBase(**fog_config, obs_mode="packed")
+        packed = observations(env, rollout, nb_steps=5)
+        batch = np.stack([obs["planes"] for obs in packed])
+        planes = unpack_planes(batch, 20)
+        assert planes.shape == (6, 5, 20, 20) and planes.dtype == bool
+        for obs, obs_planes in zip(packed, planes):
+            assert (obs_planes == unpack_planes(obs["planes"], 20)).all()
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+
+PHASES = {
+    "reset",
+    "gather_actions",
+    "captures",
+    "move_agents",
+    "move_mobiles",
+    "fill_map",
+    "position_state",
+    "fog",
+}
+
+
+class TestProfiling:
+    @pytest.mark.parametrize("engine", ["object", "array"])
+    def test_phase_stats(self, fog_config, engine):
+        env = TeamCatcherBase(**fog_config, engine=engine, profile=True)
+        env.reset(seed=0)
+        for _ in range(10):
+            env.step(env.action_space.sample())
+        stats = env.profile_stats()
+        assert set(stats) == PHASES
+        for phase in PHASES - {"reset", "fog"}:
+            assert stats[phase]["calls"] == 10
+        assert stats["reset"]["calls"] == 1
+        assert stats["fog"]["calls"] == 11
+        assert all(phase["total_s"] > 0 for phase in stats.values())
+
+    def test_disabled_by_default(self, fog_config):
+        env = TeamCatcherBase(**fog_config)
+        env.reset(seed=0)
+        env.step(env.action_space.sample())
+        assert env.profile_stats() == {}
+        env.world.set_profiling()
+        env.step(env.action_space.sample())
+        assert env.profile_stats()["captures"]["calls"] == 1
+        env.world.set_profiling(False)
+        assert env.profile_stats() == {}
+
+    def test_same_game(self, fog_config, rollout):
+        games = []
+        for profile in [False, True]:
+            env = TeamCatcherBase(**fog_config, engine="array", profile=profile)
+            transitions = rollout(env, nb_steps=20)
+            games.append(np.stack([step.obs["partial_map"] for step in transitions]))
+        assert (games[0] == games[1]).all()
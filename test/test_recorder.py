@@ -0,0 +1,82 @@
+import threading
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from gym_ma_toy.envs import recorder
+from gym_ma_toy.envs.recorder import EpisodeRecorder
+from gym_ma_toy.envs.render_utils import PaletteRenderer
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+
+
+def run(env, rollout, nb_episodes=2, nb_steps=12):
+    maps = []
+    for episode in range(nb_episodes):
+        transitions = rollout(env, nb_steps=nb_steps, seed=episode)
+        maps.append(np.stack([step.obs["partial_map"] for step in transitions]))
+    env.close()
+    return maps
+
+
+class TestRecorder:
+    def test_npz_frames(self, fog_config, rollout, tmp_path):
+        env = EpisodeRecorder(
+            TeamCatcherBase(**fog_config), str(tmp_path), format="npz", chunk_size=5
+        )
+        maps = run(env, rollout)
+        for episode, episode_maps in enumerate(maps):
+            frames = [
+                np.load(tmp_path / f"team_catcher-episode-{episode}-{chunk}.npz")
+                for chunk in range(3)
+            ]
+            assert [len(chunk["map"]) for chunk in frames] == [5, 5, 3]
+            partial = np.concatenate([chunk["partial_map"] for chunk in frames])
+            assert partial.dtype == np.int8
+            assert (partial == episode_maps).all()
+
+    def test_gif_frames(self, fog_config, tmp_path):
+        env = EpisodeRecorder(
+            TeamCatcherBase(**fog_config),
+            str(tmp_path),
+            fig_size=2,
+            episode_trigger=lambda i: i == 1,
+        )
+        obs, _ = env.reset(seed=0)
+        obs, _ = env.reset(seed=1)
+        expected = [PaletteRenderer(20, 2, True)(obs).copy()]
+        for _ in range(3):
+            obs, _, _, _, _ = env.step(env.action_space.sample())
+            expected.append(PaletteRenderer(20, 2, True)(obs).copy())
+        env.close()
+        assert not (tmp_path / "team_catcher-episode-0-0.gif").exists()
+        gif = Image.open(tmp_path / "team_catcher-episode-1-0.gif")
+        assert gif.n_frames == 4
+        for index, frame in enumerate(expected):
+            gif.seek(index)
+            assert (np.array(gif.convert("RGB")) == frame).all()
+
+    def test_full_queue_does_not_stall(self, fog_config, tmp_path, monkeypatch):
+        release = threading.Event()
+
+        def blocked_encoder(*args):
+            # the timeout only keeps a stalled env from hanging the suite
+            release.wait(timeout=60)
+
+        monkeypatch.setattr(recorder, "encode_gif", blocked_encoder)
+        env = EpisodeRecorder(
+            TeamCatcherBase(**fog_config), str(tmp_path), chunk_size=2, queue_size=1
+        )
+        env.reset(seed=0)
+        with pytest.warns(UserWarning):
+            for _ in range(10):
+                env.step(env.action_space.sample())
+        # every step returned while the encoder was still blocked
+        assert not release.is_set()
+        assert env.dropped_chunks > 0
+        release.set()
+        env.close()
+
+    def test_invalid_format(self, fog_config, tmp_path):
+        with pytest.raises(ValueError):
+            EpisodeRecorder(TeamCatcherBase(**fog_config), str(tmp_path), format="mp4")
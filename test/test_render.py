@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from gym_ma_toy.envs.render_utils import (
+    render_observable,
+    render_partially_observable,
+)
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+
+
+class TestRender:
+    @pytest.mark.parametrize("fow", [(0, 0), (2, 4)])
+    @pytest.mark.parametrize("compact_obs", [False, True])
+    @pytest.mark.parametrize("fig_size", [1, 8])
+    def test_same_frames_as_pil(self, config, fow, compact_obs, fig_size):
+        config = dict(config, fow_agents_hv=fow[0], fow_agents_diag=fow[1])
+        env = TeamCatcherBase(**config, compact_obs=compact_obs)
+        env.reset(seed=0)
+        for _ in range(5):
+            obs, _, _, _, _ = env.step(env.action_space.sample())
+            if any(fow):
+                expected = render_partially_observable(20, obs, fig_size)
+            else:
+                expected = render_observable(20, obs, fig_size)
+            image = env.render(fig_size=fig_size)
+            assert image.dtype == np.uint8
+            assert (image == expected).all()
+
+    def test_reused_buffer(self, config):
+        env = TeamCatcherBase(**config, reuse_obs_buffers=True)
+        env.reset(seed=0)
+        first = env.render()
+        env.step(env.action_space.sample())
+        assert env.render() is first
+        env = TeamCatcherBase(**config)
+        env.reset(seed=0)
+        assert env.render() is not env.render()
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from gym_ma_toy.envs.game_base import sample_positions
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+
+
+class TestReset:
+    @pytest.mark.parametrize("size, nb_entities", [(3, 1), (5, 9), (10, 40), (64, 500)])
+    def test_distinct_inner_cells(self, size, nb_entities):
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            positions = sample_positions(size, nb_entities, rng)
+            assert positions.shape == (nb_entities, 2)
+            assert ((positions >= 1) & (positions <= size - 2)).all()
+            assert len(set(map(tuple, positions.tolist()))) == nb_entities
+        with pytest.raises(ValueError):
+            sample_positions(size, (size - 2) ** 2 + 1)
+
+    def test_uniform_cells(self):
+        rng = np.random.default_rng(0)
+        counts = np.zeros((6, 6))
+        for _ in range(2000):
+            positions = sample_positions(6, 3, rng)
+            counts[positions[:, 0], positions[:, 1]] += 1
+        inner = counts[1:5, 1:5]
+        assert abs(inner - 2000 * 3 / 16).max() < 60
+
+    def test_cost_independent_of_area(self):
+        class CountingRng:
+            """Generator recording the number of values drawn."""
+
+            def __init__(self):
+                self.rng = np.random.default_rng(0)
+                self.nb_draws = 0
+
+            def integers(self, high, size):
+                self.nb_draws += size
+                return self.rng.integers(high, size=size)
+
+            def permutation(self, n):
+                self.nb_draws += n
+                return self.rng.permutation(n)
+
+        rng = CountingRng()
+        sample_positions(3000, 500, rng)
+        # a few rounds of 2 draws per missing cell, not one per cell of the map
+        assert rng.nb_draws <= 4 * 500
+
+    def test_elements_reused(self):
+        env = TeamCatcherBase(
+            grid_size=20, nb_agents_hv=10, nb_agents_diag=10, nb_targets=20
+        )
+        env.reset(seed=0)
+        agents = dict(env.world.agents)
+        targets = list(env.world.targets)
+        for _ in range(30):
+            env.step(env.action_space.sample())
+        env.reset()
+        assert all(env.world.agents[k] is agents[k] for k in agents)
+        assert list(env.world.targets) == targets
+        assert env.world.nb_targets_alive == 20 + 32
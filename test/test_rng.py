@@ -0,0 +1,49 @@
+import numpy as np
+
+from gym_ma_toy.envs.game_base import spawn_rngs
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+from gym_ma_toy.envs.vector_env import TeamCatcherVectorEnv
+
+
+def maps(transitions):
+    return np.stack([step.obs["map"] for step in transitions])
+
+
+class TestRng:
+    def test_reset_seed(self, config, rollout):
+        env = TeamCatcherBase(**config, engine="array")
+        first = maps(rollout(env, nb_steps=30, seed=3))
+        assert (maps(rollout(env, nb_steps=30, seed=3)) == first).all()
+        assert (maps(rollout(env, nb_steps=30, seed=4)) != first).any()
+
+    def test_envs_do_not_share_streams(self, config, rollout):
+        alone = TeamCatcherBase(**config)
+        expected = maps(rollout(alone, nb_steps=30))
+        # interleaving the steps of another env, or global draws, changes nothing
+        env, other = TeamCatcherBase(**config), TeamCatcherBase(**config)
+        env.reset(seed=0)
+        other.reset(seed=1)
+        actions = np.random.RandomState(1)
+        interleaved = [env.world.map.copy()]
+        for _ in range(30):
+            other.step(other.action_space.sample())
+            np.random.randint(9, size=10)
+            env.step(actions.randint(0, 9, size=env.action_space.shape))
+            interleaved.append(env.world.map.copy())
+        assert (np.stack(interleaved) == expected).all()
+
+    def test_spawned_worlds(self, config, rollout):
+        envs = TeamCatcherVectorEnv(num_envs=3, **config)
+        vector_maps = maps(rollout(envs, nb_steps=30, seed=5))
+        assert (vector_maps[:, 0] != vector_maps[:, 1]).any()
+        for b, rng in enumerate(spawn_rngs(5, 3)):
+            env = TeamCatcherBase(**config, engine="array")
+            env.np_random = rng
+            env.reset()
+            # same actions as world b of the vector env
+            actions = np.random.RandomState(1)
+            single = [env.world.map.copy()]
+            for _ in range(30):
+                env.step(actions.randint(0, 9, size=envs.action_space.shape)[b])
+                single.append(env.world.map.copy())
+            assert (np.stack(single) == vector_maps[:, b]).all()
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from gym_ma_toy.envs.game_base import Actions, MapElement, simultaneous_moves
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+
+
+def small_map(*cells):
+    world_map = np.zeros((4, 4), dtype=np.int8)
+    for x, y in cells:
+        world_map[x, y] = MapElement.agent_hv
+    return world_map
+
+
+class TestSimultaneousMoves:
+    def test_lowest_id_wins(self):
+        sources = np.array([[1, 0], [1, 2]])
+        world_map = small_map(*sources)
+        moved, destinations = simultaneous_moves(
+            world_map, sources, [MapElement.agent_hv] * 2, [Actions.RIGHT, Actions.LEFT]
+        )
+        assert moved.tolist() == [0]
+        assert destinations.tolist() == [[1, 1]]
+
+    def test_no_chain_nor_swap(self):
+        # the first agent follows the second one, the last two swap
+        sources = np.array([[0, 0], [0, 1], [2, 0], [2, 1]])
+        world_map = small_map(*sources)
+        actions = [Actions.RIGHT, Actions.RIGHT, Actions.RIGHT, Actions.LEFT]
+        moved, destinations = simultaneous_moves(
+            world_map, sources, [MapElement.agent_hv] * 4, actions
+        )
+        assert moved.tolist() == [1]
+        assert destinations.tolist() == [[0, 2]]
+
+    def test_allowed_and_inside(self):
+        sources = np.array([[0, 0], [2, 2], [3, 2]])
+        kinds = [MapElement.agent_hv, MapElement.agent_hv, MapElement.agent_diag]
+        moved, _ = simultaneous_moves(
+            small_map(*sources),
+            sources,
+            kinds,
+            [Actions.UP, Actions.UP_LEFT, Actions.UP_LEFT],
+        )
+        assert moved.tolist() == [2]
+
+    @pytest.mark.parametrize("engine", ["array", "compiled"])
+    def test_same_games_on_every_engine(self, fog_config, rollout, engine):
+        object_env = TeamCatcherBase(**fog_config, move_mode="simultaneous")
+        array_env = TeamCatcherBase(
+            **fog_config, move_mode="simultaneous", engine=engine
+        )
+        for object_step, array_step in zip(rollout(object_env), rollout(array_env)):
+            for key in object_step.obs:
+                assert (object_step.obs[key] == array_step.obs[key]).all()
+
+    @pytest.mark.parametrize("engine", ["object", "array"])
+    def test_entities_stay_on_distinct_cells(self, fog_config, rollout, engine):
+        env = TeamCatcherBase(**fog_config, move_mode="simultaneous", engine=engine)
+        for obs, *_ in rollout(env):
+            assert np.count_nonzero(obs["position_mask"]) == 60
+            assert np.count_nonzero(obs["map"] < 0) == 60
+
+    def test_differs_from_sequential(self, fog_config, rollout):
+        sequential = rollout(TeamCatcherBase(**fog_config))
+        simultaneous = rollout(TeamCatcherBase(**fog_config, move_mode="simultaneous"))
+        assert any(
+            (a.obs["map"] != b.obs["map"]).any()
+            for a, b in zip(sequential, simultaneous)
+        )
+
+    def test_unknown_mode(self, config):
+        with pytest.raises(ValueError):
+            TeamCatcherBase(**config, move_mode="parallel")
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+
+
+def replay(env, actions):
+    # steps of fixed actions from the current state, to compare branches
+    transitions = []
+    for action in actions:
+        obs, reward, done, _, info = env.step(action)
+        obs = {key: value.copy() for key, value in obs.items()}
+        transitions.append((obs, reward, done, info))
+    return transitions
+
+
+def assert_same(transitions, other):
+    for (obs, reward, done, info), (o_obs, o_reward, o_done, o_info) in zip(
+        transitions, other
+    ):
+        for key in obs:
+            assert (obs[key] == o_obs[key]).all()
+        assert (reward, done, info) == (o_reward, o_done, o_info)
+
+
+class TestSnapshot:
+    @pytest.mark.parametrize("engine", ["object", "array"])
+    @pytest.mark.parametrize(
+        "kwargs", [{}, {"incremental_map": True}, {"reuse_obs_buffers": True}]
+    )
+    def test_branching(self, fog_config, rollout, engine, kwargs):
+        env = TeamCatcherBase(**fog_config, engine=engine, **kwargs)
+        rollout(env, nb_steps=10)
+        snapshot = env.get_state_snapshot()
+        kept_obs = {key: value.copy() for key, value in env.obs.items()}
+        actions = np.random.RandomState(2).randint(0, 9, size=(40, 20, 20))
+        first = replay(env, actions)
+        for _ in range(2):
+            obs = env.restore_state_snapshot(snapshot)
+            for key in obs:
+                assert (obs[key] == kept_obs[key]).all()
+            assert_same(first, replay(env, actions))
+
+    def test_engines_share_the_record(self, fog_config, rollout):
+        objects = TeamCatcherBase(**fog_config, engine="object")
+        arrays = TeamCatcherBase(**fog_config, engine="array")
+        rollout(objects, nb_steps=10)
+        snapshot = objects.get_state_snapshot()
+        arrays.restore_state_snapshot(snapshot)
+        for key, value in arrays.get_state_snapshot().items():
+            if key == "rng":
+                assert value == snapshot[key]
+            elif key != "obs":
+                assert (np.asarray(value) == np.asarray(snapshot[key])).all()
+        actions = np.random.RandomState(2).randint(0, 9, size=(20, 20, 20))
+        assert_same(replay(objects, actions), replay(arrays, actions))
+
+    @pytest.mark.parametrize(
+        "source, target", [("object", "tiled"), ("tiled", "array")]
+    )
+    def test_tiled_engine_shares_the_record(self, fog_config, rollout, source, target):
+        sources = TeamCatcherBase(**fog_config, engine=source)
+        targets = TeamCatcherBase(**fog_config, engine=target)
+        rollout(sources, nb_steps=10)
+        snapshot = sources.get_state_snapshot()
+        assert all(
+            isinstance(value, np.ndarray)
+            for key, value in snapshot.items()
+            if key not in ("rng", "obs", "nb_step")
+        )
+        targets.restore_state_snapshot(snapshot)
+        actions = np.random.RandomState(2).randint(0, 9, size=(20, 20, 20))
+        assert_same(replay(sources, actions), replay(targets, actions))
+
+    def test_record_is_flat(self, fog_config):
+        # a record of a few arrays, not a deep copy of the entity objects
+        env = TeamCatcherBase(**fog_config, engine="object")
+        env.reset(seed=0)
+        snapshot = env.get_state_snapshot()
+        assert isinstance(snapshot["rng"], dict)
+        assert isinstance(snapshot["nb_step"], int)
+        for key, value in snapshot.items():
+            if key == "obs":
+                assert all(isinstance(obs, np.ndarray) for obs in value.values())
+            elif key not in ("rng", "nb_step"):
+                assert isinstance(value, np.ndarray) and value.dtype != object
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+from gym_ma_toy.envs.tiled_world import TiledMap
+
+
+@pytest.fixture
+def sparse_config(config):
+    # several tiles, some of them empty
+    return dict(config, grid_size=40)
+
+
+def observations(env, rollout, nb_steps=40):
+    return [step.obs for step in rollout(env, nb_steps=nb_steps)]
+
+
+class TestTiledMap:
+    def test_same_cells_as_dense(self):
+        rng = np.random.default_rng(0)
+        dense = np.zeros((50, 70), dtype=np.int8)
+        tiled = TiledMap((50, 70), np.int8, tile_size=8)
+        for _ in range(200):
+            x, y = rng.integers(50, size=6), rng.integers(70, size=6)
+            x, y = np.unique(np.stack((x, y)), axis=1)
+            values = rng.integers(-3, 3, size=len(x)).astype(np.int8)
+            dense[x, y] = values
+            tiled[x, y] = values
+            cx, cy = int(rng.integers(50)), int(rng.integers(70))
+            value = int(rng.integers(-3, 3))
+            dense[cx, cy] = value
+            tiled[cx, cy] = value
+            assert tiled[cx, cy] == value
+            assert (tiled[x[:, np.newaxis], y] == dense[x[:, np.newaxis], y]).all()
+        assert (np.asarray(tiled) == dense).all()
+        # only the tiles holding a value are allocated
+        assert tiled.nb_tiles <= np.count_nonzero(dense)
+
+    def test_tiles_return_to_the_pool(self):
+        tiled = TiledMap((1000, 1000), np.float64)
+        tiled[5, 5] = 2
+        tiled[np.array([500, 900]), np.array([500, 10])] = -1
+        assert tiled.nb_tiles == 3
+        tiled[5, 5] = 0
+        tiled[np.array([500, 900]), np.array([500, 10])] = 0
+        # the tile emptied by a single cell write waits for release_empty
+        assert tiled.nb_tiles == 1
+        tiled.release_empty()
+        assert tiled.nb_tiles == 0
+        assert not np.asarray(tiled).any()
+        tiled[1, 1] = 1
+        copy = tiled.copy()
+        tiled.fill(0)
+        assert tiled.nb_tiles == 0 and copy.nb_tiles == 1
+        with pytest.raises(ValueError):
+            tiled.fill(1)
+
+    def test_tile_size(self):
+        with pytest.raises(ValueError):
+            TiledMap((10, 10), np.int8, tile_size=12)
+
+
+class TestTiledWorld:
+    @pytest.mark.parametrize("fog", [0, 3])
+    @pytest.mark.parametrize("obs_mode", ["dense", "local", "entities", "delta"])
+    def test_same_games_as_array(self, sparse_config, rollout, fog, obs_mode):
+        config = dict(
+            sparse_config, fow_agents_hv=fog, fow_agents_diag=fog, obs_mode=obs_mode
+        )
+        tiled = observations(TeamCatcherBase(**config, engine="tiled"), rollout)
+        array = observations(TeamCatcherBase(**config, engine="array"), rollout)
+        for tiled_obs, array_obs in zip(tiled, array):
+            assert tiled_obs.keys() == array_obs.keys()
+            for key in tiled_obs:
+                assert tiled_obs[key].dtype == array_obs[key].dtype
+                assert (tiled_obs[key] == array_obs[key]).all()
+
+    def test_simultaneous_moves_and_snapshots(self, sparse_config, rollout):
+        config = dict(sparse_config, move_mode="simultaneous", compact_obs=True)
+        env = TeamCatcherBase(**config, engine="tiled")
+        array_env = TeamCatcherBase(**config, engine="array")
+        assert [obs["map"].tolist() for obs in observations(env, rollout)] == [
+            obs["map"].tolist() for obs in observations(array_env, rollout)
+        ]
+        snapshot = env.get_state_snapshot()
+        action = np.ones(env.action_space.shape, np.int32)
+        first = env.step(action)[0]["map"].copy()
+        env.restore_state_snapshot(snapshot)
+        assert (env.step(action)[0]["map"] == first).all()
+
+    def test_delta_keyframes_stay_sparse(self, sparse_config, rollout, monkeypatch):
+        env = TeamCatcherBase(
+            **sparse_config, engine="tiled", obs_mode="delta", keyframe_interval=3
+        )
+
+        def to_dense(tiled):
+            raise AssertionError("the dense map is built")
+
+        monkeypatch.setattr(TiledMap, "to_dense", to_dense)
+        keyframes = [obs["keyframe"] for obs in observations(env, rollout, nb_steps=6)]
+        assert keyframes[:4] == [1, 0, 0, 1]
+
+    def test_no_buffer_reuse(self, sparse_config):
+        with pytest.raises(ValueError):
+            TeamCatcherBase(**sparse_config, engine="tiled", reuse_obs_buffers=True)
+
+    def test_huge_sparse_map(self):
+        env = TeamCatcherBase(
+            grid_size=10_000,
+            nb_agents_hv=1000,
+            nb_agents_diag=1000,
+            nb_targets=1000,
+            nb_mobiles=500,
+            fow_agents_hv=3,
+            fow_agents_diag=3,
+            engine="tiled",
+            obs_mode="local",
+            action_mode="agents",
+            compact_obs=True,
+        )
+        env.reset(seed=0)
+        for _ in range(5):
+            obs, _, _, _, _ = env.step(env.action_space.sample())
+        assert obs["local_map"].shape == (2000, 5, 5)
+        # a dense int8 map would take 100 MB
+        assert env.world.map.nbytes + env.world.position_mask.nbytes < 40 * 2**20
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+from gym_ma_toy.envs.trajectory import TrajectoryReader, TrajectoryWriter
+
+
+def play(env, rollout, nb_episodes=3, nb_steps=7):
+    # one rollout per episode, each from its own seed
+    return [
+        step
+        for episode in range(nb_episodes)
+        for step in rollout(env, nb_steps=nb_steps, seed=episode)
+    ]
+
+
+class TestTrajectory:
+    @pytest.mark.parametrize("compact_obs", [False, True])
+    def test_round_trip(self, fog_config, rollout, tmp_path, compact_obs):
+        env = TeamCatcherBase(**fog_config, compact_obs=compact_obs)
+        writer = TrajectoryWriter(str(tmp_path), env, capacity=50)
+        env.set_trajectory_writer(writer)
+        rows = play(env, rollout)
+        writer.close()
+
+        reader = TrajectoryReader(str(tmp_path))
+        assert len(reader) == len(rows) == 24
+        assert reader.nb_episodes == 3
+        assert reader.arrays["map"].dtype == env.observation_space["map"].dtype
+        for row, (obs, action, reward, done, _) in enumerate(rows):
+            assert (reader.arrays["map"][row] == obs["map"]).all()
+            assert (reader.arrays["partial_map"][row] == obs["partial_map"]).all()
+            assert reader.arrays["reward"][row] == reward
+            assert reader.arrays["done"][row] == done
+            if action is not None:
+                assert (reader.arrays["action"][row] == action).all()
+
+    def test_episode_views(self, fog_config, rollout, tmp_path):
+        env = TeamCatcherBase(**fog_config)
+        env.set_trajectory_writer(TrajectoryWriter(str(tmp_path), env, capacity=50))
+        play(env, rollout)
+        env.trajectory_writer.close()
+
+        episode = TrajectoryReader(str(tmp_path)).episode(1)
+        assert episode["map"].shape == (8, 20, 20)
+        assert isinstance(episode["map"].base, np.memmap)
+        assert not episode["map"].flags.writeable
+        assert episode["reward"][0] == 0
+
+    def test_sample_stays_in_episodes(self, fog_config, rollout, tmp_path):
+        env = TeamCatcherBase(**fog_config)
+        env.set_trajectory_writer(TrajectoryWriter(str(tmp_path), env, capacity=50))
+        play(env, rollout)
+        env.trajectory_writer.close()
+
+        reader = TrajectoryReader(str(tmp_path))
+        batch = reader.sample(64, np.random.default_rng(0))
+        assert batch["map"].shape == batch["next_map"].shape == (64, 20, 20)
+        assert batch["action"].shape == (64, 20, 20)
+        # the reset rows are never the next observation of a transition
+        assert not np.isin(reader._transitions + 1, reader.episode_starts).any()
+        assert (batch["reward"] != 0).all()
+
+    def test_other_obs_modes(self, fog_config, tmp_path):
+        env = TeamCatcherBase(**fog_config, obs_mode="entities", action_mode="agents")
+        env.set_trajectory_writer(TrajectoryWriter(str(tmp_path), env, capacity=50))
+        env.reset(seed=0)
+        env.step(env.action_space.sample())
+        env.trajectory_writer.close()
+
+        reader = TrajectoryReader(str(tmp_path))
+        assert reader.arrays["map"].shape == (2, 20, 20)
+        assert reader.arrays["action"].shape == (2, 60)
+        assert (reader.arrays["map"][1] == env.world.map).all()
+
+    def test_capacity(self, fog_config, tmp_path):
+        env = TeamCatcherBase(**fog_config)
+        env.set_trajectory_writer(TrajectoryWriter(str(tmp_path), env, capacity=3))
+        env.reset(seed=0)
+        env.step(env.action_space.sample())
+        env.step(env.action_space.sample())
+        with pytest.raises(RuntimeError):
+            env.step(env.action_space.sample())
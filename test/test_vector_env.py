@@ -0,0 +1,77 @@
+import numpy as np
+import gymnasium as gym
+import pytest
+
+import gym_ma_toy  # noqa: F401
+from gym_ma_toy.envs.game_base import spawn_rngs
+from gym_ma_toy.envs.team_catcher_base import TeamCatcherBase
+from gym_ma_toy.envs.vector_env import TeamCatcherVectorEnv
+
+
+class TestVectorEnv:
+    def test_same_game_as_single_env(self, fog_config, rollout):
+        env = TeamCatcherBase(**fog_config, engine="array")
+        # same stream as the only world of a vector env seeded with 0
+        env.np_random = spawn_rngs(0, 1)[0]
+        single = rollout(env, nb_steps=100, seed=None, stop_on_done=True)
+        envs = TeamCatcherVectorEnv(num_envs=1, **fog_config)
+        batched = rollout(envs, nb_steps=100, stop_on_done=True)
+        assert len(single) == len(batched)
+        for step, b_step in zip(single, batched):
+            assert step.obs.keys() == b_step.obs.keys()
+            for key in step.obs:
+                assert (step.obs[key] == b_step.obs[key][0]).all()
+        for step, b_step in zip(single[1:], batched[1:]):
+            assert step.reward == b_step.reward[0]
+            assert step.done == b_step.done[0]
+
+    def test_autoreset(self):
+        envs = TeamCatcherVectorEnv(
+            num_envs=16,
+            grid_size=6,
+            nb_agents_hv=8,
+            nb_agents_diag=4,
+            nb_targets=2,
+            nb_mobiles=1,
+        )
+        obs, _ = envs.reset(seed=3)
+        assert obs["map"].shape == (16, 6, 6)
+        ended = np.zeros(16, dtype=bool)
+        for _ in range(200):
+            previous_ended = ended
+            obs, reward, ended, truncated, info = envs.step(envs.action_space.sample())
+            assert not truncated.any()
+            # worlds that ended are restarted with a null reward
+            assert (reward[previous_ended] == 0).all()
+            assert (info["step"][previous_ended] == 0).all()
+            assert (info["target alive"][previous_ended] > 0).all()
+            assert (info["target alive"][ended] == 0).all()
+            assert ((obs["map"] > 0).sum(axis=(1, 2)) == info["target alive"]).all()
+            assert (obs["position_mask"].sum(axis=(1, 2)) == 12).all()
+
+    def test_make_vec(self):
+        envs = gym.make_vec("team_catcher-v3", num_envs=3)
+        assert isinstance(envs.unwrapped, TeamCatcherVectorEnv)
+        obs, _ = envs.reset(seed=0)
+        assert obs["partial_map"].shape == (3, 64, 64)
+        assert envs.observation_space.contains(obs)
+        envs.close()
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"action_mode": "cells"},
+            {"grid_size": 4, "nb_targets": 20},
+            {"nb_mobiles": 110},
+        ],
+    )
+    def test_same_argument_checks(self, kwargs):
+        config = dict(
+            grid_size=12, nb_agents_hv=6, nb_agents_diag=6, nb_targets=8, nb_mobiles=0
+        )
+        config.update(kwargs)
+        with pytest.raises(ValueError) as single:
+            TeamCatcherBase(**config)
+        with pytest.raises(ValueError) as vector:
+            TeamCatcherVectorEnv(num_envs=2, **config)
+        assert str(single.value) == str(vector.value)